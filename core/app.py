@@ -1,18 +1,46 @@
 import sys
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+from core.profiler import profiler
 from ui.main_window import MainWindow
 from core.module_manager import ModuleManager
+from core.tasks import TaskService
+from core.config_store import get_config_store
 
 class MyApp:
     def __init__(self):
-        self.app = QApplication(sys.argv)
-        self.module_manager = ModuleManager()
-        self.main_window = MainWindow(self.module_manager)
+        with profiler.span("MyApp"):
+            with profiler.span("QApplication"):
+                # Якщо QApplication уже створено (напр., тестами) — використовуємо його
+                self.app = QApplication.instance() or QApplication(sys.argv)
+            # Фонові задачі модулів (збереження файлів, експорт) — поза GUI-потоком
+            self.tasks = TaskService()
+            # Налаштування й стан: у пам'яті, файли пишуться відкладено через self.tasks
+            self.config = get_config_store()
+            self.config.attach(self.tasks)
+            with profiler.span("ModuleManager"):
+                self.module_manager = ModuleManager(self.tasks)
+            with profiler.span("MainWindow"):
+                self.main_window = MainWindow(self.module_manager)
 
-        # Передаємо менеджер модулів у меню
-        if hasattr(self.main_window, "menu_bar"):
-            self.main_window.menu_bar.module_manager = self.module_manager
+            # Передаємо менеджер модулів у меню
+            if hasattr(self.main_window, "menu_bar"):
+                self.main_window.menu_bar.module_manager = self.module_manager
 
     def run(self):
-        self.main_window.show()
-        sys.exit(self.app.exec_())
+        with profiler.span("MainWindow.show"):
+            self.main_window.show()
+        if profiler.enabled:
+            # Перша ітерація циклу подій — вікно вже намальоване
+            QTimer.singleShot(0, self._on_first_frame)
+        code = self.app.exec_()
+        # Дописуємо те, що модулі ще зберігають у фоні, потім — незаписані налаштування
+        self.tasks.shutdown(wait=True)
+        self.config.flush()
+        sys.exit(code)
+
+    def _on_first_frame(self):
+        profiler.mark("first frame")
+        profiler.finish()
+        if profiler.exit_after:
+            self.app.quit()
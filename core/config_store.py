@@ -0,0 +1,329 @@
+# core/config_store.py
+"""
+Єдине сховище налаштувань і стану: кеш у пам'яті, типізовані секції,
+відкладений запис (write-behind) і атомарні файли.
+
+    theme = get_config_store().section("theme", "config/theme.json", defaults={"theme": "light"})
+    theme.get("theme")            # з пам'яті, без диска
+    theme.set("theme", "dark")    # сигнал changed("theme", "theme"), запис — через 0.5 с у фоні
+
+- Тип значення перевіряється за типом значення в defaults (або value_type для
+  секцій-словників на кшталт «дата → текст»); у файл пишуться лише задані ключі.
+- Запис: тимчасовий файл у тій самій теці → fsync → os.replace, тож після збою
+  лишається або старий, або новий файл, але не обрізаний.
+- Кожна зміна відкладає запис на 0.5 с, але не далі ніж на 5 с від першої
+  незбереженої зміни. Невдалий запис повторюється з наростаючою затримкою.
+- Фонові записи йдуть через TaskService (attach), без нього чи без QApplication —
+  одразу в поточному потоці. flush() — синхронний запис усього незбереженого.
+- Відносні шляхи (і path, і legacy) — від теки програми (get_base_path), а не
+  від робочої теки; legacy — старий шлях, з якого файл читається один раз і переноситься.
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer, Qt, pyqtSignal
+
+WRITE_DELAY_MS = 500
+MAX_WRITE_DELAY_MS = 5000        # потік змін не відкладає запис довше
+MAX_RETRY_DELAY_MS = 60000
+TASK_OWNER = "config"
+
+
+def get_base_path() -> str:
+    """
+    Повертає справжню базову директорію проєкту:
+    - Для запуску з Python → директорія, де лежить main.py
+    - Для .exe → директорія з exe файлом
+    """
+    if getattr(sys, 'frozen', False):
+        # 📦 Якщо програма запущена як .exe (через PyInstaller)
+        return os.path.dirname(sys.executable)
+
+    # 🧠 Якщо запущено з вихідного коду — піднімаємося вище /core
+    current = os.path.dirname(os.path.abspath(__file__))
+    return os.path.abspath(os.path.join(current, ".."))
+
+
+def atomic_write(path: str, text: str) -> str:
+    """Записує текст через тимчасовий файл і os.replace (виконується у фоновому потоці)."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+class ConfigSection:
+    """Одна секція = один JSON-файл. Потокобезпечна; змінює файл лише через сховище."""
+
+    def __init__(self, store: "ConfigStore", name: str, path: str, defaults: dict = None,
+                 value_type: type = None, legacy: str = None, indent: int = 4):
+        self.store = store
+        self.name = name
+        self.path = path
+        self.defaults = dict(defaults or {})
+        self.value_type = value_type
+        self.indent = indent
+        self._lock = threading.RLock()
+        self._values = {}
+        self._dirty = False
+        self._load(legacy)
+
+    # ──────────────────────────────
+    # 📖 Читання
+    # ──────────────────────────────
+    def _load(self, legacy: Optional[str]):
+        source = self.path
+        if not os.path.exists(source) and legacy and os.path.exists(legacy):
+            source = legacy
+        if not os.path.exists(source):
+            return
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if not isinstance(stored, dict):
+                raise ValueError("очікується JSON-об'єкт")
+        except Exception as e:
+            print(f"⚠️ Помилка читання {source}: {e} — використовую стандартні значення.")
+            return
+        for key, value in stored.items():
+            try:
+                self._values[key] = self._check(key, value)
+            except TypeError as e:
+                print(f"⚠️ {e} — значення з {source} пропущено.")
+        if source != self.path:
+            print(f"📦 {source} → {self.path}")
+            self._dirty = True
+            self.store._schedule_write(self)
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            return self.defaults.get(key, default)
+
+    def data(self) -> dict:
+        """Копія: стандартні значення + збережені."""
+        with self._lock:
+            return {**self.defaults, **self._values}
+
+    def keys(self):
+        return self.data().keys()
+
+    def items(self):
+        return self.data().items()
+
+    def __getitem__(self, key: str):
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            return self.defaults[key]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._values or key in self.defaults
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.data())
+
+    # ──────────────────────────────
+    # ✏️ Зміни
+    # ──────────────────────────────
+    def _check(self, key: str, value):
+        default = self.defaults.get(key)
+        expected = type(default) if default is not None else self.value_type
+        if expected is None or value is None and default is None:
+            return value
+        if expected is float and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+        if expected is int and isinstance(value, bool) or not isinstance(value, expected):
+            raise TypeError(f"{self.name}.{key}: очікується {expected.__name__}, "
+                            f"отримано {type(value).__name__}")
+        return value
+
+    def set(self, key: str, value):
+        self.update({key: value})
+
+    def update(self, values: dict):
+        checked = {key: self._check(key, value) for key, value in values.items()}
+        with self._lock:
+            changed = [key for key, value in checked.items()
+                       if key not in self._values or self._values[key] != value]
+            for key in changed:
+                self._values[key] = checked[key]
+        self._changed(changed)
+
+    def delete(self, key: str):
+        with self._lock:
+            changed = [key] if key in self._values else []
+            self._values.pop(key, None)
+        self._changed(changed)
+
+    def clear(self):
+        with self._lock:
+            changed = list(self._values)
+            self._values.clear()
+        self._changed(changed)
+
+    def __setitem__(self, key: str, value):
+        self.set(key, value)
+
+    def __delitem__(self, key: str):
+        self.delete(key)
+
+    def _changed(self, keys):
+        if not keys:
+            return
+        with self._lock:
+            self._dirty = True
+        for key in keys:
+            self.store.changed.emit(self.name, key)
+        self.store._schedule_write(self)
+
+    def _take_snapshot(self) -> Optional[str]:
+        """JSON для запису (знімається під замком) або None, якщо змін немає."""
+        with self._lock:
+            if not self._dirty:
+                return None
+            self._dirty = False
+            return json.dumps(self._values, ensure_ascii=False, indent=self.indent)
+
+    def _mark_dirty(self):
+        with self._lock:
+            self._dirty = True
+
+
+class ConfigStore(QObject):
+    changed = pyqtSignal(str, str)   # секція, ключ
+    _write_requested = pyqtSignal()
+    _retry_requested = pyqtSignal()
+
+    def __init__(self, root: str = None, delay_ms: int = WRITE_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self.root = root or get_base_path()
+        self.tasks = None
+        self.sections: Dict[str, ConfigSection] = {}
+        self._lock = threading.Lock()
+        self.delay_ms = delay_ms
+        self._first_change = None   # коли з'явилася перша ще не записана зміна
+        self._failures = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._write_behind)
+        # Зміни можуть прийти з робочих потоків — таймер перезапускається в потоці сховища
+        self._write_requested.connect(self._restart_timer, Qt.QueuedConnection)
+        self._retry_requested.connect(self._schedule_retry, Qt.QueuedConnection)
+
+    def attach(self, tasks):
+        """Записи виконуються через core.tasks.TaskService (по одному, у порядку змін)."""
+        self.tasks = tasks
+
+    def section(self, name: str, path: str, defaults: dict = None, value_type: type = None,
+                legacy: str = None, indent: int = 4) -> ConfigSection:
+        """Реєструє секцію (або повертає вже зареєстровану з тією ж назвою)."""
+        with self._lock:
+            section = self.sections.get(name)
+            if section is None:
+                legacy = os.path.join(self.root, legacy) if legacy else None
+                section = ConfigSection(self, name, os.path.join(self.root, path), defaults,
+                                        value_type, legacy, indent)
+                self.sections[name] = section
+            return section
+
+    # ──────────────────────────────
+    # 💾 Запис
+    # ──────────────────────────────
+    def _schedule_write(self, section: ConfigSection):
+        if QCoreApplication.instance() is None:
+            # Консольні утиліти без циклу подій — пишемо одразу
+            self._write(section, background=False)
+        else:
+            self._write_requested.emit()
+
+    def _restart_timer(self):
+        """Debounce з межею: запис не пізніше MAX_WRITE_DELAY_MS від першої зміни."""
+        now = time.monotonic()
+        if self._first_change is None:
+            self._first_change = now
+        left_ms = MAX_WRITE_DELAY_MS - (now - self._first_change) * 1000
+        self._timer.start(int(max(0, min(self.delay_ms, left_ms))))
+
+    def _schedule_retry(self):
+        if self._timer.isActive():
+            return  # запис і так скоро
+        self._timer.start(min(self.delay_ms * 2 ** self._failures, MAX_RETRY_DELAY_MS))
+
+    def _write_behind(self):
+        self._first_change = None
+        for section in list(self.sections.values()):
+            self._write(section, background=True)
+
+    def _write(self, section: ConfigSection, background: bool):
+        text = section._take_snapshot()
+        if text is None:
+            return
+        if background and self.tasks is not None and not self.tasks.closed:
+            future = self.tasks.submit(TASK_OWNER, atomic_write, section.path, text, key=section.path)
+            future.finished.connect(self._on_write_done)
+            future.failed.connect(lambda error, s=section: self._on_write_failed(s, error))
+            return
+        try:
+            atomic_write(section.path, text)
+        except OSError as e:
+            self._on_write_failed(section, str(e))
+        else:
+            self._on_write_done()
+
+    def _on_write_done(self, _path=None):
+        self._failures = 0
+
+    def _on_write_failed(self, section: ConfigSection, error: str):
+        # Лишаємо секцію «брудною» і пробуємо ще раз: 1 с, 2 с, 4 с… (до хвилини)
+        section._mark_dirty()
+        self._failures += 1
+        print(f"⚠️ Не вдалося записати {section.path}: {error}")
+        if QCoreApplication.instance() is not None:
+            self._retry_requested.emit()
+
+    def flush(self):
+        """Синхронно записує все незбережене (при виході — після tasks.shutdown())."""
+        self._timer.stop()
+        self._first_change = None
+        for section in list(self.sections.values()):
+            self._write(section, background=False)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_config_store() -> ConfigStore:
+    """Спільне сховище процесу (створюється при першому зверненні)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConfigStore()
+            app = QCoreApplication.instance()
+            if app is not None:
+                # Перше звернення могло статися в робочому потоці — таймер має жити в GUI-потоці
+                _store.moveToThread(app.thread())
+        return _store
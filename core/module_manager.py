@@ -1,99 +1,219 @@
 # core/module_manager.py
 from modules.base_module import BaseModule
+import hashlib
 import importlib
 import os
 import json
 import sys
+import time
 from PyQt5.QtCore import QObject, pyqtSignal
+from core.config_store import get_base_path, get_config_store
+from core.profiler import profiler
 from typing import Dict, List, Optional
 
+MANIFEST_FILE = "module.json"
 
-def get_base_path() -> str:
+
+class ModuleManifest:
     """
-    Повертає справжню базову директорію проєкту:
-    - Для запуску з Python → директорія, де лежить main.py
-    - Для .exe → директорія з exe файлом
+    Опис модуля з modules/<тека>/module.json — читається без імпорту коду:
+    {"name": ..., "icon": ..., "category": ..., "entry_point": "modules.x:register_module"}
     """
-    if getattr(sys, 'frozen', False):
-        # 📦 Якщо програма запущена як .exe (через PyInstaller)
-        return os.path.dirname(sys.executable)
 
-    # 🧠 Якщо запущено з вихідного коду — піднімаємося вище /core
-    current = os.path.dirname(os.path.abspath(__file__))
-    return os.path.abspath(os.path.join(current, ".."))
+    def __init__(self, folder: str, name: str, icon: str = "", category: str = "General",
+                 entry_point: str = None):
+        self.folder = folder
+        self.name = name
+        self.icon = icon
+        self.category = category
+        self.entry_point = entry_point or f"modules.{folder}:register_module"
+
+    @classmethod
+    def load(cls, folder: str, path: str) -> "ModuleManifest":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(folder, data["name"], data.get("icon", ""), data.get("category", "General"),
+                   data.get("entry_point"))
+
+
+class ReloadPlan:
+    """Що змінилося в modules/ з останнього завантаження (теки і назви модулів)."""
+
+    def __init__(self):
+        self.removed: List[str] = []   # вимкнені або видалені теки
+        self.added: List[str] = []     # нові або щойно увімкнені теки
+        self.changed: List[str] = []   # теки зі зміненим кодом
+        self.unload: List[str] = []    # назви завантажених модулів, які треба прибрати
+        self.folders: List[str] = []   # усі увімкнені теки (порядок Sidebar)
+
+    def __bool__(self):
+        return bool(self.removed or self.added or self.changed)
 
 
 class ModuleManager(QObject):
     modules_changed = pyqtSignal()
+    module_loaded = pyqtSignal(str)  # назва модуля, щойно імпортованого на вимогу
 
-    def __init__(self):
+    def __init__(self, tasks=None):
         super().__init__()
         self.base_path = get_base_path()
-        self.modules: Dict[str, BaseModule] = {}
+        self.tasks = tasks  # core.tasks.TaskService — призначається кожному модулю
+        self.manifests: Dict[str, ModuleManifest] = {}  # назва → маніфест (усі увімкнені)
+        self.modules: Dict[str, BaseModule] = {}        # назва → екземпляр (лише завантажені)
+        self._fingerprints: Dict[str, str] = {}         # тека → відбиток коду на момент завантаження
         self.MODULE_STATE_FILE = os.path.join(self.base_path, "config", "module_state.json")
-
-        self.enabled_modules = self._load_enabled_state()
+        # Стан увімкнення: назва теки → bool (у пам'яті; файл пишеться у фоні)
+        self.module_state = get_config_store().section("module_state", self.MODULE_STATE_FILE, value_type=bool)
+        print(f"🧭 Завантажено стан модулів: {self.module_state.data()}")
 
         print(f"\n📁 Базовий шлях: {self.base_path}")
         print("⏳ Завантаження модулів...")
         self.load_modules()
 
-    def _load_enabled_state(self) -> dict:
-        if os.path.exists(self.MODULE_STATE_FILE):
-            try:
-                with open(self.MODULE_STATE_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    print(f"🧭 Завантажено стан модулів: {data}")
-                    return data
-            except Exception as e:
-                print(f"⚠️ Помилка читання стану: {e}")
-        return {}
-
-    def _save_enabled_state(self):
-        os.makedirs(os.path.join(self.base_path, "config"), exist_ok=True)
-        with open(self.MODULE_STATE_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.enabled_modules, f, indent=4, ensure_ascii=False)
-        print(f"💾 Стан модулів збережено: {self.enabled_modules}")
+    @property
+    def enabled_modules(self) -> dict:
+        return self.module_state.data()
 
     def set_module_enabled(self, name: str, enabled: bool):
-        self.enabled_modules[name] = enabled
-        self._save_enabled_state()
+        self.module_state.set(name, enabled)
+        print(f"💾 Стан модулів: {self.module_state.data()}")
         self.modules_changed.emit()
 
     def is_module_enabled(self, name: str) -> bool:
-        return self.enabled_modules.get(name, True)
+        return self.module_state.get(name, True)
 
     def load_modules(self):
-        """Повністю перезавантажує модулі відповідно до стану."""
-        modules_dir = os.path.join(self.base_path, "modules")
+        """
+        Повністю перечитує список модулів відповідно до стану. Модулі з module.json
+        лише реєструються (код імпортується при першому виборі), решта —
+        імпортуються одразу, як і раніше.
+        """
+        started = time.perf_counter()
+        self.manifests.clear()
         self.modules.clear()
+        self._fingerprints.clear()
+
+        for module_name in self._enabled_folders():
+            with profiler.span(f"register: {module_name}", "module"):
+                self._register(module_name)
+
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"⏱️ Модулі: {len(self.manifests)} за {elapsed:.1f} мс "
+              f"(імпортовано одразу: {len(self.modules)})")
 
+    def _enabled_folders(self) -> List[str]:
+        modules_dir = os.path.join(self.base_path, "modules")
         if not os.path.exists(modules_dir):
             print(f"⚠️ Папка '{modules_dir}' не знайдена!")
-            return
+            return []
 
-        for module_name in os.listdir(modules_dir):
+        folders = []
+        for module_name in sorted(os.listdir(modules_dir)):
             if self._should_skip_module(module_name):
                 continue
-
             if not self.is_module_enabled(module_name):
                 print(f"🚫 Модуль '{module_name}' вимкнено (пропускаємо).")
                 continue
+            folders.append(module_name)
+        return folders
 
-            try:
-                module = importlib.import_module(f"modules.{module_name}")
-                importlib.reload(module)
-                if not hasattr(module, "register_module"):
+    def _register(self, module_name: str):
+        self._fingerprints[module_name] = self.fingerprint(module_name)
+        manifest_path = os.path.join(self.base_path, "modules", module_name, MANIFEST_FILE)
+        try:
+            if os.path.exists(manifest_path):
+                manifest = ModuleManifest.load(module_name, manifest_path)
+                self.manifests[manifest.name] = manifest
+                print(f"📋 {manifest.name} (з '{module_name}') зареєстровано.")
+            else:
+                self._load_legacy(module_name)
+        except Exception as e:
+            print(f"⚠️ Помилка завантаження '{module_name}': {e}")
+
+    def _load_legacy(self, module_name: str):
+        """Модуль без маніфесту: імпорт і register_module() одразу."""
+        instance = self._instantiate(f"modules.{module_name}:register_module")
+        if instance is None:
+            return
+        self.manifests[instance.name] = ModuleManifest(
+            module_name, instance.name, instance.icon, instance.category
+        )
+        self.modules[instance.name] = instance
+        print(f"✅ {instance.name} (з '{module_name}') завантажено!")
+
+    def _instantiate(self, entry_point: str) -> Optional[BaseModule]:
+        module_path, _, factory_name = entry_point.partition(":")
+        module = importlib.import_module(module_path)
+        factory = getattr(module, factory_name or "register_module", None)
+        if factory is None:
+            return None
+        instance = factory()
+        if not isinstance(instance, BaseModule):
+            return None
+        if self.tasks is not None:
+            instance.tasks = self.tasks
+        return instance
+
+    # ──────────────────────────────
+    # 🔁 Інкрементне перезавантаження
+    # ──────────────────────────────
+    def fingerprint(self, module_name: str) -> str:
+        """Відбиток коду модуля: шляхи, mtime і розміри *.py та module.json (вміст не читається)."""
+        folder = os.path.join(self.base_path, "modules", module_name)
+        digest = hashlib.blake2b(digest_size=16)
+        for root, dirs, files in os.walk(folder):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__" and not d.startswith("."))
+            for name in sorted(files):
+                if not (name.endswith(".py") or name == MANIFEST_FILE):
                     continue
-                instance = module.register_module()
-                if not isinstance(instance, BaseModule):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
                     continue
+                rel = os.path.relpath(path, folder)
+                digest.update(f"{rel}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def plan_reload(self) -> ReloadPlan:
+        """Порівнює теку modules/ і стан увімкнення з тим, що зараз зареєстровано."""
+        current = {manifest.folder: manifest.name for manifest in self.manifests.values()}
+        current.update({folder: None for folder in self._fingerprints if folder not in current})
+        wanted = self._enabled_folders()
+
+        plan = ReloadPlan()
+        plan.folders = wanted
+        plan.removed = [folder for folder in current if folder not in wanted]
+        plan.added = [folder for folder in wanted if folder not in current]
+        plan.changed = [folder for folder in wanted
+                        if folder in current and self.fingerprint(folder) != self._fingerprints.get(folder)]
+        plan.unload = [current[folder] for folder in plan.removed + plan.changed
+                       if current[folder] in self.modules]
+        return plan
 
-                self.modules[instance.name] = instance
-                print(f"✅ {instance.name} (з '{module_name}') завантажено!")
+    def apply_reload(self, plan: ReloadPlan):
+        """
+        Вивантажує вимкнені й змінені модулі та реєструє нові. Решта екземплярів
+        (і їхні віджети) лишаються як були. Код вивантажених модулів вилучається
+        з sys.modules, тож наступний імпорт бере його з диска повністю, а не лише __init__.
+        """
+        for folder in plan.removed + plan.changed:
+            self._fingerprints.pop(folder, None)
+            for name in [n for n, m in self.manifests.items() if m.folder == folder]:
+                del self.manifests[name]
+                self.modules.pop(name, None)
+        for folder in plan.removed + plan.changed:
+            prefix = f"modules.{folder}"
+            for key in [k for k in sys.modules if k == prefix or k.startswith(prefix + ".")]:
+                del sys.modules[key]
+        for folder in plan.added + plan.changed:
+            self._register(folder)
 
-            except Exception as e:
-                print(f"⚠️ Помилка завантаження '{module_name}': {e}")
+        # Порядок — як у теці (Sidebar не «перемішується» після перезавантаження)
+        order = {folder: i for i, folder in enumerate(plan.folders)}
+        self.manifests = dict(sorted(self.manifests.items(), key=lambda item: order.get(item[1].folder, 0)))
+        print(f"🔁 Модулі: вивантажено {plan.unload or '—'}, нові {plan.added or '—'}, "
+              f"змінені {plan.changed or '—'}, вимкнені {plan.removed or '—'}")
 
     def _should_skip_module(self, module_name: str) -> bool:
         return (
@@ -103,7 +223,72 @@ class ModuleManager(QObject):
         )
 
     def get_module(self, name: str) -> Optional[BaseModule]:
+        """Екземпляр модуля; при першому зверненні імпортує його код."""
+        instance = self.modules.get(name)
+        if instance is not None:
+            return instance
+        manifest = self.manifests.get(name)
+        if manifest is None:
+            return None
+
+        started = time.perf_counter()
+        self._fingerprints[manifest.folder] = self.fingerprint(manifest.folder)
+        try:
+            with profiler.span(f"import: {manifest.folder}", "module", entry_point=manifest.entry_point):
+                instance = self._instantiate(manifest.entry_point)
+        except Exception as e:
+            print(f"⚠️ Помилка завантаження '{manifest.folder}': {e}")
+            return None
+        if instance is None:
+            print(f"⚠️ '{manifest.entry_point}' не повернув BaseModule.")
+            return None
+        if instance.name != manifest.name:
+            print(f"⚠️ Назва в {manifest.folder}/{MANIFEST_FILE} ('{manifest.name}') "
+                  f"не збігається з кодом ('{instance.name}').")
+        self.modules[name] = instance
+        print(f"✅ {name} (з '{manifest.folder}') завантажено за "
+              f"{(time.perf_counter() - started) * 1000:.0f} мс.")
+        self.module_loaded.emit(name)
+        return instance
+
+    def get_loaded_module(self, name: str) -> Optional[BaseModule]:
+        """Екземпляр, лише якщо модуль уже завантажено (без імпорту)."""
         return self.modules.get(name)
 
+    def get_manifests(self) -> List[ModuleManifest]:
+        """Усі увімкнені модулі (для списку в Sidebar) — без імпорту."""
+        return list(self.manifests.values())
+
     def get_all_modules(self) -> List[BaseModule]:
+        """Лише вже завантажені екземпляри."""
         return list(self.modules.values())
+
+
+def _measure_startup(mode: str) -> float:
+    """Час ModuleManager() у свіжому процесі: lazy — маніфести, eager — імпорт усіх модулів."""
+    import subprocess
+    code = (
+        "import time, sys; started = time.perf_counter()\n"
+        "from PyQt5.QtWidgets import QApplication; app = QApplication(sys.argv)\n"
+        "from core.module_manager import ModuleManager\n"
+        "t = time.perf_counter(); manager = ModuleManager()\n"
+        "if sys.argv[1] == 'eager':\n"
+        "    [manager.get_module(m.name) for m in manager.get_manifests()]\n"
+        "print('RESULT', (time.perf_counter() - t) * 1000)\n"
+    )
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    output = subprocess.run([sys.executable, "-c", code, mode], cwd=get_base_path(), env=env,
+                            capture_output=True, text=True, encoding="utf-8").stdout
+    for line in output.splitlines():
+        if line.startswith("RESULT"):
+            return float(line.split()[1])
+    raise RuntimeError(f"не вдалося виміряти режим {mode}:\n{output}")
+
+
+if __name__ == "__main__":
+    # python -m core.module_manager — порівняння старту: маніфести проти імпорту всього
+    runs = 5
+    lazy = sorted(_measure_startup("lazy") for _ in range(runs))[runs // 2]
+    eager = sorted(_measure_startup("eager") for _ in range(runs))[runs // 2]
+    print(f"⏱️ Маніфести: {lazy:.1f} мс, імпорт усіх модулів: {eager:.1f} мс "
+          f"(економія {eager - lazy:.1f} мс, медіана з {runs})")
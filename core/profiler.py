@@ -0,0 +1,126 @@
+# core/profiler.py
+"""
+Профілювання старту: вкладені інтервали (spans) фаз запуску й модулів.
+
+    python main.py --profile-startup                 # startup_trace.json + таблиця в консолі
+    python main.py --profile-startup=trace.json --profile-exit
+
+Результат — Chrome trace-event JSON (відкривається в https://ui.perfetto.dev
+або chrome://tracing). Без прапорця profiler вимкнений і span() нічого не коштує.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+DEFAULT_TRACE = "startup_trace.json"
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.exit_after = False
+        self.trace_path = DEFAULT_TRACE
+        self.events = []       # (назва, категорія, початок с, тривалість с, глибина, args)
+        self._depth = 0
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def configure(self, argv) -> list:
+        """Вмикає профілювання за прапорцями і прибирає їх з argv (щоб не бачив Qt)."""
+        rest = []
+        for arg in argv:
+            if arg == "--profile-startup" or arg.startswith("--profile-startup="):
+                self.enabled = True
+                _, _, path = arg.partition("=")
+                self.trace_path = path or DEFAULT_TRACE
+            elif arg == "--profile-exit":
+                self.exit_after = True
+            else:
+                rest.append(arg)
+        if self.enabled:
+            print(f"⏱️ Профілювання старту → {self.trace_path}")
+        return rest
+
+    def span(self, name: str, category: str = "startup", **args):
+        """with profiler.span("MainWindow.init_ui"): ... — вкладені інтервали стають деревом."""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, category, args)
+
+    @contextmanager
+    def _span(self, name, category, args):
+        depth = self._depth
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._depth = depth
+            with self._lock:
+                self.events.append((name, category, started - self._origin, elapsed, depth, args))
+
+    def mark(self, name: str, category: str = "startup"):
+        """Миттєва подія (напр., «перший кадр»)."""
+        if self.enabled:
+            with self._lock:
+                self.events.append((name, category, time.perf_counter() - self._origin, None,
+                                    self._depth, {}))
+
+    # ──────────────────────────────
+    # 💾 Експорт
+    # ──────────────────────────────
+    def write_trace(self, path: str = None) -> str:
+        path = path or self.trace_path
+        pid, tid = os.getpid(), threading.get_ident()
+        trace = []
+        for name, category, start, duration, _depth, args in sorted(self.events, key=lambda e: e[2]):
+            event = {"name": name, "cat": category, "ts": round(start * 1e6, 1), "pid": pid, "tid": tid}
+            if duration is None:
+                event.update(ph="i", s="t")
+            else:
+                event.update(ph="X", dur=round(duration * 1e6, 1))
+            if args:
+                event["args"] = {k: str(v) for k, v in args.items()}
+            trace.append(event)
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        return path
+
+    def summary(self) -> str:
+        """Таблиця: інтервали в порядку початку, з відступом за вкладеністю і власним часом."""
+        spans = sorted((e for e in self.events if e[3] is not None), key=lambda e: (e[2], e[4]))
+        marks = [e for e in self.events if e[3] is None]
+        if not spans:
+            return "(немає інтервалів)"
+        total = max(start + duration for _n, _c, start, duration, _d, _a in spans)
+
+        lines = [f"{'Етап':<52} {'мс':>9} {'власний':>9} {'%':>6}"]
+        for i, (name, _cat, start, duration, depth, _args) in enumerate(spans):
+            # Власний час: мінус безпосередні дочірні інтервали
+            children = sum(
+                d for _n, _c, s, d, dep, _a in spans[i + 1:]
+                if dep == depth + 1 and start <= s < start + duration
+            )
+            label = ("  " * depth + name)[:52]
+            lines.append(f"{label:<52} {duration * 1000:>9.1f} {(duration - children) * 1000:>9.1f} "
+                         f"{duration / total * 100:>5.1f}%")
+        for name, _cat, start, _d, _depth, _args in marks:
+            lines.append(f"{'◆ ' + name:<52} {'@' + format(start * 1000, '.1f'):>9}")
+        return "\n".join(lines)
+
+    def finish(self):
+        """Записує trace і друкує таблицю (викликається, коли з'явився перший кадр)."""
+        if not self.enabled:
+            return
+        path = self.write_trace()
+        print("\n" + self.summary())
+        print(f"💾 Trace старту: {os.path.abspath(path)} (відкрийте в ui.perfetto.dev)")
+
+
+profiler = StartupProfiler()
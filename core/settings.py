@@ -1,35 +1,33 @@
-import json
 import os
+from core.config_store import get_config_store
 
 class Settings:
-    CONFIG_FILE = "config.json"
+    CONFIG_FILE = os.path.join("config", "config.json")
 
     def __init__(self):
-        self.data = {
-            "enabled_modules": []
-        }
-        self.load()
+        # config.json з теки програми переноситься в config/ при першому читанні
+        self.section = get_config_store().section(
+            "settings", self.CONFIG_FILE, defaults={"enabled_modules": []}, legacy="config.json"
+        )
+
+    @property
+    def data(self) -> dict:
+        return self.section.data()
 
     def load(self):
-        if os.path.exists(self.CONFIG_FILE):
-            try:
-                with open(self.CONFIG_FILE, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
-            except Exception:
-                print("⚠️ Помилка при читанні config.json, використовую стандартні налаштування.")
+        """Значення вже в пам'яті сховища (файл читається один раз)."""
+        return self.data
 
     def save(self):
-        with open(self.CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=4)
+        """Запис відбувається сам (відкладено, у фоні) після кожної зміни."""
 
     def is_module_enabled(self, name: str) -> bool:
-        return name in self.data.get("enabled_modules", [])
+        return name in self.section.get("enabled_modules", [])
 
     def set_module_enabled(self, name: str, enabled: bool):
-        modules = set(self.data.get("enabled_modules", []))
+        modules = set(self.section.get("enabled_modules", []))
         if enabled:
             modules.add(name)
         else:
             modules.discard(name)
-        self.data["enabled_modules"] = list(modules)
-        self.save()
+        self.section.set("enabled_modules", sorted(modules))
@@ -0,0 +1,256 @@
+# core/tasks.py
+"""
+Спільний сервіс фонових задач для модулів (створює MyApp, модулі бачать як self.tasks).
+
+    future = self.tasks.submit(self.name, write_file, path, html, key="autosave")
+    future.finished.connect(...)     # результат — уже в GUI-потоці
+    future.failed.connect(...)       # текст помилки
+    future.cancel()
+
+- Типово — ThreadPoolExecutor (I/O, мережа, SQLite); process=True — ProcessPoolExecutor
+  (створюється при першій потребі) для важких обчислень, функція й аргументи мають бути picklable.
+- Ліміт паралельних задач на модуль (типово 1, set_limit); зайві чекають у черзі власника.
+- key: ще не запущена задача з тим самим ключем замінюється новою (автозбереження);
+  підписники заміненої не губляться — її сигнали приходять разом із сигналами нової.
+- cancellable=True — функція отримує token=CancellationToken і сама перевіряє token.cancelled.
+
+submit()/cancel() викликаються з GUI-потоку.
+"""
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal, pyqtSlot
+
+# Типово задачі модуля йдуть по одній — старіший запис файлу не перезапише новіший
+DEFAULT_LIMIT = 1
+
+
+class CancelledError(Exception):
+    """Задачу скасовано (кидає token.raise_if_cancelled())."""
+
+
+class CancellationToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise CancelledError()
+
+
+class TaskFuture(QObject):
+    """Результат фонової задачі; сигнали надходять у GUI-потоці."""
+    finished = pyqtSignal(object)   # результат функції
+    failed = pyqtSignal(str)        # текст помилки
+    cancelled = pyqtSignal()
+
+    PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
+
+    def __init__(self, service: "TaskService", owner: str, key: Optional[str] = None):
+        super().__init__(service)
+        self.service = service
+        self.owner = owner
+        self.key = key
+        self.token = CancellationToken()
+        self.state = self.PENDING
+        self.result = None
+        self.error = None
+        self.replaced = []   # замінені цією задачею (ключ) — завершуються разом із нею
+
+    def cancel(self):
+        """Ще не запущена — знімається з черги; запущена — лише отримує сигнал через token."""
+        self.service.cancel(self)
+
+    def is_done(self) -> bool:
+        return self.state in (self.DONE, self.FAILED, self.CANCELLED)
+
+
+class _Owner:
+    """Черга й лічильник запущених задач одного модуля."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.running = 0
+        self.queue = deque()   # (future, fn, args, kwargs, process)
+
+
+class TaskService(QObject):
+    _completed = pyqtSignal(object, object, object)   # future, результат, виняток
+
+    def __init__(self, threads: int = None, processes: int = None, parent=None):
+        super().__init__(parent)
+        self.threads = threads or min(8, (os.cpu_count() or 2) + 2)
+        self.processes = processes or max(1, (os.cpu_count() or 2) - 1)
+        self._thread_pool = ThreadPoolExecutor(self.threads, thread_name_prefix="task")
+        self._process_pool = None
+        self._owners: Dict[str, _Owner] = {}
+        self._closed = False
+        self._idle = threading.Condition()
+        self._active = 0
+        # Завжди через цикл подій: і з робочого потоку, і коли задача завершилась ще
+        # до add_done_callback (тоді колбек виконується в GUI-потоці) — підписники
+        # future встигають під'єднатися
+        self._completed.connect(self._on_completed, Qt.QueuedConnection)
+
+    # ──────────────────────────────
+    # 📤 Постановка задач
+    # ──────────────────────────────
+    def set_limit(self, owner: str, limit: int):
+        """Скільки задач модуля може виконуватися одночасно (решта чекають)."""
+        self._owner(owner).limit = max(1, limit)
+        self._drain(owner)
+
+    def submit(self, owner: str, fn: Callable, *args, process: bool = False, key: str = None,
+               cancellable: bool = False, **kwargs) -> TaskFuture:
+        future = TaskFuture(self, owner, key)
+        if self._closed:
+            future.state = TaskFuture.CANCELLED
+            return future
+        state = self._owner(owner)
+        if key is not None:
+            for queued in list(state.queue):
+                if queued[0].key == key:
+                    state.queue.remove(queued)
+                    future.replaced.append(queued[0])
+        if cancellable and not process:
+            kwargs["token"] = future.token
+        state.queue.append((future, fn, args, kwargs, process))
+        self._drain(owner)
+        return future
+
+    def cancel(self, future: TaskFuture):
+        future.token.cancel()
+        state = self._owners.get(future.owner)
+        if future.state != TaskFuture.PENDING or state is None:
+            return
+        for queued in state.queue:
+            if queued[0] is future:
+                state.queue.remove(queued)
+                self._finish(future, TaskFuture.CANCELLED)
+                break
+
+    def cancel_owner(self, owner: str):
+        """Скасовує всі задачі модуля (напр., при вивантаженні)."""
+        state = self._owners.get(owner)
+        if state is None:
+            return
+        while state.queue:
+            self._finish(state.queue.popleft()[0], TaskFuture.CANCELLED)
+        for child in self.findChildren(TaskFuture):
+            if child.owner == owner and child.state == TaskFuture.RUNNING:
+                child.token.cancel()
+
+    def pending(self, owner: str = None) -> int:
+        """Задачі в черзі і в роботі (усього або одного модуля)."""
+        owners = [self._owners[owner]] if owner in self._owners else (
+            [] if owner else list(self._owners.values()))
+        return sum(len(state.queue) + state.running for state in owners)
+
+    # ──────────────────────────────
+    # ⚙️ Виконання
+    # ──────────────────────────────
+    def _owner(self, owner: str) -> _Owner:
+        state = self._owners.get(owner)
+        if state is None:
+            state = self._owners[owner] = _Owner(DEFAULT_LIMIT)
+        return state
+
+    def _drain(self, owner: str):
+        state = self._owners[owner]
+        while state.queue and state.running < state.limit:
+            future, fn, args, kwargs, process = state.queue.popleft()
+            state.running += 1
+            self._start(future, fn, args, kwargs, process)
+
+    def _start(self, future, fn, args, kwargs, process):
+        future.state = TaskFuture.RUNNING
+        with self._idle:
+            self._active += 1
+        if process:
+            pending = self._processes().submit(fn, *args, **kwargs)
+        else:
+            pending = self._thread_pool.submit(fn, *args, **kwargs)
+        pending.add_done_callback(lambda done: self._report(future, done))
+
+    def _processes(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(self.processes)
+        return self._process_pool
+
+    def _report(self, future, done):
+        # Робочий потік: лише передаємо результат у GUI-потік
+        error = done.exception()
+        self._completed.emit(future, None if error else done.result(), error)
+        with self._idle:
+            self._active -= 1
+            self._idle.notify_all()
+
+    @pyqtSlot(object, object, object)
+    def _on_completed(self, future, result, error):
+        state = self._owners.get(future.owner)
+        if state is not None:
+            state.running = max(0, state.running - 1)
+        if isinstance(error, CancelledError) or (error is None and future.token.cancelled):
+            self._finish(future, TaskFuture.CANCELLED)
+        elif error is not None:
+            future.error = error
+            print(f"⚠️ Фонова задача '{future.owner}' завершилася з помилкою: {error}")
+            self._finish(future, TaskFuture.FAILED)
+        else:
+            future.result = result
+            self._finish(future, TaskFuture.DONE)
+        if state is not None and not self._closed:
+            self._drain(future.owner)
+
+    def _finish(self, future: TaskFuture, status: str):
+        # Спершу замінені (старіші) — підписники нової задачі отримують сигнал останніми
+        for replaced in future.replaced:
+            replaced.result, replaced.error = future.result, future.error
+            self._finish(replaced, status)
+        future.replaced = []
+        future.state = status
+        if status == TaskFuture.DONE:
+            future.finished.emit(future.result)
+        elif status == TaskFuture.FAILED:
+            future.failed.emit(str(future.error))
+        else:
+            future.cancelled.emit()
+        future.deleteLater()
+
+    # ──────────────────────────────
+    # 🧹 Завершення
+    # ──────────────────────────────
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def wait(self, timeout: float = None) -> bool:
+        """Чекає, доки завершаться запущені задачі (черга власників не запускається)."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._active == 0, timeout)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Закриття програми: задачі з черг запускаються без лімітів (автозбереження
+        не губиться), потім пули закриваються. Сигнали після цього вже не надходять.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for state in self._owners.values():
+            while state.queue:
+                future, fn, args, kwargs, process = state.queue.popleft()
+                self._start(future, fn, args, kwargs, process)
+        self._thread_pool.shutdown(wait=wait)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
@@ -1,27 +1,26 @@
 # core/theme_manager.py
 from PyQt5.QtCore import QObject, pyqtSignal
-import json, os
+import os
+from core.config_store import get_config_store
 
 class ThemeManager(QObject):
     theme_changed = pyqtSignal(str)  # сигнал: "light" або "dark"
 
     def __init__(self):
         super().__init__()
+        # Раніше theme.json лежав у корені теки програми — переноситься в config/ при першому читанні
+        self.config = get_config_store().section(
+            "theme", os.path.join("config", "theme.json"), defaults={"theme": "light"},
+            legacy="theme.json", indent=2,
+        )
         self.current_theme = self.load_theme()
 
     def load_theme(self):
-        path = "theme.json"
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f).get("theme", "light")
-            except:
-                pass
-        return "light"
+        theme = self.config.get("theme")
+        return theme if theme in ("light", "dark") else "light"
 
     def save_theme(self):
-        with open("theme.json", "w", encoding="utf-8") as f:
-            json.dump({"theme": self.current_theme}, f, ensure_ascii=False, indent=2)
+        self.config.set("theme", self.current_theme)
 
     def toggle_theme(self):
         self.current_theme = "dark" if self.current_theme == "light" else "light"
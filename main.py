@@ -1,13 +1,20 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
-from core.app import MyApp
+from core.profiler import profiler  # першим: відлік часу старту
+
+# --profile-startup: записати timeline старту (див. core/profiler.py)
+if __name__ == "__main__":
+    sys.argv = profiler.configure(sys.argv)
+
+with profiler.span("import PyQt5"):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import Qt
+with profiler.span("import core.app"):
+    from core.app import MyApp
 
 # Важливо: ці налаштування мають бути перед створенням QApplication
 if __name__ == "__main__":
     QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)  # Необхідно для QtWebEngine
-    app = QApplication(sys.argv)
-    
-    # Ініціалізація головного вікна
+
+    # Ініціалізація головного вікна (QApplication створює MyApp — він має бути один)
     main_app = MyApp()
-    main_app.run()
\ No newline at end of file
+    main_app.run()
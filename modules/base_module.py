@@ -3,6 +3,9 @@ from abc import ABC, abstractmethod
 from PyQt5.QtWidgets import QWidget
 
 class BaseModule(ABC):
+    # Спільний сервіс фонових задач (core.tasks.TaskService); призначає ModuleManager
+    tasks = None
+
     def __init__(self, name, icon, category="General"):
         self.name = name
         self.icon = icon
@@ -16,4 +19,28 @@ class BaseModule(ABC):
     @abstractmethod
     def get_menu_actions(self):
         """Повертає дії для додавання у меню програми"""
-        return []
\ No newline at end of file
+        return []
+
+    def run_task(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        """
+        Виконує fn у фоні через self.tasks (аргументи — як у TaskService.submit);
+        on_done / on_error викликаються в GUI-потоці. Без сервісу — виконує одразу.
+        """
+        if self.tasks is None:
+            try:
+                result = fn(*args, **{k: v for k, v in kwargs.items()
+                                      if k not in ("process", "key", "cancellable")})
+            except Exception as e:
+                print(f"⚠️ Задача '{self.name}' завершилася з помилкою: {e}")
+                if on_error:
+                    on_error(str(e))
+                return None
+            if on_done:
+                on_done(result)
+            return None
+        future = self.tasks.submit(self.name, fn, *args, **kwargs)
+        if on_done:
+            future.finished.connect(on_done)
+        if on_error:
+            future.failed.connect(on_error)
+        return future
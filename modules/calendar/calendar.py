@@ -3,13 +3,14 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QCalendarWidget,
                             QTextEdit, QPushButton, QLabel, QAction)
 from PyQt5.QtCore import QDate, Qt, QLocale
 from PyQt5.QtGui import QTextCharFormat, QColor
-import json
 import os
+from core.config_store import get_config_store
+
 
 class CalendarModule(BaseModule):
     def __init__(self):
         super().__init__("Календар", "calendar.png", "Продуктивність")
-        self.notes_file = "calendar_notes.json"
+        self.notes_file = os.path.join("data", "calendar_notes.json")
         self.notes = self.load_notes()
         self.calendar = None  # Ініціалізуємо як None
     
@@ -64,16 +65,13 @@ class CalendarModule(BaseModule):
         return widget
    
     def load_notes(self):
-        """Завантажує замітки з файлу"""
-        if os.path.exists(self.notes_file):
-            with open(self.notes_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        """Замітки «дата → текст» зі сховища (calendar_notes.json з теки програми переноситься в data/)"""
+        return get_config_store().section(
+            "calendar_notes", self.notes_file, value_type=str, legacy="calendar_notes.json", indent=2
+        )
     
     def save_notes(self):
-        """Зберігає замітки у файл"""
-        with open(self.notes_file, 'w', encoding='utf-8') as f:
-            json.dump(self.notes, f, ensure_ascii=False, indent=2)
+        """Зміни в self.notes записуються самі — відкладено й у фоні"""
     
     def on_date_selected(self):
         """Обробник вибору дати"""
@@ -6,12 +6,16 @@ from PyQt5.QtCore import Qt, QDate, QTimer
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
 import os
 
+from core.config_store import atomic_write
+
+
 class NotesModule(BaseModule):
     def __init__(self):
         super().__init__("Блокнот+", "notes.png", "Продуктивність")
         self.file_path = os.path.join("data", "notes_data.html")  # Шлях до єдиного файлу
         os.makedirs("data", exist_ok=True)  # Створюємо папку, якщо немає
         self.current_color = None
+        self._saved_html = None  # останній записаний вміст — таймер не пише без змін
 
     def create_content_widget(self) -> QWidget:
         widget = QWidget()
@@ -201,25 +205,39 @@ class NotesModule(BaseModule):
         
         if path:
             self.file_path = path
-            self.save_content()
-            QMessageBox.information(self.text_edit, "Успіх", "Файл успішно збережено!")
-
-    def save_content(self):
-        """Автоматичне збереження (викликається таймером)"""
-        try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                f.write(self.text_edit.toHtml())
-        except Exception as e:
-            print(f"Помилка автозбереження: {str(e)}")
+            self.save_content(
+                force=True,
+                on_done=lambda _path: QMessageBox.information(self.text_edit, "Успіх", "Файл успішно збережено!"),
+            )
+
+    def save_content(self, force=False, on_done=None):
+        """Автоматичне збереження (викликається таймером): HTML знімається тут, пишеться у фоні"""
+        html = self.text_edit.toHtml()
+        if html == self._saved_html and not force:
+            return
+
+        def saved(path):
+            self._saved_html = html
+            if on_done:
+                on_done(path)
+
+        # Атомарно (тимчасовий файл + os.replace); новіше збереження того ж файлу
+        # замінює ще не почате, а його on_done спрацює разом із новим
+        self.run_task(
+            atomic_write, self.file_path, html, key=f"save:{self.file_path}", on_done=saved,
+            on_error=lambda error: print(f"Помилка автозбереження: {error}"),
+        )
 
     def force_save(self):
         """Примусове збереження (кнопка)"""
-        self.save_content()
-        QMessageBox.information(None, "Успіх", "Нотатки збережено!")
+        self.save_content(
+            force=True,
+            on_done=lambda _path: QMessageBox.information(None, "Успіх", "Нотатки збережено!"),
+        )
 
     def get_menu_actions(self):
         """Додаємо кнопку ручного збереження"""
         from PyQt5.QtWidgets import QAction
         save_action = QAction("Зберегти", self)
-        save_action.triggered.connect(self.save_content)
+        save_action.triggered.connect(lambda: self.save_content(force=True))
         return [save_action]
\ No newline at end of file
@@ -1,6 +1,5 @@
 # modules/novel_browser/__init__.py
 from modules.base_module import BaseModule
-from modules.novel_browser.ui import NovelBrowserUI
 from PyQt5.QtWidgets import QAction
 from typing import List
 # ❌ Видалено імпорти, які тут не потрібні
@@ -15,22 +14,39 @@ class NovelBrowserWrapper(BaseModule):
             icon="icons/book.png",
             category="Читання"
         )
-        self.ui = NovelBrowserUI()
+        # QtWebEngine (два Chromium-перегляди, профіль, блокувальник) створюється
+        # лише при першому показі модуля — до того лише легка заглушка
+        self.ui = None
+        self.host = None
+        self._theme = "light"
+        self._visible = False
+
+    def _create_ui(self):
+        # Імпорт UI тут, щоб ні старт програми, ні `python -m modules.novel_browser.<утиліта>`
+        # не тягнули QtWebEngine
+        from modules.novel_browser.ui import NovelBrowserUI
+        return NovelBrowserUI()
+
+    def _on_ui_created(self, ui):
+        self.ui = ui
+        self.ui.apply_theme(self._theme)
+        if self._visible:
+            self.ui.resume_sync()
 
     def create_content_widget(self):
-        return self.ui
-    
+        if self.host is None:
+            from modules.novel_browser.lazy import LazyHost
+            self.host = LazyHost(self._create_ui, "⏳ Завантаження Novel Browser…", self._on_ui_created)
+        return self.host
+
     def on_theme_changed(self, theme_name: str):
         """
-        ⚡️ ОНОВЛЕНО: Передаємо сигнал про зміну теми безпосередньо у UI.
+        ⚡️ ОНОВЛЕНО: Передаємо сигнал про зміну теми безпосередньо у UI
+        (або запам'ятовуємо до його створення).
         """
+        self._theme = theme_name
         if self.ui:
             self.ui.apply_theme(theme_name)
-        else:
-            self.ui.setStyleSheet("""
-                background-color: #ffffff;
-                color: #000;
-            """)
 
     def get_menu_actions(self) -> List[QAction]:
         return []
@@ -41,14 +57,16 @@ class NovelBrowserWrapper(BaseModule):
     
     def on_module_shown(self):
         """Викликається, коли цей модуль стає активним."""
+        self._visible = True
         if self.ui:
-            print("▶️ Novel Browser активовано, запускаю таймер.")
+            print("▶️ Novel Browser активовано, вмикаю синхронізацію скролу.")
             self.ui.resume_sync()
 
     def on_module_hidden(self):
         """Викликається, коли цей модуль ховається."""
+        self._visible = False
         if self.ui:
-            print("⏸️ Novel Browser сховано, зупиняю таймер.")
+            print("⏸️ Novel Browser сховано, вимикаю синхронізацію скролу.")
             self.ui.pause_sync()
             
     def cleanup_module(self):
@@ -56,6 +74,13 @@ class NovelBrowserWrapper(BaseModule):
         if self.ui:
             self.ui.cleanup()
             self.ui = None
+        # Після вивантаження код модуля імпортується заново з новими з'єднаннями —
+        # старі мають записати свої буфери й закритися зараз
+        from .cache import close_shared_cache
+        from .memory import close_shared_memory
+        close_shared_cache()
+        close_shared_memory()
+        self.host = None
 
 
 def register_module():
@@ -1,15 +1,30 @@
+import threading
+
 from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor
 
+from .matcher import RequestMatcher
+
 
 class AdBlocker(QWebEngineUrlRequestInterceptor):
     """Блокує запити до рекламних і трекінгових доменів."""
-    def __init__(self, blocked_domains):
+    def __init__(self, rules, log_path=None):
         super().__init__()
-        self.blocked_domains = blocked_domains
+        # Правила компілюються один раз; interceptRequest працює на IO-потоці Chromium
+        self.matcher = rules if isinstance(rules, RequestMatcher) else RequestMatcher.from_rules(rules)
+        # Необов'язковий журнал URL-ів — для бенчмарку bench/adblock.py
+        self._log = open(log_path, "a", encoding="utf-8") if log_path else None
+        self._log_lock = threading.Lock()
 
     def interceptRequest(self, info):
-        url = info.requestUrl().toString()
-        for domain in self.blocked_domains:
-            if domain in url:
-                info.block(True)
-                return
+        url = info.requestUrl()
+        if self._log:
+            with self._log_lock:
+                self._log.write(url.toString() + "\n")
+        if self.matcher.should_block_parts(url.host(), url.path(), url.query()):
+            info.block(True)
+
+    def close_log(self):
+        if self._log:
+            with self._log_lock:
+                self._log.close()
+                self._log = None
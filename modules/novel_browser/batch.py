@@ -0,0 +1,205 @@
+# modules/novel_browser/batch.py
+"""
+Пакетний переклад глав без GUI (QApplication не потрібен).
+
+    python -m modules.novel_browser.batch chapter1.html chapter2.html https://... \\
+        --out saved_novels --workers 4
+
+Стан зберігається у <out>/.batch_state.json: після збою повторний запуск
+з тими самими аргументами пропускає вже збережені глави, повторює невдалі
+й продовжує ланцюжки --follow з того місця, де вони зупинилися.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .extract import page_texts
+from .pipeline import fetch_page, find_next_chapter_url, parse_html
+from .save import save_translated_chapter
+from .translator import ERROR_PREFIX, SafeTranslator
+
+STATE_FILE = ".batch_state.json"
+
+
+def _read_input(source: str, max_bytes: int) -> str:
+    if source.startswith(("http://", "https://")):
+        return fetch_page(source, max_bytes)
+    with open(source, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _extract_titles(page_html: str):
+    """Назва новели і глави зі сторінки (селектори webnovel, як у save_translated)."""
+    soup = parse_html(page_html)
+    novel = soup.select_one(".j_book_name")
+    chapter = soup.select_one("h3.cha-tit") or soup.find("h1") or soup.find("title")
+    return (
+        novel.get_text(" ", strip=True) if novel else "",
+        chapter.get_text(" ", strip=True) if chapter else "",
+    )
+
+
+def _make_translator(options: dict) -> SafeTranslator:
+    backend = None
+    if options.get("fake"):
+        from .bench.fake_backend import FakeTranslator
+        backend = FakeTranslator(latency=options.get("fake_latency", 0.0),
+                                 failure_rate=options.get("fake_failure_rate", 0.0))
+    from .memory import get_shared_memory, load_glossary
+    cache = memory = None
+    if not options.get("no_cache"):
+        from .cache import get_shared_cache
+        cache = get_shared_cache()
+        memory = get_shared_memory()
+    return SafeTranslator(
+        source=options.get("source", "auto"), target=options.get("target", "uk"),
+        cache=cache, backend=backend, memory=memory, glossary=load_glossary(),
+        concurrency=options.get("concurrency", 1),
+        delay=0.0 if backend else 0.4,
+    )
+
+
+def translate_chapter(source: str, options: dict) -> dict:
+    """
+    Вилучення → переклад → збереження однієї глави.
+    Виконується в окремому процесі, тому лише прості типи на вході й виході.
+    """
+    page_html = _read_input(source, options.get("max_bytes", 4 * 1024 * 1024))
+    novel, chapter = _extract_titles(page_html)
+    texts = page_texts(page_html)
+    if not texts:
+        raise ValueError("не знайдено тексту глави")
+
+    translator = _make_translator(options)
+    translated = translator.translate_batch(texts)
+    failed = sum(1 for t in translated if t.startswith(ERROR_PREFIX))
+    if failed:
+        # Не зберігаємо главу із заглушками — вона піде у failed і повториться
+        raise RuntimeError(f"не перекладено {failed} з {len(texts)} сегментів")
+    text = "\n".join(t for t in translated if t)
+    if chapter:
+        title = translator.translate_batch([chapter])[0]
+        if title and not title.startswith(ERROR_PREFIX):
+            chapter = title
+
+    path = save_translated_chapter(options.get("novel") or novel, chapter, text, folder=options["out"])
+    # Відносне посилання з локального файлу — шлях поруч із ним
+    return {"path": path, "segments": len(texts), "next": find_next_chapter_url(page_html, source)}
+
+
+# ──────────────────────────────
+# 💾 Стан для відновлення після збою
+# ──────────────────────────────
+def load_state(path: str) -> dict:
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Стан {path} пошкоджено ({e}), починаю спочатку.")
+    return {"done": {}, "failed": {}, "follow": {}}
+
+
+def save_state(path: str, state: dict):
+    """Атомарний запис: тимчасовий файл + os.replace."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def run_batch(sources, options: dict, workers: int = 2, follow: int = 0) -> dict:
+    """Перекладає всі глави; повертає стан {done, failed}."""
+    os.makedirs(options["out"], exist_ok=True)
+    state_path = os.path.join(options["out"], STATE_FILE)
+    state = load_state(state_path)
+    # follow: глава ланцюжка, ще не збережена → скільки глав іти після неї
+    state.setdefault("follow", {})
+
+    queue = [s for s in sources if s not in state["done"]]
+    skipped = len(sources) - len(queue)
+    if skipped:
+        print(f"⏭️ Пропускаю {skipped} уже перекладених глав.")
+
+    remaining_follow = {s: follow for s in queue}
+    for url, remaining in state["follow"].items():
+        if url not in state["done"] and url not in remaining_follow:
+            queue.append(url)
+        remaining_follow[url] = max(remaining_follow.get(url, 0), remaining)
+    if state["follow"]:
+        print(f"🔗 Продовжую ланцюжки: {len(state['follow'])} глав.")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(translate_chapter, s, options): s for s in queue}
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                source = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ {source}: {e}")
+                    state["failed"][source] = str(e)
+                    save_state(state_path, state)
+                    continue
+
+                print(f"✅ {source} → {result['path']}")
+                state["done"][source] = result["path"]
+                state["failed"].pop(source, None)
+                state["follow"].pop(source, None)
+
+                # 🔗 Далі за посиланням «наступна глава» (записується разом із done,
+                # тож після збою ланцюжок продовжиться)
+                next_url = result.get("next")
+                queued = next_url in futures.values()
+                if remaining_follow.get(source, 0) > 0 and next_url and next_url not in state["done"] \
+                        and not queued:
+                    remaining_follow[next_url] = remaining_follow[source] - 1
+                    state["follow"][next_url] = remaining_follow[next_url]
+                    futures[pool.submit(translate_chapter, next_url, options)] = next_url
+                save_state(state_path, state)
+    return state
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетний переклад глав новели без GUI.")
+    parser.add_argument("inputs", nargs="*", help="HTML-файли глав або URL")
+    parser.add_argument("--list", help="файл зі списком входів (по одному на рядок)")
+    parser.add_argument("--out", default=os.path.join(os.getcwd(), "saved_novels"))
+    parser.add_argument("--novel", default="", help="назва новели (інакше — зі сторінки)")
+    parser.add_argument("--workers", type=int, default=2, help="кількість процесів")
+    parser.add_argument("--concurrency", type=int, default=1, help="паралельних запитів у процесі")
+    parser.add_argument("--follow", type=int, default=0, help="скільки наступних глав пройти від кожної глави")
+    parser.add_argument("--source", default="auto")
+    parser.add_argument("--target", default="uk")
+    parser.add_argument("--no-cache", action="store_true", help="не використовувати кеш перекладів")
+    parser.add_argument("--fake-translator", action="store_true",
+                        help="офлайн-режим: фейковий перекладач замість Google")
+    args = parser.parse_args(argv)
+
+    sources = list(args.inputs)
+    if args.list:
+        with open(args.list, "r", encoding="utf-8") as f:
+            sources += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not sources:
+        parser.error("не вказано жодної глави")
+
+    options = {
+        "out": os.path.abspath(args.out),
+        "novel": args.novel,
+        "source": args.source,
+        "target": args.target,
+        "concurrency": args.concurrency,
+        "no_cache": args.no_cache,
+        "fake": args.fake_translator,
+    }
+    state = run_batch(sources, options, workers=args.workers, follow=args.follow)
+    print(f"📊 Готово: {len(state['done'])}, з помилками: {len(state['failed'])}")
+    return 1 if state["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
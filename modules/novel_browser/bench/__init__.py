@@ -0,0 +1 @@
+# modules/novel_browser/bench — офлайн-бенчмарки Novel Browser (без мережі і без Qt)
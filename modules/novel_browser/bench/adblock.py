@@ -0,0 +1,105 @@
+# modules/novel_browser/bench/adblock.py
+"""
+Мікробенчмарк блокувальника: лінійний пошук підрядків проти RequestMatcher.
+
+    python -m modules.novel_browser.bench.adblock --log requests.log --rules 20000
+    python -m modules.novel_browser.bench.adblock --filters config/filters
+
+Журнал запитів записує AdBlocker(log_path=...) (налаштування adblock_request_log);
+без --log генерується синтетичний.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from modules.novel_browser.filters import list_filter_files, load_filters
+from modules.novel_browser.matcher import RequestMatcher
+
+_HOSTS = ["www.webnovel.com", "img.webnovel.com", "fonts.gstatic.com", "cdn.jsdelivr.net",
+          "pagead2.googlesyndication.com", "stats.g.doubleclick.net", "www.google-analytics.com"]
+
+
+def _synthetic_rules(count: int, rnd: random.Random):
+    rules = ["googlesyndication.com", "doubleclick.net", "adservice.google.com", "/tracking"]
+    for i in range(count):
+        if i % 5 == 0:
+            rules.append(f"/ads{i}/")
+        else:
+            rules.append(f"ad{i}.tracker{rnd.randrange(1000)}.com")
+    return rules
+
+
+def _synthetic_log(count: int, rnd: random.Random):
+    paths = ["/book/123", "/static/app.js", "/pagead/show_ads.js", "/collect?v=1", "/img/cover.jpg",
+             "/tracking/pixel.gif", "/api/chapter?id=42"]
+    return [f"https://{rnd.choice(_HOSTS)}{rnd.choice(paths)}" for _ in range(count)]
+
+
+def _naive(rules):
+    def should_block(url):
+        for domain in rules:
+            if domain in url:
+                return True
+        return False
+    return should_block
+
+
+def _measure(label, fn, urls):
+    started = time.perf_counter()
+    blocked = sum(1 for url in urls if fn(url))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<12} {elapsed * 1e6 / len(urls):8.2f} мкс/запит  заблоковано={blocked}")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--log", help="журнал URL (по одному на рядок)")
+    parser.add_argument("--rules", type=int, default=20000, help="кількість синтетичних правил")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--filters", help="тека зі списками EasyList (*.txt) замість синтетичних правил")
+    args = parser.parse_args(argv)
+
+    if args.filters:
+        _bench_filter_lists(args.filters)
+        return
+
+    rnd = random.Random(0)
+    rules = _synthetic_rules(args.rules, rnd)
+    if args.log:
+        with open(args.log, "r", encoding="utf-8") as f:
+            urls = [line.strip() for line in f if line.strip()]
+    else:
+        urls = _synthetic_log(args.requests, rnd)
+
+    started = time.perf_counter()
+    matcher = RequestMatcher.from_rules(rules)
+    print(f"Компіляція {len(rules)} правил: {(time.perf_counter() - started) * 1000:.1f} мс")
+
+    t_naive = _measure("лінійно", _naive(rules), urls)
+    t_compiled = _measure("компільовано", matcher.should_block, urls)
+    print(f"⚡ Прискорення: ×{t_naive / t_compiled:.0f}")
+
+
+def _bench_filter_lists(folder: str):
+    """Порівнює повну компіляцію списків зі стартом з готового кешу."""
+    rules = 0
+    for path in list_filter_files(folder):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            rules += sum(1 for _ in f)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "filters.bin")
+        started = time.perf_counter()
+        load_filters(folder, cache_path).close()
+        cold = time.perf_counter() - started
+        started = time.perf_counter()
+        filters = load_filters(folder, cache_path)
+        warm = time.perf_counter() - started
+        filters.close()
+    print(f"{rules} рядків: компіляція {cold * 1000:.0f} мс, старт з кешу {warm * 1000:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# modules/novel_browser/bench/concurrency.py
+"""
+Порівнює послідовний і паралельний режими SafeTranslator на фейковому бекенді.
+
+    python -m modules.novel_browser.bench.concurrency --chunks 30 --latency 0.3
+"""
+import argparse
+import time
+
+from modules.novel_browser.translator import SafeTranslator
+from modules.novel_browser.bench.fake_backend import FakeTranslator
+
+
+def _make_chapter(chunks: int, chunk_len: int = 4000) -> list:
+    sentence = "The knight raised his lantern and looked into the dark. "
+    return [(sentence * (chunk_len // len(sentence) + 1))[:chunk_len] + f" #{i}."
+            for i in range(chunks)]
+
+
+def _run(label, translator, backend, chapter):
+    started = time.perf_counter()
+    result = translator.translate_chunks(chapter)
+    elapsed = time.perf_counter() - started
+    assert result == [c.upper() for c in chapter], "порядок блоків порушено"
+    print(f"{label:<12} {elapsed:7.2f} с  {60 / elapsed:7.2f} глав/хв  "
+          f"запитів={backend.requests} 429={backend.throttled}")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--delay", type=float, default=0.4, help="пауза послідовного режиму")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=10.0)
+    parser.add_argument("--throttle-above", type=int, default=6)
+    args = parser.parse_args(argv)
+
+    chapter = _make_chapter(args.chunks)
+
+    backend = FakeTranslator(args.latency, args.jitter, throttle_above=args.throttle_above)
+    serial = SafeTranslator(backend=backend, delay=args.delay)
+    t_serial = _run("послідовно", serial, backend, chapter)
+
+    backend = FakeTranslator(args.latency, args.jitter, throttle_above=args.throttle_above)
+    concurrent = SafeTranslator(backend=backend, delay=args.delay,
+                                concurrency=args.concurrency, rate=args.rate)
+    t_concurrent = _run("паралельно", concurrent, backend, chapter)
+
+    print(f"⚡ Прискорення: ×{t_serial / t_concurrent:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# modules/novel_browser/bench/extract.py
+"""
+Вилучення тексту: повний innerHTML + BeautifulSoup проти сегментів (EXTRACT_JS) і lxml.
+
+    python -m modules.novel_browser.bench.extract page1.html page2.html
+    python -m modules.novel_browser.bench.extract --paragraphs 2000
+
+Входи — збережені сторінки глав (Ctrl+S у браузері); без них генерується
+синтетична «важка» сторінка з розміткою, скриптами й атрибутами.
+"""
+import argparse
+import json
+import time
+
+from modules.novel_browser.extract import page_texts, parse_segments, skeleton_from_segments
+from modules.novel_browser.pipeline import collect_text_nodes, extract_content_html, parse_html, prepare_skeleton
+
+_PARAGRAPH = ('<p class="cha-paragraph" data-ejs=\'{{"a":1,"b":"x"}}\' style="margin:0 0 1em">'
+              '<span class="p-{i}" data-report-l1="3" data-report-uiname="para">'
+              'The knight raised his lantern and looked into the dark corridor, №{i}.</span>'
+              '<span class="j_comment_{i}" data-pid="{i}"><i class="icon-comment"></i></span></p>')
+
+
+def _synthetic_page(paragraphs: int) -> str:
+    body = "".join(_PARAGRAPH.format(i=i) for i in range(paragraphs))
+    scripts = "<script>" + "window.__data = {a: 1, b: [1, 2, 3]};\n" * 200 + "</script>"
+    return (f"<html><head><title>Chapter</title>{scripts}</head><body>"
+            f"<nav><a href='/'>Home</a></nav><div class='cha-words'>{body}</div>{scripts}</body></html>")
+
+
+def _timed(fn, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _bench(label: str, page: str, repeat: int):
+    # Старий шлях: innerHTML контейнера через міст → BeautifulSoup → каркас
+    inner_html = extract_content_html(page)
+    old_bytes = len(inner_html.encode("utf-8"))
+    t_old, (_skeleton, texts) = _timed(lambda: prepare_skeleton(inner_html, ""), repeat)
+
+    # Новий шлях: JSON сегментів (як повертає EXTRACT_JS) → каркас без розбору HTML.
+    # Номери абзаців беремо з верхньою межею (кожен сегмент — окремий абзац).
+    payload = json.dumps({"t": texts, "b": list(range(len(texts)))}, ensure_ascii=False)
+    new_bytes = len(payload.encode("utf-8"))
+    t_new, _ = _timed(lambda: skeleton_from_segments(*parse_segments(payload), ""), repeat)
+
+    # Сторінки без браузера (prefetch, batch): BeautifulSoup проти lxml
+    t_soup, soup_texts = _timed(
+        lambda: collect_text_nodes(parse_html(extract_content_html(page)))[0], repeat
+    )
+    t_lxml, lxml_texts = _timed(lambda: page_texts(page), repeat)
+    assert soup_texts == lxml_texts, "lxml і BeautifulSoup знайшли різні сегменти"
+
+    print(f"📄 {label}: {len(texts)} сегментів")
+    print(f"   через міст: {old_bytes / 1024:9.1f} КБ HTML → {new_bytes / 1024:8.1f} КБ JSON "
+          f"(×{old_bytes / max(new_bytes, 1):.1f} менше)")
+    print(f"   каркас:     {t_old * 1000:9.1f} мс (bs4) → {t_new * 1000:8.1f} мс (сегменти)")
+    print(f"   без браузера: {t_soup * 1000:7.1f} мс (bs4) → {t_lxml * 1000:8.1f} мс (lxml)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pages", nargs="*", help="збережені HTML-сторінки глав")
+    parser.add_argument("--paragraphs", type=int, default=1000, help="розмір синтетичної сторінки")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if not args.pages:
+        _bench(f"синтетична ({args.paragraphs} абзаців)", _synthetic_page(args.paragraphs), args.repeat)
+    for path in args.pages:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            _bench(path, f.read(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
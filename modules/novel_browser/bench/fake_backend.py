@@ -0,0 +1,72 @@
+# modules/novel_browser/bench/fake_backend.py
+import hashlib
+import random
+import re
+import threading
+import time
+
+
+_TAG = re.compile(r"<[^>]*>|[^<]+")
+
+
+class TooManyRequests(Exception):
+    """Імітація HTTP 429 від перекладача."""
+
+
+class FakeTranslator:
+    """
+    Детермінований локальний «перекладач» з тим самим інтерфейсом, що й
+    GoogleTranslator.translate(). Затримка, частка збоїв і поріг throttling
+    налаштовуються; лічильники дозволяють рахувати запити.
+    Збій залежить від тексту і номера спроби (а не від порядку потоків),
+    тож при тому самому seed падають ті самі запити.
+    """
+
+    def __init__(self, latency=0.2, jitter=0.0, failure_rate=0.0,
+                 throttle_above=None, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.throttle_above = throttle_above  # макс. одночасних запитів до 429
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+        self.chars = 0
+        self._in_flight = 0
+        self._seed = seed
+        self._attempts = {}   # хеш тексту → кількість спроб
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _should_fail(self, text: str) -> bool:
+        if not self.failure_rate:
+            return False
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+        attempt = self._attempts.get(key, 0)
+        self._attempts[key] = attempt + 1
+        digest = hashlib.blake2b(key + f"{self._seed}:{attempt}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little") / 2 ** 64 < self.failure_rate
+
+    def translate(self, text: str) -> str:
+        with self._lock:
+            self.requests += 1
+            self.chars += len(text)
+            self._in_flight += 1
+            in_flight = self._in_flight
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._should_fail(text)
+        try:
+            if self.throttle_above is not None and in_flight > self.throttle_above:
+                with self._lock:
+                    self.throttled += 1
+                raise TooManyRequests("429 Too Many Requests")
+            time.sleep(delay)
+            if fail:
+                with self._lock:
+                    self.failures += 1
+                raise RuntimeError("fake backend failure")
+            # «Переклад» — верхній регістр поза <тегами>, тож роздільники виживають
+            return _TAG.sub(lambda m: m.group(0) if m.group(0).startswith("<") else m.group(0).upper(), text)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
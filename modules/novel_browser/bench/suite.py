@@ -0,0 +1,335 @@
+# modules/novel_browser/bench/suite.py
+"""
+Набір бенчмарків конвеєра перекладу — без мережі, відтворюваний.
+
+    python -m modules.novel_browser.bench.suite                    # прогін і таблиця
+    python -m modules.novel_browser.bench.suite --check            # порівняння з baseline.json
+    python -m modules.novel_browser.bench.suite --write-baseline   # оновити baseline.json
+    python -m modules.novel_browser.bench.suite --fixtures pages/  # записані глави (*.html)
+
+Фікстури — синтетичні сторінки глав від 1k до 500k символів тексту
+(детерміновані за --seed) або збережені сторінки з --fixtures.
+Перекладач — FakeTranslator із заданою затримкою і часткою збоїв.
+
+Сценарії для кожної фікстури:
+  cold — шлях Novel Browser: сегменти (як від EXTRACT_JS) → каркас →
+         translate_batch від видимої позиції → JS-патчі правої сторінки;
+         порожні кеш і пам'ять перекладів у тимчасовій теці;
+  warm — те саме вдруге, з кешем і пам'яттю після cold;
+  html — запасний шлях: innerHTML → BeautifulSoup → translate_html.
+
+Пікова пам'ять — окремий прогін під tracemalloc (лише купа Python),
+щоб трасування не спотворювало час. --check завершується з кодом 1,
+якщо кількість запитів зросла або час/пам'ять вийшли за допуск.
+"""
+import argparse
+import glob
+import html
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from modules.novel_browser.bench.fake_backend import FakeTranslator
+from modules.novel_browser.cache import TranslationCache
+from modules.novel_browser.extract import page_texts, parse_segments, skeleton_from_segments
+from modules.novel_browser.memory import TranslationMemory
+from modules.novel_browser.metrics import get_metrics
+from modules.novel_browser.pipeline import extract_content_html, patch_script, translate_html, viewport_order
+from modules.novel_browser.translator import ERROR_PREFIX, SafeTranslator
+
+SIZES = (1_000, 10_000, 50_000, 200_000, 500_000)
+SCENARIOS = ("cold", "warm", "html")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Допуски --check: відносний + абсолютний запас (шум на малих фікстурах)
+TIME_TOLERANCE = 0.30
+MEMORY_TOLERANCE = 0.20
+_SLACK = {"wall_ms": 20.0, "parse_ms": 5.0, "reassemble_ms": 5.0, "peak_kb": 256.0}
+
+# ──────────────────────────────
+# 📄 Фікстури
+# ──────────────────────────────
+_NAMES = ["Arthur", "Lia", "Kaiden", "the Saintess", "Sir Roland", "the old mage", "Eris"]
+_VERBS = ["raised", "lowered", "studied", "grabbed", "threw", "ignored", "remembered", "feared"]
+_OBJECTS = ["his lantern", "the broken sword", "a silver coin", "the map", "her shield",
+            "the cursed ring", "the letter", "a loaf of bread"]
+_TAILS = ["and looked into the dark corridor", "without a word", "for the {n}th time",
+          "while the bells rang", "as the wind howled outside", "and sighed"]
+_SYSTEM = ["[System: Quest completed.]", "[Level up! Strength +1.]",
+           "[Skill 'Regression' has been activated.]", "* * *"]
+
+
+def synthetic_chapter(chars: int, seed: int = 0) -> str:
+    """Сторінка глави з ~chars символами тексту: абзаци, системні рядки, шум розмітки."""
+    rnd = random.Random(seed * 1_000_003 + chars)
+    paragraphs, size = [], 0
+    while size < chars:
+        if rnd.random() < 0.08:
+            text = rnd.choice(_SYSTEM)   # повторювані рядки — робота для кешу й пам'яті
+        else:
+            sentences = []
+            for _ in range(rnd.randint(1, 4)):
+                tail = rnd.choice(_TAILS).format(n=rnd.randint(2, 99))
+                sentences.append(f"{rnd.choice(_NAMES).capitalize()} {rnd.choice(_VERBS)} "
+                                 f"{rnd.choice(_OBJECTS)} {tail}{rnd.choice('.!?.')}")
+            text = " ".join(sentences)
+        size += len(text)
+        i = len(paragraphs)
+        paragraphs.append(f'<p class="cha-paragraph" data-pid="{i}"><span class="p-{i}">'
+                          f'{html.escape(text)}</span><i class="icon-comment"></i></p>')
+    script = "<script>" + "window.__data = {a: 1, b: [1, 2, 3]};\n" * 50 + "</script>"
+    return (f"<html><head><title>Chapter</title>{script}</head><body>"
+            f"<nav><a href='/'>Home</a></nav><div class='cha-words'>{''.join(paragraphs)}</div>"
+            f"{script}</body></html>")
+
+
+def _label(chars: int) -> str:
+    return f"synthetic-{chars // 1000}k"
+
+
+def load_fixtures(folder: str = None, sizes=SIZES, seed: int = 0):
+    """[(назва, html)] — записані сторінки з теки або синтетичні."""
+    if folder:
+        fixtures = []
+        for path in sorted(glob.glob(os.path.join(folder, "*.html"))):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                fixtures.append((os.path.splitext(os.path.basename(path))[0], f.read()))
+        return fixtures
+    return [(_label(chars), synthetic_chapter(chars, seed)) for chars in sizes]
+
+
+# ──────────────────────────────
+# ⏱️ Сценарії
+# ──────────────────────────────
+class _Stores:
+    """Кеш і пам'ять перекладів у тимчасовій теці (спільні для cold → warm)."""
+
+    def __init__(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="nb_bench_")
+        self.cache = TranslationCache(os.path.join(self._tmp.name, "translations.sqlite3"))
+        self.memory = TranslationMemory(os.path.join(self._tmp.name, "memory.sqlite3"))
+
+    def close(self):
+        self.cache.close()
+        self.memory.close()
+        self._tmp.cleanup()
+
+
+def _make_translator(options: dict, stores: _Stores = None):
+    backend = FakeTranslator(latency=options["latency"], jitter=options["jitter"],
+                             failure_rate=options["failure_rate"], seed=options["seed"])
+    translator = SafeTranslator(
+        backend=backend, delay=options["delay"], concurrency=options["concurrency"],
+        rate=options["rate"],
+        cache=stores.cache if stores else None, memory=stores.memory if stores else None,
+    )
+    return translator, backend
+
+
+def _prepare(page: str) -> dict:
+    """Те, що в програмі робить браузер (вилучення) — поза вимірюваним часом."""
+    texts = page_texts(page)
+    return {"texts": texts, "inner_html": extract_content_html(page),
+            "chars": sum(len(t) for t in texts)}
+
+
+def _run_segments(fixture: dict, translator: SafeTranslator) -> dict:
+    """Шлях Novel Browser: JSON сегментів → каркас → переклад від видимої позиції → патчі."""
+    texts = fixture["texts"]
+    payload = json.dumps({"t": texts, "b": list(range(len(texts)))}, ensure_ascii=False)
+
+    started = time.perf_counter()
+    skeleton = skeleton_from_segments(*parse_segments(payload), "")
+    parse = time.perf_counter() - started
+
+    patch = [0.0]
+
+    def on_ready(ready):
+        patched = time.perf_counter()
+        patch_script(ready)
+        patch[0] += time.perf_counter() - patched
+
+    translated = translator.translate_batch(
+        texts, order=viewport_order(len(texts), 0.3), on_ready=on_ready
+    )
+    return {"parse": parse, "patch": patch[0], "output": skeleton, "translated": translated}
+
+
+def _run_html(fixture: dict, translator: SafeTranslator) -> dict:
+    """Запасний шлях: увесь HTML контейнера розбирається і збирається назад."""
+    page = translate_html(fixture["inner_html"], translator, "")
+    return {"parse": None, "patch": 0.0, "output": page, "translated": []}
+
+
+def _measure(fixture: dict, scenario: str, options: dict, stores: _Stores = None) -> dict:
+    metrics = get_metrics()
+    metrics.reset()
+    translator, backend = _make_translator(options, stores if scenario != "html" else None)
+    started = time.perf_counter()
+    run = _run_html(fixture, translator) if scenario == "html" else _run_segments(fixture, translator)
+    wall = time.perf_counter() - started
+
+    snapshot = metrics.snapshot()
+    stages = snapshot["stages"]
+    counters = snapshot["counters"]
+    parse = run["parse"] if run["parse"] is not None else stages.get("parse", {}).get("total_ms", 0) / 1000
+    errors = sum(1 for t in run["translated"] if t.startswith(ERROR_PREFIX))
+    return {
+        "segments": len(fixture["texts"]),
+        "chars": fixture["chars"],
+        "wall_ms": wall * 1000,
+        "chars_per_sec": fixture["chars"] / wall if wall else 0.0,
+        "parse_ms": parse * 1000,
+        "segment_ms": stages.get("segment", {}).get("total_ms", 0.0),
+        "reassemble_ms": stages.get("reassemble", {}).get("total_ms", 0.0) + run["patch"] * 1000,
+        "requests": backend.requests,
+        "failures": backend.failures,
+        "retries": counters.get("retries", 0),
+        "error_segments": errors,
+    }
+
+
+def _peak_kb(fixture: dict, scenario: str, options: dict) -> float:
+    """Пікова пам'ять сценарію (окремий прогін під tracemalloc, зі свіжими сховищами)."""
+    stores = _Stores() if scenario != "html" else None
+    try:
+        if scenario == "warm":
+            _measure(fixture, "cold", options, stores)
+        tracemalloc.start()
+        try:
+            _measure(fixture, scenario, options, stores)
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        if stores:
+            stores.close()
+    return peak / 1024
+
+
+def run_suite(fixtures, options: dict, repeat: int = 3, scenarios=SCENARIOS) -> dict:
+    """{"фікстура/сценарій": метрики}; час — медіана з repeat прогонів."""
+    results = {}
+    for name, page in fixtures:
+        fixture = _prepare(page)
+        runs = {scenario: [] for scenario in scenarios}
+        for _ in range(repeat):
+            stores = _Stores()
+            try:
+                for scenario in scenarios:
+                    runs[scenario].append(_measure(fixture, scenario, options, stores))
+            finally:
+                stores.close()
+        for scenario in scenarios:
+            samples = runs[scenario]
+            result = dict(samples[-1])
+            for key in ("wall_ms", "parse_ms", "segment_ms", "reassemble_ms"):
+                result[key] = statistics.median(s[key] for s in samples)
+            result["chars_per_sec"] = result["chars"] / result["wall_ms"] * 1000 if result["wall_ms"] else 0.0
+            result["peak_kb"] = _peak_kb(fixture, scenario, options)
+            results[f"{name}/{scenario}"] = result
+            _print_row(f"{name}/{scenario}", result)
+    return results
+
+
+# ──────────────────────────────
+# 📊 Звіт і baseline
+# ──────────────────────────────
+def _print_header():
+    print(f"{'фікстура/сценарій':<24} {'сегм.':>6} {'час, мс':>9} {'симв./с':>10} {'розбір':>8} "
+          f"{'збирання':>9} {'запитів':>8} {'повт.':>6} {'пам., КБ':>9}")
+
+
+def _print_row(name: str, r: dict):
+    print(f"{name:<24} {r['segments']:>6} {r['wall_ms']:>9.1f} {r['chars_per_sec']:>10.0f} "
+          f"{r['parse_ms']:>8.1f} {r['reassemble_ms']:>9.1f} {r['requests']:>8} "
+          f"{r['retries']:>6} {r['peak_kb']:>9.0f}")
+
+
+def compare(results: dict, baseline: dict, time_tolerance=TIME_TOLERANCE,
+            memory_tolerance=MEMORY_TOLERANCE):
+    """Список описів регресій відносно baseline (порожній — усе гаразд)."""
+    regressions = []
+    for key, old in baseline.get("results", {}).items():
+        new = results.get(key)
+        if new is None:
+            continue
+        if new["requests"] > old["requests"]:
+            regressions.append(f"{key}: запитів {old['requests']} → {new['requests']}")
+        for metric, tolerance in (("wall_ms", time_tolerance), ("parse_ms", time_tolerance),
+                                  ("reassemble_ms", time_tolerance), ("peak_kb", memory_tolerance)):
+            limit = old[metric] * (1 + tolerance) + _SLACK[metric]
+            if new[metric] > limit:
+                regressions.append(f"{key}: {metric} {old[metric]:.1f} → {new[metric]:.1f} "
+                                   f"(допуск {limit:.1f})")
+    return regressions
+
+
+def _params(args) -> dict:
+    return {"latency": args.latency, "jitter": args.jitter, "failure_rate": args.failure_rate,
+            "seed": args.seed, "delay": args.delay, "concurrency": args.concurrency, "rate": args.rate}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="тека з записаними сторінками глав (*.html)")
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(SIZES), help="розміри синтетичних глав")
+    parser.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02, help="затримка фейкового запиту, с")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--delay", type=float, default=0.01, help="пауза/базовий backoff SafeTranslator")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=200.0, help="ліміт запитів/с")
+    parser.add_argument("--out", help="записати результати у JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--write-baseline", action="store_true", help="зберегти результати як baseline")
+    parser.add_argument("--check", action="store_true", help="порівняти з baseline (код 1 — регресія)")
+    args = parser.parse_args(argv)
+
+    options = _params(args)
+    fixtures = load_fixtures(args.fixtures, args.sizes, args.seed)
+    if not fixtures:
+        print(f"❌ У {args.fixtures} немає *.html")
+        return 2
+
+    _print_header()
+    results = run_suite(fixtures, options, args.repeat, args.scenarios)
+    report = {
+        "meta": {"date": datetime.now().isoformat(timespec="seconds"), "python": sys.version.split()[0],
+                 "platform": platform.platform(), "params": options},
+        "results": results,
+    }
+    for path in filter(None, (args.out, args.baseline if args.write_baseline else None)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Результати: {path}")
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"❌ Немає baseline: {args.baseline} (запустіть з --write-baseline)")
+            return 2
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("params") != options:
+            print("⚠️ Параметри відрізняються від baseline — порівняння може бути некоректним.")
+        regressions = compare(results, baseline)
+        for line in regressions:
+            print(f"❌ {line}")
+        if regressions:
+            return 1
+        print("✅ Регресій відносно baseline немає.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
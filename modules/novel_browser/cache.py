@@ -0,0 +1,199 @@
+# modules/novel_browser/cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+FLUSH_EVERY = 500  # стільки відкладених записів — і пишемо, не чекаючи flush()
+
+
+class TranslationCache:
+    """
+    Дисковий кеш перекладів (SQLite).
+    Ключ — хеш (мова джерела, мова перекладу, текст).
+    Має ліміт розміру з LRU-витісненням і лічильники влучань/промахів.
+    Нові переклади й позначки використання (LRU) пишуться пакетом у flush() —
+    однією короткою транзакцією, а не комітом на кожне влучання.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending = {}   # ключ → переклад, ще не записаний у базу
+        self._touched = {}   # ключ → час останнього влучання
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        # Один з'єднання на всі потоки, доступ серіалізуємо через _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)"
+        )
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM translations"
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_key(text: str, source: str, target: str) -> str:
+        data = f"{source}\x00{target}\x00{text}".encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, text: str, source: str, target: str):
+        """Повертає збережений переклад або None."""
+        key = self.make_key(text, source, target)
+        with self._lock:
+            value = self._pending.get(key)
+            if value is None:
+                row = self._conn.execute(
+                    "SELECT value FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                value = row[0]
+                self._touched[key] = time.time()
+            self.hits += 1
+            return value
+
+    def put(self, text: str, source: str, target: str, translated: str):
+        key = self.make_key(text, source, target)
+        with self._lock:
+            self._pending[key] = translated
+            full = len(self._pending) + len(self._touched) >= FLUSH_EVERY
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Записує накопичені переклади і позначки LRU, витісняє зайве — один коміт."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        pending, self._pending = self._pending, {}
+        touched, self._touched = self._touched, {}
+        if not pending and not touched:
+            return
+        now = time.time()
+        rows = []
+        for key, translated in pending.items():
+            size = len(key) + len(translated.encode("utf-8"))
+            old = self._conn.execute(
+                "SELECT size FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            self._total_bytes += size - (old[0] if old else 0)
+            rows.append((key, translated, size, now))
+            touched.pop(key, None)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO translations (key, value, size, last_used) VALUES (?, ?, ?, ?)", rows
+        )
+        self._conn.executemany(
+            "UPDATE translations SET last_used = ? WHERE key = ?", [(t, key) for key, t in touched.items()]
+        )
+        self._evict()
+        self._conn.commit()
+
+    def _evict(self):
+        """LRU: видаляємо найстаріші записи, поки не вліземо в ліміт."""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM translations ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def compact(self):
+        """Застосовує ліміт і стискає файл бази (VACUUM)."""
+        with self._lock:
+            self._flush_locked()
+            self._evict()
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._touched.clear()
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._flush_locked()
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+
+_shared_cache = None
+
+
+def get_shared_cache() -> TranslationCache:
+    """Спільний кеш для всього модуля (створюється при першому зверненні)."""
+    global _shared_cache
+    if _shared_cache is None:
+        from .settings import load_settings, data_path
+        settings = load_settings()
+        _shared_cache = TranslationCache(
+            data_path(settings["cache_path"]),
+            max_bytes=int(settings["cache_max_mb"]) * 1024 * 1024,
+        )
+    return _shared_cache
+
+
+def close_shared_cache():
+    """Дописує відкладені записи й закриває спільний кеш (перед вивантаженням модуля)."""
+    global _shared_cache
+    if _shared_cache is not None:
+        _shared_cache.close()
+        _shared_cache = None
+
+
+if __name__ == "__main__":
+    # python -m modules.novel_browser.cache [stats|compact|clear]
+    import sys
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    cache = get_shared_cache()
+    if command == "compact":
+        cache.compact()
+        print("🗜️ Кеш стиснуто.")
+    elif command == "clear":
+        cache.clear()
+        cache.compact()
+        print("🧹 Кеш очищено.")
+    print(f"📊 {cache.stats()}")
@@ -0,0 +1,77 @@
+# modules/novel_browser/export.py
+"""
+Черга експорту глав у .docx поза GUI-потоком.
+Повторні збереження тієї самої глави, що ще чекають у черзі, зливаються в одне
+(записується найновіший текст).
+"""
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .save import save_translated_chapter
+
+
+class ExportSignals(QObject):
+    saved = pyqtSignal(str, str)    # ключ глави, шлях до файлу
+    failed = pyqtSignal(str, str)   # ключ глави, текст помилки
+
+
+class ExportJob(QRunnable):
+    """Бере з черги найсвіжіші дані глави в момент запуску, а не в момент створення."""
+
+    def __init__(self, key: str, queue: "ExportQueue"):
+        super().__init__()
+        self.key = key
+        self.queue = queue
+
+    def run(self):
+        payload = self.queue._take(self.key)
+        if payload is None:
+            return
+        try:
+            path = save_translated_chapter(*payload)
+        except Exception as e:
+            self.queue.signals.failed.emit(self.key, str(e))
+            return
+        self.queue.signals.saved.emit(self.key, path)
+
+
+class ExportQueue(QObject):
+    """Один фоновий потік — файли пишуться по черзі, GUI не чекає."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.signals = ExportSignals()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._pending = {}   # ключ → (novel_name, chapter_title, text, folder)
+
+    @staticmethod
+    def make_key(novel_name: str, chapter_title: str) -> str:
+        return f"{(novel_name or '').strip()}\x1f{(chapter_title or '').strip()}"
+
+    def enqueue(self, novel_name: str, chapter_title: str, text: str, folder: str = None) -> bool:
+        """
+        Ставить главу в чергу. Повертає False, якщо збереження злилося
+        з тим, що вже чекає (нове завдання не створюється).
+        """
+        key = self.make_key(novel_name, chapter_title)
+        with self._lock:
+            coalesced = key in self._pending
+            self._pending[key] = (novel_name, chapter_title, text, folder)
+        if not coalesced:
+            self.pool.start(ExportJob(key, self))
+        return not coalesced
+
+    def _take(self, key: str):
+        with self._lock:
+            return self._pending.pop(key, None)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Дочекатися запису всіх файлів (напр., перед закриттям)."""
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,128 @@
+# modules/novel_browser/extract.py
+"""
+Легке вилучення тексту глави.
+
+У браузері: EXTRACT_JS повертає лише текстові сегменти (компактний JSON)
+замість усього innerHTML — індекс сегмента є його id (data-tid у перекладі).
+У Python: page_texts / collect_texts_lxml — швидкий прохід по дереву lxml
+для сторінок, завантажених без браузера (prefetch, batch), без об'єктів
+BeautifulSoup.
+"""
+import html
+import json
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # lxml необов'язковий — тоді працює шлях через BeautifulSoup
+    etree = lxml_html = None
+
+from .pipeline import (
+    CONTENT_SELECTOR, SKIP_PARENTS, build_page, collect_text_nodes, extract_content_html, parse_html,
+)
+
+# Ті самі правила, що й pipeline.collect_text_nodes / scroll_sync
+EXTRACT_JS = """
+(function() {
+    const root = document.querySelector('%(selector)s')
+        || document.body;
+    const SKIP = new Set(['SCRIPT', 'STYLE', 'HEAD', 'TITLE', 'A']);
+    const BLOCK = /^(P|DIV|LI|H[1-6]|BLOCKQUOTE|PRE|TD|TH|DT|DD|SECTION|ARTICLE)$/;
+
+    let nodes = window.__nbIndexNodes ? window.__nbIndexNodes(root) : null;
+    if (!nodes) {
+        nodes = [];
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+        for (let n = walker.nextNode(); n; n = walker.nextNode()) {
+            if (n.parentElement && !SKIP.has(n.parentElement.tagName) && n.nodeValue.trim()) {
+                nodes.push(n);
+            }
+        }
+    }
+
+    // Номер абзацу для кожного сегмента — щоб переклад мав ту саму розбивку
+    const blockIds = new Map();
+    const texts = [], blocks = [];
+    for (const n of nodes) {
+        let el = n.parentElement;
+        while (el && el !== root && !BLOCK.test(el.tagName)) el = el.parentElement;
+        if (!blockIds.has(el)) blockIds.set(el, blockIds.size);
+        texts.push(n.nodeValue.trim());
+        blocks.push(blockIds.get(el));
+    }
+    return JSON.stringify({t: texts, b: blocks});
+})();
+""" % {"selector": CONTENT_SELECTOR}
+
+# CONTENT_SELECTOR у вигляді XPath (перший збіг у порядку документа, як querySelector)
+_CONTENT_XPATH = "(//*[@id='chapter-content' or %s])[1]" % " or ".join(
+    f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+    for cls in ("cha-words", "chapter-content", "read-content")
+)
+
+
+def parse_segments(payload: str):
+    """JSON від EXTRACT_JS → (тексти, номери абзаців). ValueError, якщо формат не той."""
+    data = json.loads(payload or "")
+    texts, blocks = data.get("t"), data.get("b")
+    if not isinstance(texts, list) or not isinstance(blocks, list) or len(texts) != len(blocks):
+        raise ValueError("неправильний формат сегментів")
+    return texts, blocks
+
+
+def skeleton_from_segments(texts, blocks, css: str) -> str:
+    """Каркас сторінки перекладу: абзац на кожен блок, <span data-tid> на кожен сегмент."""
+    paragraphs, current, parts = [], None, []
+    for i, (text, block) in enumerate(zip(texts, blocks)):
+        if block != current and parts:
+            paragraphs.append(f"<p>{' '.join(parts)}</p>")
+            parts = []
+        current = block
+        parts.append(f'<span data-tid="{i}" class="nb-pending">{html.escape(text)}</span>')
+    if parts:
+        paragraphs.append(f"<p>{' '.join(parts)}</p>")
+    return build_page("\n".join(paragraphs), css)
+
+
+def _walk_texts(root):
+    """
+    Один прохід iterwalk: текст елемента — на 'start', хвіст — на 'end'
+    (він належить батьківському елементу), тож порядок збігається з документом.
+    """
+    skip = set(SKIP_PARENTS)
+    texts = []
+    # Коментарі приходять окремою подією (без start/end) — у них важливий лише хвіст
+    for event, el in etree.iterwalk(root, events=("start", "end", "comment", "pi")):
+        if event == "start":
+            if el.tag not in skip and el.text:
+                text = el.text.strip()
+                if text:
+                    texts.append(text)
+        elif el.tail and el is not root:
+            parent = el.getparent()
+            if parent is not None and parent.tag not in skip:
+                text = el.tail.strip()
+                if text:
+                    texts.append(text)
+    return texts
+
+
+def collect_texts_lxml(html_content: str):
+    """Тексти фрагмента HTML для перекладу (як collect_text_nodes, але лише рядки)."""
+    if lxml_html is None or not html_content.strip():
+        return collect_text_nodes(parse_html(html_content))[0]
+    return _walk_texts(lxml_html.fromstring(html_content))
+
+
+def page_texts(page_html: str):
+    """Тексти глави з повної сторінки: контейнер CONTENT_SELECTOR (або body) → сегменти."""
+    if lxml_html is None or not page_html.strip():
+        return collect_text_nodes(parse_html(extract_content_html(page_html)))[0]
+    document = lxml_html.document_fromstring(page_html)
+    found = document.xpath(_CONTENT_XPATH)
+    if found:
+        root = found[0]
+    else:
+        body = document.find("body")
+        root = body if body is not None else document
+    # Хвіст самого контейнера — уже поза главою, _walk_texts його не бере
+    return _walk_texts(root)
@@ -0,0 +1,299 @@
+# modules/novel_browser/filters.py
+"""
+Списки фільтрів у форматі Adblock Plus / EasyList і їхній скомпільований кеш.
+
+Підтримувана підмножина синтаксису:
+  ||example.com^          — домен з піддоменами;
+  @@||example.com^        — виняток для домену;
+  /ads/banner, ||cdn.com/ad/*.js, |https://x.com/a, x.js|  — шаблони з * і ^, якорями || і |;
+  @@/ads/ok.js            — виняток для шаблону (перекриває і домен, і шаблон);
+  ! коментарі, [Adblock …], правила приховування елементів (##) — пропускаються;
+  правила з $опціями (third-party, типи ресурсів, domain=…) — пропускаються:
+  перевірити їх тут нічим, а без них правило блокувало б зайве. Винятки з
+  опціями (крім domain= і косметичних) діють без опцій — це лише дозволяє більше.
+
+Кеш — один бінарний файл, усе читається прямо з mmap без розбору:
+відсортовані 64-бітні хеші доменів, пласкі масиви автомата шаблонів
+(MappedAutomaton) і тексти регулярок. Кеш перебудовується лише тоді,
+коли змінилися файли списків.
+"""
+import array
+import bisect
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+
+from .matcher import MappedAutomaton, PatternAutomaton, RequestMatcher
+
+MAGIC = b"NBFL"
+VERSION = 3   # 3: пласкі масиви автомата, винятки для шаблонів
+# magic, версія, порядок байтів, відбиток джерел, к-сть заблокованих/дозволених хешів,
+# станів автомата, номерів шаблонів у станах, шаблонів, довжина текстів регулярок
+# (7 байтів вирівнювання — масиви хешів починаються з адреси, кратної 8)
+_HEADER = struct.Struct("<4sIB7x32sQQQQQQ")
+
+_HOST_RULE = re.compile(r"^\|\|([a-z0-9.\-]+)\^?$")
+# Опції, без яких правило блокування означає те саме
+_NEUTRAL_OPTIONS = {"important"}
+# Винятки лише для приховування елементів — на запити не впливають
+_COSMETIC_OPTIONS = {"elemhide", "ehide", "generichide", "ghide", "specifichide", "shide"}
+# "||" — початок хоста або будь-якого його піддомену
+_DOMAIN_ANCHOR = r"^(?:[^/?]*\.)?"
+
+
+def host_hash(host: str) -> int:
+    return int.from_bytes(hashlib.blake2b(host.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class MappedHashSet:
+    """Множина доменів як відсортований масив хешів (memoryview над mmap)."""
+
+    def __init__(self, hashes):
+        self._hashes = hashes
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, host: str) -> bool:
+        h = host_hash(host)
+        i = bisect.bisect_left(self._hashes, h)
+        return i < len(self._hashes) and self._hashes[i] == h
+
+
+# ──────────────────────────────
+# 📜 Розбір правил
+# ──────────────────────────────
+def _pattern_to_regex(pattern: str, start: str = "", end: bool = False) -> str:
+    """ABP-шаблон → регулярний вираз ('*' — будь-що, '^' — роздільник, start/end — якорі)."""
+    out = [start]
+    for ch in pattern:
+        if ch == "*":
+            out.append(".*")
+        elif ch == "^":
+            out.append(r"(?:[^a-z0-9_.%\-]|$)")
+        else:
+            out.append(re.escape(ch))
+    if end:
+        out.append("$")
+    return "".join(out)
+
+
+def _longest_literal(pattern: str) -> str:
+    return max(re.split(r"[*^]", pattern), key=len)
+
+
+def parse_rules(lines):
+    """
+    Повертає (заблоковані домени, дозволені домени, шаблони, регулярки, винятки):
+    шаблони — літерали для автомата, регулярки[i] — перевірка для шаблону i
+    (None, якщо літерала достатньо), винятки[i] — шаблон i з правила @@.
+    """
+    blocked, allowed = set(), set()
+    patterns, regexes, exceptions = [], [], []
+    for raw in lines:
+        line = raw.strip().lower()
+        if not line or line.startswith(("!", "[")):
+            continue
+        if "##" in line or "#@#" in line or "#?#" in line:
+            continue  # приховування елементів — не наша справа
+
+        exception = line.startswith("@@")
+        if exception:
+            line = line[2:]
+
+        if "$" in line:
+            line, options = line.split("$", 1)
+            options = {option.strip() for option in options.split(",")}
+            if any(option.startswith("domain=") for option in options):
+                continue  # правило лише для окремих сайтів
+            if exception and options & _COSMETIC_OPTIONS:
+                continue
+            if not exception and not options <= _NEUTRAL_OPTIONS:
+                continue  # третя сторона, типи ресурсів, ~заперечення — не перевіряємо
+
+        host_match = _HOST_RULE.match(line)
+        if host_match:
+            (allowed if exception else blocked).add(host_match.group(1))
+            continue
+
+        # Шаблон шукається в "хост/шлях?query": схему прибираємо, якорі — в регулярку
+        start = ""
+        if line.startswith("||"):
+            line, start = line[2:], _DOMAIN_ANCHOR
+        elif line.startswith("|"):
+            line, start = line[1:], "^"
+        end = line.endswith("|")
+        line = line.rstrip("|")
+        if re.match(r"[a-z]+://", line):
+            line = re.sub(r"^[a-z]+://", "", line)
+            start = "^" if start else ""
+        if len(line) < 3:
+            continue
+        literal = _longest_literal(line)
+        if len(literal) < 3:
+            continue
+        patterns.append(literal)
+        regexes.append(None if literal == line and not start and not end
+                       else _pattern_to_regex(line, start, end))
+        exceptions.append(exception)
+    return blocked, allowed, patterns, regexes, exceptions
+
+
+# ──────────────────────────────
+# 💾 Скомпільований кеш
+# ──────────────────────────────
+def _fingerprint(sources, extra_rules) -> bytes:
+    digest = hashlib.sha256()
+    for path in sorted(sources):
+        st = os.stat(path)
+        digest.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    digest.update("\n".join(extra_rules).encode("utf-8"))
+    return digest.digest()
+
+
+def _write_cache(path, fingerprint, blocked, allowed, patterns, regexes, exceptions):
+    blocked_hashes = array.array("Q", sorted({host_hash(h) for h in blocked}))
+    allowed_hashes = array.array("Q", sorted({host_hash(h) for h in allowed}))
+    automaton = PatternAutomaton(patterns).to_arrays()
+    # Регулярки — один UTF-8 текст і зміщення (порожній відрізок — перевірка не потрібна)
+    regex_offsets, texts, size = array.array("I", [0]), [], 0
+    for source in regexes:
+        encoded = source.encode("utf-8") if source is not None else b""
+        texts.append(encoded)
+        size += len(encoded)
+        regex_offsets.append(size)
+    header = _HEADER.pack(MAGIC, VERSION, sys.byteorder == "little", fingerprint,
+                          len(blocked_hashes), len(allowed_hashes), len(automaton[1]),
+                          len(automaton[5]), len(patterns), size)
+
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        blocked_hashes.tofile(f)
+        allowed_hashes.tofile(f)
+        for part in automaton:
+            part.tofile(f)
+        regex_offsets.tofile(f)
+        f.write(bytes(exceptions))
+        f.write(b"".join(texts))
+    os.replace(tmp, path)
+
+
+class CompiledFilters:
+    """Відкритий кеш фільтрів. Тримає mmap, доки живе матчер."""
+
+    def __init__(self, path: str, fingerprint: bytes = None):
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("порожній файл кешу")
+        (magic, version, little, stored, n_blocked, n_allowed, n_states, n_outputs,
+         n_patterns, regex_len) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or bool(little) != (sys.byteorder == "little"):
+            self.close()
+            raise ValueError("несумісний формат кешу")
+        if fingerprint is not None and stored != fingerprint:
+            self.close()
+            raise ValueError("кеш застарів")
+
+        size = (_HEADER.size + 8 * (n_blocked + n_allowed)
+                + 4 * (5 * n_states + 2 + n_outputs + n_patterns + 1) + n_patterns + regex_len)
+        if len(self._mmap) < size:
+            self.close()
+            raise ValueError("обрізаний файл кешу")
+
+        view = memoryview(self._mmap)
+        offset = _HEADER.size
+
+        def take(count, item_size, fmt):
+            nonlocal offset
+            part = view[offset:offset + count * item_size].cast(fmt)
+            offset += count * item_size
+            return part
+
+        self.blocked = MappedHashSet(take(n_blocked, 8, "Q"))
+        self.allowed = MappedHashSet(take(n_allowed, 8, "Q"))
+        self.automaton = MappedAutomaton(
+            take(n_states + 1, 4, "I"), take(n_states, 4, "I"), take(n_states, 4, "I"),
+            take(n_states, 4, "I"), take(n_states + 1, 4, "I"), take(n_outputs, 4, "I"),
+        )
+        self._regex_offsets = take(n_patterns + 1, 4, "I")
+        self._exceptions = take(n_patterns, 1, "B")
+        self._regex_texts = take(regex_len, 1, "B")
+        self._regexes = {}
+
+    def _check(self, number: int, text: str) -> bool:
+        start, end = self._regex_offsets[number], self._regex_offsets[number + 1]
+        if start == end:
+            return True
+        regex = self._regexes.get(number)
+        if regex is None:
+            regex = self._regexes[number] = re.compile(bytes(self._regex_texts[start:end]).decode("utf-8"))
+        return regex.search(text) is not None
+
+    def _verify(self, number: int, text: str) -> bool:
+        return not self._exceptions[number] and self._check(number, text)
+
+    def _verify_exception(self, number: int, text: str) -> bool:
+        return bool(self._exceptions[number]) and self._check(number, text)
+
+    def matcher(self) -> RequestMatcher:
+        return RequestMatcher(self.blocked, self.automaton, self.allowed, verify=self._verify,
+                              allow_verify=self._verify_exception)
+
+    def close(self):
+        # memoryview-и над mmap мають бути звільнені до закриття
+        self.blocked = self.allowed = self.automaton = None
+        self._regex_offsets = self._exceptions = self._regex_texts = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+
+def simple_rule_to_abp(rule: str) -> str:
+    """Правило з налаштувань (як у RequestMatcher.from_rules) → ABP-синтаксис."""
+    rule = rule.strip().lower()
+    if rule and "/" not in rule:
+        return f"||{rule.lstrip('.')}^"
+    return rule
+
+
+def list_filter_files(folder: str):
+    if not os.path.isdir(folder):
+        return []
+    return [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+            if name.lower().endswith(".txt")]
+
+
+def load_filters(filter_dir: str, cache_path: str, extra_rules=()) -> CompiledFilters:
+    """
+    Відкриває скомпільований кеш; якщо списки (або extra_rules) змінилися —
+    спершу перекомпільовує їх.
+    """
+    sources = list_filter_files(filter_dir)
+    extra_rules = list(extra_rules)
+    fingerprint = _fingerprint(sources, extra_rules)
+    if os.path.exists(cache_path):
+        try:
+            return CompiledFilters(cache_path, fingerprint)
+        except (ValueError, struct.error) as e:
+            print(f"🔄 Перекомпіляція фільтрів ({e}).")
+
+    lines = [simple_rule_to_abp(rule) for rule in extra_rules]
+    for path in sources:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            lines.extend(f)
+    blocked, allowed, patterns, regexes, exceptions = parse_rules(lines)
+    _write_cache(cache_path, fingerprint, blocked, allowed, patterns, regexes, exceptions)
+    print(f"🛡️ Скомпільовано фільтри: {len(blocked)} доменів, {len(patterns)} шаблонів.")
+    return CompiledFilters(cache_path, fingerprint)
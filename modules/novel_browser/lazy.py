@@ -0,0 +1,44 @@
+# modules/novel_browser/lazy.py
+"""Легкий контейнер-заглушка: справжній віджет створюється при першому показі."""
+import time
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+
+class LazyHost(QWidget):
+    """
+    Показує напис-заглушку, а factory() викликає лише тоді, коли контейнер
+    уперше став видимим (після того, як заглушка встигла намалюватися).
+    """
+
+    def __init__(self, factory, placeholder_text: str, on_created=None, parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self._on_created = on_created
+        self.widget = None
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.placeholder = QLabel(placeholder_text)
+        self.placeholder.setAlignment(Qt.AlignCenter)
+        self._layout.addWidget(self.placeholder)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.widget is None and self._factory is not None:
+            QTimer.singleShot(0, self.ensure_created)
+
+    def ensure_created(self):
+        if self.widget is not None or self._factory is None:
+            return self.widget
+        started = time.perf_counter()
+        self.widget = self._factory()
+        self._factory = None
+        print(f"⏱️ {type(self.widget).__name__} створено за {time.perf_counter() - started:.2f} с")
+        self._layout.removeWidget(self.placeholder)
+        self.placeholder.deleteLater()
+        self.placeholder = None
+        self._layout.addWidget(self.widget)
+        if self._on_created:
+            self._on_created(self.widget)
+        return self.widget
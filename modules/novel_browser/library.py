@@ -0,0 +1,193 @@
+# modules/novel_browser/library.py
+"""
+Каталог збережених глав (saved_novels/*.docx) у SQLite.
+
+Індекс оновлюється інкрементно: файл читається лише тоді, коли змінилися
+його mtime або розмір, тож повторне оновлення тек з тисячами глав —
+це лише os.scandir. Qt тут не потрібен.
+"""
+import os
+import re
+import sqlite3
+import threading
+import zipfile
+from xml.etree import ElementTree
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+
+_CHAPTER_NO = re.compile(r"(?:chapter|розділ|глава|частина|ch\.?)\s*(\d+)", re.IGNORECASE)
+_ANY_NO = re.compile(r"\d+")
+_SAVED_LINE = "Збережено:"
+
+# Колонки, за якими можна сортувати бібліотеку
+SORT_COLUMNS = ("novel", "chapter_no", "title", "words", "language", "mtime")
+
+
+def detect_language(text: str) -> str:
+    """Груба, але миттєва оцінка мови за літерами."""
+    sample = text[:5000].lower()
+    if re.search(r"[іїєґ]", sample):
+        return "uk"
+    if re.search(r"[ыэъё]", sample):
+        return "ru"
+    cyrillic = len(re.findall(r"[а-я]", sample))
+    latin = len(re.findall(r"[a-z]", sample))
+    if cyrillic > latin:
+        return "uk"
+    return "en" if latin else ""
+
+
+def chapter_number(*titles):
+    for title in titles:
+        if not title:
+            continue
+        match = _CHAPTER_NO.search(title)
+        if match:
+            return int(match.group(1))
+        match = _ANY_NO.search(title)
+        if match:
+            return int(match.group(0))
+    return None
+
+
+def read_docx_info(path: str) -> dict:
+    """
+    Метадані глави без python-docx: назва з docProps/core.xml (якщо є),
+    інакше — з першого заголовка; кількість слів — з тексту абзаців.
+    """
+    with zipfile.ZipFile(path) as z:
+        core_title = core_subject = ""
+        if "docProps/core.xml" in z.namelist():
+            core = ElementTree.fromstring(z.read("docProps/core.xml"))
+            core_title = (core.findtext(f"{_DC}title") or "").strip()
+            core_subject = (core.findtext(f"{_DC}subject") or "").strip()
+
+        paragraphs = []
+        with z.open("word/document.xml") as f:
+            for _event, elem in ElementTree.iterparse(f):
+                if elem.tag == f"{_W}p":
+                    text = "".join(t.text or "" for t in elem.iter(f"{_W}t")).strip()
+                    if text:
+                        paragraphs.append(text)
+                    elem.clear()
+
+    heading = paragraphs[0] if paragraphs else ""
+    body = [p for p in paragraphs[1:] if not p.startswith(_SAVED_LINE)]
+    if core_subject:
+        novel, title = core_title, core_subject
+    elif " - " in heading:
+        novel, title = heading.split(" - ", 1)
+    else:
+        novel, title = "", heading
+    text = "\n".join(body)
+    return {
+        "novel": novel.strip(),
+        "title": title.strip(),
+        "chapter_no": chapter_number(title, heading),
+        "words": len(text.split()),
+        "language": detect_language(text),
+    }
+
+
+class LibraryIndex:
+    """Індекс глав однієї теки. Потокобезпечний (одне з'єднання під _lock)."""
+
+    def __init__(self, folder: str, db_path: str):
+        self.folder = folder
+        self._lock = threading.Lock()
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chapters (
+                file TEXT PRIMARY KEY,
+                novel TEXT NOT NULL,
+                chapter_no INTEGER,
+                title TEXT NOT NULL,
+                words INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chapters_novel ON chapters(novel, chapter_no)")
+        self._conn.commit()
+
+    def refresh(self):
+        """Синхронізує індекс з текою. Повертає (оновлено, видалено)."""
+        on_disk = {}
+        if os.path.isdir(self.folder):
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(".docx") and not entry.name.startswith("~$"):
+                        st = entry.stat()
+                        on_disk[entry.name] = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            known = {row[0]: (row[1], row[2]) for row in
+                     self._conn.execute("SELECT file, mtime_ns, size FROM chapters")}
+        changed = [name for name, stamp in on_disk.items() if known.get(name) != stamp]
+        removed = [name for name in known if name not in on_disk]
+
+        # Читаємо docx поза блокуванням — запити до індексу не чекають
+        rows = []
+        for name in changed:
+            mtime_ns, size = on_disk[name]
+            try:
+                info = read_docx_info(os.path.join(self.folder, name))
+            except (OSError, KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+                print(f"⚠️ Бібліотека: не вдалося прочитати {name}: {e}")
+                info = {"novel": "", "title": os.path.splitext(name)[0], "chapter_no": None,
+                        "words": 0, "language": ""}
+            rows.append((name, info["novel"], info["chapter_no"], info["title"], info["words"],
+                         info["language"], size, mtime_ns))
+
+        with self._lock:
+            self._conn.executemany("""
+                INSERT OR REPLACE INTO chapters
+                (file, novel, chapter_no, title, words, language, size, mtime_ns)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self._conn.executemany("DELETE FROM chapters WHERE file = ?", [(n,) for n in removed])
+            self._conn.commit()
+        return len(rows), len(removed)
+
+    def chapters(self, search: str = "", sort: str = "novel", descending: bool = False):
+        """Рядки (file, novel, chapter_no, title, words, language, mtime) з індексу."""
+        if sort not in SORT_COLUMNS:
+            sort = "novel"
+        column = "mtime_ns" if sort == "mtime" else sort
+        direction = "DESC" if descending else "ASC"
+        order = f"{column} {direction}"
+        if column == "novel":
+            order += f", chapter_no {direction}"
+        query = "SELECT file, novel, chapter_no, title, words, language, mtime_ns / 1e9 FROM chapters"
+        params = ()
+        if search:
+            # % і _ у запиті — звичайні символи, а не шаблони LIKE
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            query += " WHERE novel LIKE ? ESCAPE '\\' OR title LIKE ? ESCAPE '\\'"
+            params = (f"%{escaped}%", f"%{escaped}%")
+        with self._lock:
+            return self._conn.execute(f"{query} ORDER BY {order}", params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    # python -m modules.novel_browser.library — оновити індекс і показати каталог
+    import time
+    from .settings import data_path, load_settings
+    settings = load_settings()
+    index = LibraryIndex(data_path(settings["library_folder"]), data_path(settings["library_index"]))
+    started = time.perf_counter()
+    updated, removed = index.refresh()
+    print(f"📚 Оновлено {updated}, видалено {removed} за {time.perf_counter() - started:.3f} с")
+    for row in index.chapters():
+        print(f"  {row[1] or '—'} | {row[2] or '—'} | {row[3]} | {row[4]} сл. | {row[5]}")
@@ -0,0 +1,193 @@
+# modules/novel_browser/library_view.py
+"""Вікно бібліотеки: список збережених глав з індексу (library.py)."""
+import os
+from datetime import datetime
+
+from PyQt5.QtCore import (
+    QAbstractTableModel, QFileSystemWatcher, QModelIndex, QObject, QRunnable, QThreadPool,
+    QTimer, QUrl, Qt, pyqtSignal,
+)
+from PyQt5.QtGui import QDesktopServices
+from PyQt5.QtWidgets import QDialog, QHeaderView, QLabel, QLineEdit, QTableView, QVBoxLayout
+
+from .library import SORT_COLUMNS, LibraryIndex
+
+_HEADERS = ("Новела", "№", "Глава", "Слів", "Мова", "Змінено")
+
+
+class LibraryModel(QAbstractTableModel):
+    """Таблиця над рядками індексу; сортування і пошук виконує SQLite."""
+
+    def __init__(self, index: LibraryIndex, parent=None):
+        super().__init__(parent)
+        self.index_db = index
+        self.rows = []
+        self.search = ""
+        self.sort_column = 0
+        self.sort_order = Qt.AscendingOrder
+
+    def reload(self):
+        self.beginResetModel()
+        self.rows = self.index_db.chapters(
+            self.search, SORT_COLUMNS[self.sort_column], self.sort_order == Qt.DescendingOrder
+        )
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return _HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            value = row[column + 1]
+            if column == 5:
+                return datetime.fromtimestamp(value).strftime("%d.%m.%Y %H:%M")
+            return "" if value is None else str(value)
+        if role == Qt.ToolTipRole:
+            return row[0]
+        if role == Qt.TextAlignmentRole and column in (1, 3):
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column, self.sort_order = column, order
+        self.reload()
+
+    def file_at(self, row: int) -> str:
+        return self.rows[row][0]
+
+
+class _RefreshSignals(QObject):
+    done = pyqtSignal(int, int)   # оновлено, видалено
+
+
+class _RefreshJob(QRunnable):
+    def __init__(self, index: LibraryIndex, signals: _RefreshSignals):
+        super().__init__()
+        self.index = index
+        self.signals = signals
+
+    def run(self):
+        try:
+            updated, removed = self.index.refresh()
+        except Exception as e:
+            print(f"⚠️ Бібліотека: помилка оновлення індексу: {e}")
+            updated = removed = 0
+        self.signals.done.emit(updated, removed)
+
+
+class LibraryWatcher(QObject):
+    """
+    Тримає індекс у синхроні з текою, поки працює модуль (а не лише поки
+    відкрите вікно): оновлення при старті і при змінах у теці, у фоні.
+    """
+    changed = pyqtSignal()   # індекс змінився — моделі перечитують рядки
+
+    def __init__(self, folder: str, db_path: str, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.index = LibraryIndex(folder, db_path)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._running = False
+        self._again = False      # зміни під час оновлення — ще один прохід після нього
+        self._signals = _RefreshSignals()
+        self._signals.done.connect(self._on_refreshed)
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(400)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self.watcher = QFileSystemWatcher([folder], self)
+        self.watcher.directoryChanged.connect(lambda _path: self._refresh_timer.start())
+        self.refresh()
+
+    def refresh(self):
+        if self._running:
+            self._again = True
+            return
+        self._running = True
+        self.pool.start(_RefreshJob(self.index, self._signals))
+
+    def _on_refreshed(self, updated: int, removed: int):
+        self._running = False
+        if updated or removed:
+            self.changed.emit()
+        if self._again:
+            self._again = False
+            self.refresh()
+
+    def close(self):
+        """При вивантаженні модуля: дочекатися поточного проходу і закрити індекс."""
+        self._refresh_timer.stop()
+        self.watcher.removePaths(self.watcher.directories())
+        self._again = False
+        self.pool.waitForDone()
+        self.index.close()
+
+
+class LibraryDialog(QDialog):
+    """Показує каталог одразу з індексу; оновлює його LibraryWatcher у фоні."""
+
+    def __init__(self, library: LibraryWatcher, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("📚 Бібліотека")
+        self.resize(900, 600)
+        self.library = library
+        self.folder = library.folder
+
+        layout = QVBoxLayout(self)
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("🔍 Пошук за новелою або главою…")
+        self.search.textChanged.connect(self._on_search)
+        layout.addWidget(self.search)
+
+        self.model = LibraryModel(library.index, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.table.doubleClicked.connect(self._open_chapter)
+        layout.addWidget(self.table)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+        library.changed.connect(self._on_changed)
+        self._update_status()   # sortByColumn вище вже завантажив рядки
+
+    def _on_changed(self):
+        self.model.reload()
+        self._update_status()
+
+    def _on_search(self, text: str):
+        self.model.search = text.strip()
+        self.model.reload()
+        self._update_status()
+
+    def _update_status(self):
+        self.status.setText(f"Глав: {len(self.model.rows)}")
+
+    def _open_chapter(self, index):
+        path = os.path.join(self.folder, self.model.file_at(index.row()))
+        QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+
+    def done(self, result):
+        # Індекс не закриваємо і фонового оновлення не чекаємо — ним володіє LibraryWatcher
+        self.library.changed.disconnect(self._on_changed)
+        super().done(result)
@@ -0,0 +1,222 @@
+# modules/novel_browser/matcher.py
+"""
+Скомпільований матчер для блокування запитів (без Qt).
+
+Правила:
+  * "doubleclick.net"    — домен: блокується сам хост і всі піддомени;
+  * "/tracking", "ads/"  — шаблон: підрядок у "хост/шлях?query".
+
+Домени перевіряються хеш-множиною суфіксів хоста (по одному пошуку на
+мітку домену), шаблони — автоматом Ахо-Корасік за один прохід. Шаблон
+може мати перевірку (регулярний вираз) — її виконують лише тоді, коли
+автомат знайшов його літеральну частину (див. filters.py).
+Скомпільований автомат — пласкі масиви (MappedAutomaton), що читаються
+прямо з mmap кешу без розбору.
+"""
+import bisect
+from array import array
+from collections import deque
+from urllib.parse import urlsplit
+
+
+class PatternAutomaton:
+    """Автомат Ахо-Корасік: знаходить будь-який із шаблонів за один прохід тексту."""
+
+    def __init__(self, patterns=()):
+        self.goto = [{}]     # стан → {символ: стан}
+        self.fail = [0]
+        self.out = [()]      # номери шаблонів, що закінчуються в стані (кілька — спільний літерал)
+        self.link = [0]      # найближчий fail-предок з шаблоном (0 — немає)
+        for number, pattern in enumerate(patterns):
+            self._add(pattern, number)
+        self._build()
+
+    def _add(self, pattern: str, number: int):
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+                self.link.append(0)
+            state = nxt
+        self.out[state] += (number,)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                f = self.goto[f].get(ch, 0)
+                self.fail[nxt] = f
+                self.link[nxt] = f if self.out[f] else self.link[f]
+
+    def __bool__(self):
+        return len(self.goto) > 1
+
+    def search(self, text: str, verify=None) -> bool:
+        """
+        Чи містить текст хоча б один шаблон. verify(номер, текст) — необов'язкова
+        додаткова перевірка знайденого шаблону; якщо літерал спільний для кількох
+        правил, перевіряються всі, доки одне не підтвердиться.
+        """
+        goto, fail, out, link = self.goto, self.fail, self.out, self.link
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = state if out[state] else link[state]
+            while hit:
+                if verify is None:
+                    return True
+                for number in out[hit]:
+                    if verify(number, text):
+                        return True
+                hit = link[hit]
+        return False
+
+    def to_arrays(self):
+        """
+        Пласке подання для MappedAutomaton: стани перенумеровано в порядку обходу
+        в ширину, діти кожного стану йдуть поспіль і відсортовані за символом.
+        Повертає масиви uint32 (first, chars, fail, link, out_first, out_ids).
+        """
+        order = [0]
+        new_id = {0: 0}
+        first = array("I")
+        chars = array("I", [0])
+        for state in order:   # order росте під час обходу
+            first.append(len(order))
+            for ch in sorted(self.goto[state]):
+                child = self.goto[state][ch]
+                new_id[child] = len(order)
+                order.append(child)
+                chars.append(ord(ch))
+        first.append(len(order))
+        fail = array("I", (new_id[self.fail[old]] for old in order))
+        link = array("I", (new_id[self.link[old]] for old in order))
+        out_first, out_ids = array("I"), array("I")
+        for old in order:
+            out_first.append(len(out_ids))
+            out_ids.extend(self.out[old])
+        out_first.append(len(out_ids))
+        return first, chars, fail, link, out_first, out_ids
+
+
+class MappedAutomaton:
+    """
+    Той самий автомат у пласких масивах (memoryview над mmap або array):
+    переходи стану s — діти first[s]…first[s+1]-1, пошук символу — бінарний.
+    """
+
+    def __init__(self, first, chars, fail, link, out_first, out_ids):
+        self.first, self.chars, self.fail, self.link = first, chars, fail, link
+        self.out_first, self.out_ids = out_first, out_ids
+        # Переходи з кореня — найчастіші, їх небагато: тримаємо словником
+        self._root = {chars[i]: i for i in range(first[0], first[1])}
+
+    def __bool__(self):
+        return len(self.chars) > 1
+
+    def _outputs(self, state):
+        return self.out_ids[self.out_first[state]:self.out_first[state + 1]]
+
+    def search(self, text: str, verify=None) -> bool:
+        """Як PatternAutomaton.search."""
+        first, chars, fail, link, out_first = self.first, self.chars, self.fail, self.link, self.out_first
+        root = self._root
+        state = 0
+        for ch in text:
+            code = ord(ch)
+            while True:
+                if state == 0:
+                    state = root.get(code, 0)
+                    break
+                lo, hi = first[state], first[state + 1]
+                if hi - lo == 1:   # більшість станів — ланцюжок з одним переходом
+                    if chars[lo] == code:
+                        state = lo
+                        break
+                elif lo < hi:
+                    i = bisect.bisect_left(chars, code, lo, hi)
+                    if i < hi and chars[i] == code:
+                        state = i
+                        break
+                state = fail[state]
+            hit = state if out_first[state] != out_first[state + 1] else link[state]
+            while hit:
+                if verify is None:
+                    return True
+                for number in self._outputs(hit):
+                    if verify(number, text):
+                        return True
+                hit = link[hit]
+        return False
+
+
+def host_suffixes(host: str):
+    """'a.b.example.com' → 'a.b.example.com', 'b.example.com', 'example.com', 'com'."""
+    while host:
+        yield host
+        dot = host.find(".")
+        if dot < 0:
+            return
+        host = host[dot + 1:]
+
+
+class RequestMatcher:
+    """Вирішує, чи блокувати URL. Будується один раз, перевірка — O(міток домену + довжини шляху)."""
+
+    def __init__(self, blocked_hosts=(), path_patterns=(), allowed_hosts=(), verify=None,
+                 allow_verify=None):
+        # Множини хостів — set або будь-який об'єкт з `in` за O(1)/O(log n)
+        self.blocked_hosts = set(blocked_hosts) if isinstance(blocked_hosts, (list, tuple)) else blocked_hosts
+        self.allowed_hosts = set(allowed_hosts) if isinstance(allowed_hosts, (list, tuple)) else allowed_hosts
+        self.paths = path_patterns if isinstance(path_patterns, (PatternAutomaton, MappedAutomaton)) \
+            else PatternAutomaton(path_patterns)
+        # verify — знайдений шаблон блокує; allow_verify — знайдений шаблон-виняток (@@)
+        self.verify = verify
+        self.allow_verify = allow_verify
+
+    @classmethod
+    def from_rules(cls, rules):
+        hosts, paths = set(), []
+        for rule in rules:
+            rule = rule.strip().lower()
+            if not rule:
+                continue
+            if "/" in rule:
+                paths.append(rule)
+            else:
+                hosts.add(rule.lstrip("."))
+        return cls(hosts, paths)
+
+    def _host_in(self, hosts, host: str) -> bool:
+        for suffix in host_suffixes(host):
+            if suffix in hosts:
+                return True
+        return False
+
+    def should_block(self, url: str) -> bool:
+        parts = urlsplit(url)
+        return self.should_block_parts((parts.hostname or ""), parts.path, parts.query)
+
+    def should_block_parts(self, host: str, path: str, query: str = "") -> bool:
+        host = host.lower()
+        if self.allowed_hosts and self._host_in(self.allowed_hosts, host):
+            return False
+        target = f"{host}{path}?{query}".lower() if query else f"{host}{path}".lower()
+        blocked = self._host_in(self.blocked_hosts, host) or \
+            bool(self.paths) and self.paths.search(target, self.verify)
+        if blocked and self.allow_verify is not None and self.paths:
+            # Виняток для шаблону перекриває і домен, і шаблон блокування
+            return not self.paths.search(target, self.allow_verify)
+        return blocked
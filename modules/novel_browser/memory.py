@@ -0,0 +1,328 @@
+# modules/novel_browser/memory.py
+"""
+Пам'ять перекладів на рівні речень і глосарій.
+
+Глави новел повторюють одні й ті самі фрази, імена й системні повідомлення.
+Кожне перекладене речення зберігається в SQLite; наступного разу воно
+береться звідси — точний збіг (з точністю до регістру, пробілів і чисел)
+або майже точний: кандидати з MinHash/LSH за 4-грамами символів, але чужий
+переклад береться лише тоді, коли речення відрізняються самими розділовими
+знаками (пропущене «не» чи інше ім'я — це вже інше речення).
+До перекладача йдуть лише невідомі речення.
+
+Глосарій (JSON {"термін": "переклад"}) фіксує переклад імен: у тексті,
+що йде до перекладача, терміни одразу замінюються перекладом.
+"""
+import difflib
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+# Межа речення: після . ! ? … (і лапок/дужок за ними) + пробіл
+_SENTENCE_END = re.compile(r'(?<=[.!?…。！？])["\'»”’)\]]*\s+')
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_SPACES = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"[^\w#\s]+|_")
+
+# MinHash з однією перестановкою: хеш 4-грами розкладається по 16 кошиках
+# (мінімум у кожному), 16 значень = 4 смуги × 4 рядки (кандидати від Жаккара ≈ 0.7)
+_PERMUTATIONS = 16
+_ROWS = 4
+FUZZY_MIN_LEN = 20       # коротші речення — лише точний збіг
+MAX_CANDIDATES = 20
+FLUSH_EVERY = 1000       # стільки відкладених записів — і пишемо, не чекаючи flush()
+
+
+def split_sentences(text: str):
+    """Речення сегмента (без порожніх). Склеюються назад через пробіл."""
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+
+def normalize(sentence: str) -> str:
+    """Ключ точного збігу: нижній регістр, один пробіл, числа → #."""
+    return _NUMBER.sub("#", _SPACES.sub(" ", sentence.strip().lower()))
+
+
+def _wording(norm: str) -> str:
+    """Нормалізоване речення без розділових знаків — для перевірки схожого збігу."""
+    return _SPACES.sub(" ", _PUNCTUATION.sub(" ", norm)).strip()
+
+
+def _adapt_numbers(old_source: str, new_source: str, translation: str):
+    """
+    Підставляє в переклад числа нового речення замість чисел старого.
+    None — якщо числа не вдається однозначно зіставити.
+    """
+    old_numbers = _NUMBER.findall(old_source)
+    new_numbers = _NUMBER.findall(new_source)
+    if old_numbers == new_numbers:
+        return translation
+    if len(old_numbers) != len(new_numbers):
+        return None
+    mapping = {}
+    for old, new in zip(old_numbers, new_numbers):
+        if mapping.setdefault(old, new) != new:
+            return None
+    if sorted(_NUMBER.findall(translation)) != sorted(old_numbers):
+        return None
+    return _NUMBER.sub(lambda m: mapping.get(m.group(0), m.group(0)), translation)
+
+
+def minhash_bands(norm: str):
+    """Ключі LSH-смуг для нормалізованого речення."""
+    signature = [None] * _PERMUTATIONS
+    # 4-грами символів, crc32 — швидкий хеш із C
+    for h in {zlib.crc32(norm[i:i + 4].encode("utf-8")) for i in range(max(len(norm) - 3, 1))}:
+        slot, value = h & (_PERMUTATIONS - 1), h >> 4
+        current = signature[slot]
+        if current is None or value < current:
+            signature[slot] = value
+    # Порожній кошик бере значення найближчого непорожнього праворуч (з відстанню),
+    # щоб короткі речення теж мали повний підпис
+    filled = [slot for slot in range(_PERMUTATIONS) if signature[slot] is not None]
+    dense = []
+    for slot in range(_PERMUTATIONS):
+        source = next((f for f in filled if f >= slot), filled[0])
+        dense.append((signature[source], (source - slot) % _PERMUTATIONS))
+    bands = []
+    for band in range(_PERMUTATIONS // _ROWS):
+        rows = dense[band * _ROWS:(band + 1) * _ROWS]
+        digest = hashlib.blake2b(repr((band, rows)).encode(), digest_size=8).digest()
+        bands.append(int.from_bytes(digest, "little", signed=True))
+    return bands
+
+
+class TranslationMemory:
+    """
+    Речення → переклад для пари мов. Потокобезпечна (одне з'єднання під _lock).
+
+    Нові речення і позначки використання накопичуються в пам'яті й пишуться
+    однією транзакцією у flush() (SafeTranslator викликає його в кінці глави),
+    а не комітом на кожне речення.
+    """
+
+    def __init__(self, path: str, fuzzy_threshold: float = 0.95):
+        self.path = path
+        self.fuzzy_threshold = fuzzy_threshold
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending = {}       # (пара, norm) → (речення, переклад, смуги) — ще не в базі
+        self._touched = {}       # id речення → час використання
+        self._fuzzy_pairs = {}   # пара → скільки речень у базі мають LSH-смуги
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sentences (
+                id INTEGER PRIMARY KEY,
+                pair TEXT NOT NULL,
+                norm TEXT NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                UNIQUE (pair, norm)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                sentence INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_bands_band ON bands(band)")
+        self._conn.commit()
+        self._fuzzy_pairs = dict(self._conn.execute(
+            "SELECT pair, COUNT(*) FROM sentences WHERE length(norm) >= ? GROUP BY pair", (FUZZY_MIN_LEN,)
+        ).fetchall())
+
+    def lookup(self, sentence: str, source: str, target: str):
+        """Переклад речення з пам'яті або None."""
+        pair = f"{source}>{target}"
+        norm = normalize(sentence)
+        with self._lock:
+            pending = self._pending.get((pair, norm))
+            row = None if pending else self._conn.execute(
+                "SELECT id, source, target FROM sentences WHERE pair = ? AND norm = ?", (pair, norm)
+            ).fetchone()
+        if pending:
+            translated = _adapt_numbers(pending[0], sentence, pending[1])
+            if translated is not None:
+                self.exact_hits += 1
+                return translated
+        elif row:
+            translated = _adapt_numbers(row[1], sentence, row[2])
+            if translated is not None:
+                self.exact_hits += 1
+                self._touch(row[0])
+                return translated
+
+        # Порожня для цієї пари пам'ять — ні MinHash, ні запиту кандидатів
+        if len(norm) >= FUZZY_MIN_LEN and self._fuzzy_pairs.get(pair):
+            translated = self._fuzzy(pair, norm, sentence)
+            if translated is not None:
+                self.fuzzy_hits += 1
+                return translated
+        self.misses += 1
+        return None
+
+    def _fuzzy(self, pair: str, norm: str, sentence: str):
+        bands = minhash_bands(norm)
+        marks = ",".join("?" * len(bands))
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT DISTINCT s.id, s.norm, s.source, s.target FROM bands b
+                JOIN sentences s ON s.id = b.sentence
+                WHERE b.band IN ({marks}) AND s.pair = ?
+                LIMIT {MAX_CANDIDATES}
+            """, (*bands, pair)).fetchall()
+        best, best_ratio = None, self.fuzzy_threshold
+        wording = _wording(norm)
+        for sid, cand_norm, cand_source, cand_target in rows:
+            if _wording(cand_norm) != wording:
+                continue  # інші слова — переклад чужого речення не підходить
+            ratio = difflib.SequenceMatcher(None, norm, cand_norm, autojunk=False).ratio()
+            if ratio >= best_ratio:
+                translated = _adapt_numbers(cand_source, sentence, cand_target)
+                if translated is not None:
+                    best, best_ratio = (sid, translated), ratio
+        if best is None:
+            return None
+        self._touch(best[0])
+        return best[1]
+
+    def _touch(self, sid: int):
+        with self._lock:
+            self._touched[sid] = time.time()
+
+    def put(self, sentence: str, source: str, target: str, translated: str):
+        if not sentence.strip() or not translated:
+            return
+        norm = normalize(sentence)
+        # MinHash (чистий Python) — тут, у потоці виклику і поза замком
+        bands = minhash_bands(norm) if len(norm) >= FUZZY_MIN_LEN else []
+        with self._lock:
+            self._pending[(f"{source}>{target}", norm)] = (sentence, translated, bands)
+            full = len(self._pending) + len(self._touched) >= FLUSH_EVERY
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Пише накопичені речення і позначки використання однією транзакцією."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+            if not pending and not touched:
+                return
+            now = time.time()
+            new_bands = []
+            for (pair, norm), (sentence, translated, bands) in pending.items():
+                row = self._conn.execute(
+                    "SELECT id FROM sentences WHERE pair = ? AND norm = ?", (pair, norm)
+                ).fetchone()
+                if row:
+                    touched[row[0]] = now
+                    self._conn.execute(
+                        "UPDATE sentences SET source = ?, target = ? WHERE id = ?", (sentence, translated, row[0])
+                    )
+                    continue
+                sid = self._conn.execute(
+                    "INSERT INTO sentences (pair, norm, source, target, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (pair, norm, sentence, translated, now),
+                ).lastrowid
+                if bands:
+                    new_bands.extend((band, sid) for band in bands)
+                    self._fuzzy_pairs[pair] = self._fuzzy_pairs.get(pair, 0) + 1
+            self._conn.executemany("INSERT INTO bands (band, sentence) VALUES (?, ?)", new_bands)
+            self._conn.executemany(
+                "UPDATE sentences SET last_used = ? WHERE id = ?", [(t, sid) for sid, t in touched.items()]
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        self.flush()
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM sentences").fetchone()[0]
+        return {"sentences": count, "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits, "misses": self.misses}
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+class Glossary:
+    """Сталий переклад термінів (імена, назви технік тощо)."""
+
+    def __init__(self, terms: dict = None):
+        self.terms = {k.strip(): v for k, v in (terms or {}).items() if k.strip() and v}
+        self._lower = {k.lower(): v for k, v in self.terms.items()}
+        self._regex = None
+        if self.terms:
+            # Довші терміни першими: "Sir Arthur" раніше за "Arthur"
+            alternatives = "|".join(re.escape(t) for t in sorted(self.terms, key=len, reverse=True))
+            self._regex = re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+    @classmethod
+    def load(cls, path: str) -> "Glossary":
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return cls(json.load(f))
+            except Exception as e:
+                print(f"⚠️ Помилка читання глосарію {path}: {e}")
+        return cls()
+
+    def __bool__(self):
+        return bool(self.terms)
+
+    def lookup(self, text: str):
+        """Переклад, якщо весь текст — один термін (заголовки, імена окремим рядком)."""
+        return self._lower.get(text.strip().lower())
+
+    def apply(self, text: str) -> str:
+        """Замінює терміни їхнім перекладом перед відправкою перекладачу."""
+        if self._regex is None:
+            return text
+        return self._regex.sub(lambda m: self.terms[m.group(0)], text)
+
+
+_shared_memory = None
+
+
+def get_shared_memory():
+    """Спільна пам'ять перекладів (або None, якщо вимкнено в налаштуваннях)."""
+    global _shared_memory
+    if _shared_memory is None:
+        from .settings import load_settings, data_path
+        settings = load_settings()
+        if not settings["tm_enabled"]:
+            return None
+        _shared_memory = TranslationMemory(
+            data_path(settings["tm_path"]), float(settings["tm_fuzzy_threshold"])
+        )
+    return _shared_memory
+
+
+def close_shared_memory():
+    """Дописує відкладені записи й закриває спільну пам'ять перекладів."""
+    global _shared_memory
+    if _shared_memory is not None:
+        _shared_memory.close()
+        _shared_memory = None
+
+
+def load_glossary() -> Glossary:
+    from .settings import load_settings, data_path
+    return Glossary.load(data_path(load_settings()["glossary_path"]))
@@ -0,0 +1,105 @@
+# modules/novel_browser/metrics.py
+"""
+Легка телеметрія конвеєра перекладу.
+
+Етапи (спани): extract — сегменти з лівої сторінки, parse — каркас,
+segment — кеш/пам'ять/розбиття на речення, translate — один запит до
+перекладача, reassemble — збирання перекладів, render — показ каркаса,
+chapter — уся глава. Плюс лічильники (сегменти з кешу, помилки, повтори).
+
+Запис — perf_counter і append у deque під замком, тож збирати можна завжди.
+Події лишаються в кільцевому буфері й вивантажуються у JSON Lines.
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+STAGES = ("extract", "parse", "segment", "translate", "reassemble", "render", "chapter")
+
+
+class Metrics:
+    """Потокобезпечні спани й лічильники з агрегатами для панелі статистики."""
+
+    def __init__(self, max_events: int = 20000):
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=max_events)
+        self._stages = {}          # етап → [кількість, сума с, максимум с, символи]
+        self._counters = Counter()
+
+    @contextmanager
+    def span(self, stage: str, **attrs):
+        """with metrics.span("parse", job=3) as attrs: ... — attrs можна доповнити всередині."""
+        started = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.record(stage, time.perf_counter() - started, **attrs)
+
+    def record(self, stage: str, seconds: float, **attrs):
+        event = {"ts": round(time.time(), 3), "stage": stage, "ms": round(seconds * 1000, 3), **attrs}
+        with self._lock:
+            self._events.append(event)
+            agg = self._stages.setdefault(stage, [0, 0.0, 0.0, 0])
+            agg[0] += 1
+            agg[1] += seconds
+            agg[2] = max(agg[2], seconds)
+            agg[3] += attrs.get("chars", 0)
+
+    def count(self, name: str, n: int = 1):
+        if n:
+            with self._lock:
+                self._counters[name] += n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {name: list(agg) for name, agg in self._stages.items()}
+            counters = dict(self._counters)
+        result = {}
+        for name in sorted(stages, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)):
+            count, total, peak, chars = stages[name]
+            result[name] = {
+                "count": count,
+                "total_ms": total * 1000,
+                "mean_ms": total * 1000 / count,
+                "max_ms": peak * 1000,
+                "chars": chars,
+                "chars_per_sec": chars / total if chars and total else 0.0,
+            }
+        segments = counters.get("segments", 0)
+        return {
+            "stages": result,
+            "counters": counters,
+            "cache_hit_ratio": counters.get("segments_cached", 0) / segments if segments else 0.0,
+        }
+
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def export_jsonl(self, path: str) -> int:
+        """Дописує події у файл (одна JSON-подія на рядок); повертає їх кількість."""
+        events = self.events()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        return len(events)
+
+    def reset(self):
+        with self._lock:
+            self._events.clear()
+            self._stages.clear()
+            self._counters.clear()
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Спільний збирач метрик процесу."""
+    return _metrics
@@ -0,0 +1,199 @@
+# modules/novel_browser/pipeline.py
+"""
+Конвеєр перекладу HTML глави: розбір → переклад → збирання.
+Без Qt — виконується у фоновому потоці (див. worker.py).
+"""
+import html
+import json
+import re
+import urllib.request
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, NavigableString
+
+from .metrics import get_metrics
+from .translator import SafeTranslator, TranslationCancelled
+
+# Текст у цих тегах не перекладаємо
+SKIP_PARENTS = ['script', 'style', 'head', 'title', 'a']
+
+
+def parse_html(html_content: str) -> BeautifulSoup:
+    try:
+        return BeautifulSoup(html_content, 'lxml')
+    except Exception:
+        return BeautifulSoup(html_content, 'html.parser')
+
+
+def collect_text_nodes(soup: BeautifulSoup):
+    """Повертає (тексти, вузли) — усі текстові вузли, які варто перекладати."""
+    texts, nodes = [], []
+    for node in soup.find_all(string=True):
+        # Ігноруємо текст у <script>, <style>, коментарі та порожні рядки
+        # (ті самі правила, що й у scroll_sync — індекси мають збігатися)
+        if type(node) is not NavigableString or node.parent.name in SKIP_PARENTS:
+            continue
+        text = node.string.strip()
+        if text:
+            texts.append(text)
+            nodes.append(node)
+    return texts, nodes
+
+
+# ──────────────────────────────
+# 📥 Отримання глави (для фонових і пакетних перекладів)
+# ──────────────────────────────
+# Контейнер тексту глави на підтримуваних сайтах (той самий, що в translate_page)
+CONTENT_SELECTOR = '#chapter-content, .cha-words, .chapter-content, .read-content'
+
+_NEXT_TEXT = re.compile(r'^\s*(next|next chapter|наступн\w*|далі|следующ\w*)\b|[→»]\s*$', re.I)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+def fetch_page(url: str, max_bytes: int, timeout: float = 15.0) -> str:
+    """Завантажує сторінку звичайним HTTP-запитом, не більше max_bytes."""
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        data = response.read(max_bytes)
+        charset = response.headers.get_content_charset() or "utf-8"
+    return data.decode(charset, errors="replace")
+
+
+def extract_content_html(page_html: str) -> str:
+    """Повертає HTML контейнера глави (або всього body)."""
+    soup = parse_html(page_html)
+    content = soup.select_one(CONTENT_SELECTOR) or soup.body or soup
+    return content.decode_contents()
+
+
+def find_next_chapter_url(page_html: str, base_url: str) -> str:
+    """Шукає посилання на наступну главу в HTML сторінки."""
+    soup = parse_html(page_html)
+    link = soup.select_one('a[rel="next"], link[rel="next"], a.j_chapterNext')
+    if link is None:
+        for a in soup.find_all("a", href=True):
+            if _NEXT_TEXT.search(a.get_text(" ", strip=True)):
+                link = a
+                break
+    if link is None or not link.get("href"):
+        return ""
+    return urljoin(base_url, link["href"])
+
+
+def build_page(body_html: str, css: str) -> str:
+    """Обгортає вміст у сторінку з темою (#translated-root)."""
+    return f"""
+    <!doctype html>
+    <html>
+    <head>
+        <meta charset='utf-8'>
+        <style id='theme-style'>{css}</style>
+    </head>
+    <body>
+        <div id='translated-root'>{body_html}</div>
+    </body>
+    </html>
+    """
+
+
+def translate_html(html_content: str, translator: SafeTranslator, css: str,
+                   progress=None, cancel=None) -> str:
+    """
+    Парсимо HTML, витягуємо текст, перекладаємо і збираємо HTML назад.
+    Повертає готову сторінку для правого браузера.
+    """
+    metrics = get_metrics()
+    try:
+        with metrics.span("parse"):
+            soup = parse_html(html_content)
+            texts, nodes = collect_text_nodes(soup)
+
+        if not texts:
+            # Це може статися, якщо весь контент - лише картинки
+            return build_page(str(soup), css)
+
+        # translate_batch гарантує відповідність 1:1 з вузлами
+        translated = translator.translate_batch(texts, progress=progress, cancel=cancel)
+
+        # Замінюємо старий текст на новий прямо в 'soup'
+        with metrics.span("reassemble", segments=len(nodes)):
+            for node, translated_text in zip(nodes, translated):
+                node.string.replace_with(translated_text)
+            return build_page(str(soup), css)
+
+    except TranslationCancelled:
+        raise
+    except Exception as e:
+        print(f"❌ Помилка перекладу HTML: {e}. Повертаюсь до старого методу.")
+        # План Б: якщо розбір HTML не вдався, повертаємось до старого методу (лише текст)
+        return translate_plain_text(
+            BeautifulSoup(html_content, 'html.parser'), translator, css, progress, cancel
+        )
+
+
+def translate_plain_text(soup: BeautifulSoup, translator: SafeTranslator, css: str,
+                         progress=None, cancel=None) -> str:
+    """План Б: показати лише текст, але з підтримкою тем."""
+    text = soup.get_text()  # Отримуємо весь текст без HTML
+    translated = translator.translate_large_text(text, progress, cancel)
+
+    paras = [p.strip() for p in translated.split("\n\n") if p.strip()]
+    para_html = ""
+    for p in paras:
+        safe = html.escape(p).replace("\r", "").replace("\n", "<br>")
+        para_html += f"<p>{safe}</p>\n"
+    return build_page(para_html, css)
+
+
+# ──────────────────────────────
+# 📜 Поступовий рендер: спершу те, що видно
+# ──────────────────────────────
+def prepare_skeleton(html_content: str, css: str):
+    """
+    Повертає (сторінка, тексти): оригінальна глава, де кожен текстовий вузол
+    обгорнуто в <span data-tid="N" class="nb-pending"> — у нього потім
+    підставляється переклад без перезавантаження сторінки.
+    """
+    soup = parse_html(html_content)
+    texts, nodes = collect_text_nodes(soup)
+    for i, node in enumerate(nodes):
+        span = soup.new_tag("span", attrs={"data-tid": str(i), "class": "nb-pending"})
+        span.string = texts[i]
+        node.replace_with(span)
+    return build_page(str(soup), css), texts
+
+
+def patch_script(segments: dict) -> str:
+    """JS, що підставляє переклади {індекс: текст} у span-и каркаса правої сторінки."""
+    payload = json.dumps({str(k): v for k, v in segments.items()})
+    return f"""
+        (function(p) {{
+            for (const id in p) {{
+                const el = document.querySelector('[data-tid="' + id + '"]');
+                if (el) {{ el.textContent = p[id]; el.classList.remove('nb-pending'); }}
+            }}
+        }})({payload});
+        """
+
+
+def viewport_order(count: int, focus_ratio: float):
+    """Індекси сегментів, відсортовані за віддаленістю від поточної позиції скролу."""
+    focus = min(max(focus_ratio or 0.0, 0.0), 1.0) * max(count - 1, 0)
+    # Трохи віддаємо перевагу тексту нижче — читач рухається вниз
+    return sorted(range(count), key=lambda i: abs(i - focus) if i >= focus else (focus - i) * 1.5)
+
+
+def translate_progressive(texts, translator: SafeTranslator, on_ready,
+                          focus_ratio=0.0, progress=None, cancel=None):
+    """
+    Перекладає сегменти, починаючи з видимих. on_ready({індекс: переклад})
+    викликається для кожного готового запиту.
+    """
+    translator.translate_batch(
+        texts, order=viewport_order(len(texts), focus_ratio),
+        on_ready=on_ready, progress=progress, cancel=cancel,
+    )
@@ -0,0 +1,137 @@
+# modules/novel_browser/prefetch.py
+"""
+Фонове завантаження і переклад наступних глав.
+Поки читаємо главу N, глави N+1…N+depth уже лежать у кеші перекладів.
+Кожна глава — окрема задача планувальника (scheduler.py).
+"""
+import threading
+import time
+
+from PyQt5.QtCore import QObject
+
+from .cache import get_shared_cache
+from .memory import get_shared_memory, load_glossary
+from .extract import page_texts
+from .pipeline import fetch_page, find_next_chapter_url
+from .scheduler import BATCH, NEXT
+from .translator import ERROR_PREFIX, SafeTranslator
+
+# JS для лівої сторінки: посилання на наступну главу з живого DOM
+NEXT_CHAPTER_JS = """
+(function() {
+    let a = document.querySelector('a[rel="next"], link[rel="next"], a.j_chapterNext, a[class*="next"]');
+    if (a && a.href) return a.href;
+    for (const el of document.querySelectorAll('a[href]')) {
+        if (/^\\s*(next|наступн|далі|следующ)/i.test(el.innerText || '')) return el.href;
+    }
+    return '';
+})();
+"""
+
+CHAPTER_KIND = "chapter"
+
+
+class ChapterTask:
+    """
+    Завантажує й перекладає одну главу; повертає URL наступної.
+    Низький пріоритет потоку ставить планувальник, cooldown — скільки після
+    задачі фоновий слот має відпочити (бюджет CPU).
+    """
+
+    def __init__(self, url: str, settings: dict):
+        self.url = url
+        self.settings = settings
+        self.cooldown = 0.0
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self) -> str:
+        translator = SafeTranslator(source="auto", target="uk", cache=get_shared_cache(),
+                                    memory=get_shared_memory(), glossary=load_glossary())
+        max_bytes = int(self.settings["prefetch_max_page_kb"]) * 1024
+        cpu_share = min(max(float(self.settings["prefetch_cpu_share"]), 0.05), 1.0)
+
+        started = time.thread_time()
+        page_html = fetch_page(self.url, max_bytes)
+        texts = page_texts(page_html)
+        if texts:
+            translated = translator.translate_batch(texts, cancel=self._cancel)
+            failed = sum(1 for t in translated if t.startswith(ERROR_PREFIX))
+            if failed:
+                # Вдалі сегменти вже в кеші — повтор доперекладе лише решту
+                raise RuntimeError(f"не перекладено {failed} з {len(texts)} сегментів")
+        print(f"📥 Наперед перекладено ({len(texts)} сегм.): {self.url}")
+
+        next_url = find_next_chapter_url(page_html, self.url)
+        # 🔋 Бюджет CPU: рахується лише процесорний час потоку (очікування мережі —
+        # безкоштовне), а відпочиває слот у планувальнику, не цей потік
+        self.cooldown = (time.thread_time() - started) * (1 / cpu_share - 1)
+        return next_url
+
+
+class ChapterPrefetcher(QObject):
+    """Ставить наступні глави в чергу планувальника: NEXT — prefetch, BATCH — масово наперед."""
+
+    def __init__(self, settings: dict, scheduler, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.scheduler = scheduler
+        self._seen = set()
+        self._ahead = {}   # URL глави в черзі/в роботі → скільки глав BATCH після неї
+        scheduler.register(CHAPTER_KIND, self._make_task, self._on_chapter_done)
+        scheduler.job_failed.connect(self._on_failed)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.settings["prefetch_enabled"]) and int(self.settings["prefetch_depth"]) > 0
+
+    def _make_task(self, args: dict) -> ChapterTask:
+        return ChapterTask(args["url"], self.settings)
+
+    def _submit(self, url: str, remaining: int, priority: int) -> bool:
+        # Уже перекладені глави пропускає лише prefetch; BATCH іде ланцюжком далі
+        # (перекладена глава береться з кешу, а з неї — посилання на наступну)
+        if not url or priority != BATCH and url in self._seen:
+            return False
+        return self.scheduler.submit(f"{CHAPTER_KIND}:{url}", priority, kind=CHAPTER_KIND,
+                                     args={"url": url, "remaining": remaining})
+
+    def _on_chapter_done(self, job, next_url: str):
+        if len(self._seen) > 500:
+            self._seen.clear()
+        self._seen.add(job.args["url"])
+        # 🔗 Ланцюжок: наступна глава з тим самим пріоритетом
+        remaining, priority = int(job.args.get("remaining", 0)), job.priority
+        ahead = self._ahead.pop(job.args["url"], 0)
+        if ahead > remaining:
+            remaining, priority = ahead, BATCH
+        if remaining > 0:
+            self._submit(next_url, remaining - 1, priority)
+
+    def _on_failed(self, key: str, error: str):
+        if key.startswith(f"{CHAPTER_KIND}:"):
+            print(f"⚠️ Prefetch {key[len(CHAPTER_KIND) + 1:]}: {error}")
+
+    def prefetch(self, next_url: str):
+        """Ставить у чергу глави, починаючи з next_url (замість ланцюжка попередньої глави)."""
+        if not self.enabled or not next_url:
+            return
+        job = self.scheduler.job(f"{CHAPTER_KIND}:{next_url}")
+        if job is not None and job.priority == NEXT and not job.cancelled:
+            return  # цю главу вже завантажуємо — не скасовуємо її саму
+        self.cancel()
+        self._submit(next_url, int(self.settings["prefetch_depth"]) - 1, NEXT)
+
+    def queue_ahead(self, next_url: str, count: int) -> bool:
+        """Масовий переклад count глав наперед — лише на вільних потоках. True — щось поставлено."""
+        if count <= 0 or not next_url:
+            return False
+        if not self._submit(next_url, count - 1, BATCH):
+            # Глава вже в черзі чи перекладається — ланцюжок продовжиться після неї
+            self._ahead[next_url] = max(self._ahead.get(next_url, 0), count - 1)
+        return True
+
+    def cancel(self):
+        self.scheduler.cancel_priority(NEXT)
@@ -0,0 +1,94 @@
+# modules/novel_browser/profile.py
+"""
+Окремий іменований профіль QtWebEngine для Novel Browser.
+
+На відміну від defaultProfile(), він зберігає HTTP-кеш і cookies на диску
+(cache/web_profile), тож після перезапуску скрипти, шрифти й картинки сайтів
+беруться локально, а вхід на сайт не злітає.
+"""
+import os
+
+from PyQt5.QtCore import QObject, QUrl, pyqtSignal
+from PyQt5.QtWebEngineWidgets import QWebEnginePage, QWebEngineProfile
+
+from .settings import data_path, load_settings
+
+PROFILE_NAME = "novel_browser"
+
+_profile = None
+
+
+def get_profile() -> QWebEngineProfile:
+    """
+    Профіль живе весь час роботи програми (без батька): сторінки, що його
+    використовують, мають бути видалені раніше за нього.
+    """
+    global _profile
+    if _profile is None:
+        settings = load_settings()
+        root = data_path(settings["profile_path"])
+        _profile = QWebEngineProfile(PROFILE_NAME)
+        _profile.setPersistentStoragePath(os.path.join(root, "storage"))
+        _profile.setCachePath(os.path.join(root, "cache"))
+        _profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        _profile.setHttpCacheMaximumSize(int(settings["profile_cache_mb"]) * 1024 * 1024)
+        _profile.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies)
+    return _profile
+
+
+def folder_size(path: str):
+    """(байти, кількість файлів) у теці."""
+    total = files = 0
+    for root, _dirs, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+                files += 1
+            except OSError:
+                pass
+    return total, files
+
+
+def cache_stats(profile: QWebEngineProfile) -> dict:
+    size, files = folder_size(profile.cachePath())
+    return {
+        "cache_path": profile.cachePath(),
+        "cache_bytes": size,
+        "cache_files": files,
+        "cache_limit": profile.httpCacheMaximumSize(),
+        "storage_path": profile.persistentStoragePath(),
+    }
+
+
+class CacheWarmer(QObject):
+    """Послідовно завантажує сторінки у прихованій сторінці, щоб наповнити дисковий кеш."""
+    progress = pyqtSignal(int, int, str)   # готово, усього, url
+    finished = pyqtSignal()
+
+    def __init__(self, profile: QWebEngineProfile, urls, parent=None):
+        super().__init__(parent)
+        self.urls = [u for u in urls if u]
+        self._index = 0
+        self._page = QWebEnginePage(profile, self)
+        self._page.loadFinished.connect(self._next)
+
+    def start(self):
+        self._index = 0
+        self._load()
+
+    def stop(self):
+        self._index = len(self.urls)
+        self._page.triggerAction(QWebEnginePage.Stop)
+
+    def _load(self):
+        if self._index >= len(self.urls):
+            self.finished.emit()
+            return
+        self._page.load(QUrl(self.urls[self._index]))
+
+    def _next(self, _ok: bool):
+        if self._index >= len(self.urls):
+            return
+        self._index += 1
+        self.progress.emit(self._index, len(self.urls), self.urls[self._index - 1])
+        self._load()
@@ -0,0 +1,98 @@
+# modules/novel_browser/profile_view.py
+"""Панель профілю браузера: статистика дискового кешу і його прогрівання."""
+from PyQt5.QtWidgets import (
+    QDialog, QHBoxLayout, QLabel, QPlainTextEdit, QPushButton, QVBoxLayout,
+)
+
+from .profile import CacheWarmer, cache_stats
+from .settings import load_settings, save_settings
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} МБ"
+
+
+class ProfileDialog(QDialog):
+    def __init__(self, profile, current_url: str = "", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("🗄️ Кеш браузера")
+        self.resize(560, 420)
+        self.profile = profile
+        self.current_url = current_url
+        self.warmer = None
+
+        layout = QVBoxLayout(self)
+        self.stats_label = QLabel()
+        self.stats_label.setWordWrap(True)
+        layout.addWidget(self.stats_label)
+
+        layout.addWidget(QLabel("Сторінки для прогрівання кешу (по одній на рядок):"))
+        self.urls_edit = QPlainTextEdit("\n".join(load_settings()["profile_warmup_urls"]))
+        layout.addWidget(self.urls_edit)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+        buttons = QHBoxLayout()
+        self.btn_add = QPushButton("➕ Поточна сторінка")
+        self.btn_add.clicked.connect(self._add_current)
+        self.btn_add.setEnabled(bool(current_url))
+        self.btn_warm = QPushButton("🔥 Прогріти")
+        self.btn_warm.clicked.connect(self._warm)
+        self.btn_clear = QPushButton("🧹 Очистити кеш")
+        self.btn_clear.clicked.connect(self._clear)
+        self.btn_close = QPushButton("Закрити")
+        self.btn_close.clicked.connect(self.accept)
+        for button in (self.btn_add, self.btn_warm, self.btn_clear):
+            buttons.addWidget(button)
+        buttons.addStretch()
+        buttons.addWidget(self.btn_close)
+        layout.addLayout(buttons)
+
+        self._update_stats()
+
+    def _urls(self):
+        return [line.strip() for line in self.urls_edit.toPlainText().splitlines() if line.strip()]
+
+    def _update_stats(self):
+        stats = cache_stats(self.profile)
+        self.stats_label.setText(
+            f"Кеш: {_mb(stats['cache_bytes'])} з {_mb(stats['cache_limit'])}, "
+            f"файлів: {stats['cache_files']}\n"
+            f"Тека кешу: {stats['cache_path']}\n"
+            f"Cookies і сховище: {stats['storage_path']}"
+        )
+
+    def _add_current(self):
+        if self.current_url and self.current_url not in self._urls():
+            self.urls_edit.appendPlainText(self.current_url)
+
+    def _warm(self):
+        urls = self._urls()
+        if not urls:
+            return
+        self.btn_warm.setEnabled(False)
+        self.warmer = CacheWarmer(self.profile, urls, self)
+        self.warmer.progress.connect(
+            lambda done, total, url: self.status.setText(f"🔥 {done}/{total}: {url}")
+        )
+        self.warmer.finished.connect(self._on_warmed)
+        self.warmer.start()
+
+    def _on_warmed(self):
+        self.btn_warm.setEnabled(True)
+        self.status.setText("✅ Кеш прогріто.")
+        self._update_stats()
+
+    def _clear(self):
+        self.profile.clearHttpCache()
+        self.status.setText("🧹 Кеш очищено.")
+        self._update_stats()
+
+    def done(self, result):
+        if self.warmer:
+            self.warmer.stop()
+        settings = load_settings()
+        if settings["profile_warmup_urls"] != self._urls():
+            save_settings({"profile_warmup_urls": self._urls()})
+        super().done(result)
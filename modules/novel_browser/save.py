@@ -1,5 +1,9 @@
+import hashlib
+import json
 import os
 import re
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 from docx import Document
 from docx.shared import Pt
@@ -44,24 +48,108 @@ def _extract_chapter_title(text: str) -> str:
     return first_line or "Без назви глави"
 
 
-def save_translated_chapter(novel_name: str, chapter_title: str, text: str) -> str:
-    """
-    Зберігає перекладену главу у форматі .docx у теку 'saved_novels'.
-    Назва файлу: <chapter_title>_<дата>.docx
-    """
-    folder = os.path.join(os.getcwd(), "saved_novels")
-    os.makedirs(folder, exist_ok=True)
-
-    # Якщо не передано назву глави — намагаємось знайти її в тексті
-    if not chapter_title or chapter_title.strip() in ["", "Без назви глави"]:
-        chapter_title = _extract_chapter_title(text)
-
-    safe_chapter = (chapter_title or "Без назви глави").strip()
-
-    # Використовуємо тільки назву глави для файлу
-    filename = f"{_safe_filename(safe_chapter)}_{datetime.now().strftime('%Y-%m-%d_%H-%M')}.docx"
-    path = os.path.join(folder, filename)
-
+# ──────────────────────────────
+# 🧬 Версії глав (дедуплікація за вмістом)
+# ──────────────────────────────
+VERSIONS_FILE = ".versions.json"
+
+
+def content_hash(novel_name: str, chapter_title: str, text: str) -> str:
+    """Хеш нормалізованого тексту: пробіли й порожні рядки не створюють нову версію."""
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    normalized = "\n".join(line for line in lines if line)
+    data = f"{(novel_name or '').strip()}\x00{chapter_title.strip()}\x00{normalized}"
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def load_versions(folder: str) -> dict:
+    """{ключ глави: [{"hash", "file", "saved"}, …]} — від найстарішої версії до найновішої."""
+    path = os.path.join(folder, VERSIONS_FILE)
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Помилка читання {VERSIONS_FILE}: {e}")
+    return {}
+
+
+def _save_versions(folder: str, versions: dict):
+    # Атомарно й з унікальним тимчасовим файлом: обірваний запис не зіпсує список
+    # версій, а паралельні процеси (batch.py) не переписують чужий .tmp
+    path = os.path.join(folder, VERSIONS_FILE)
+    fd, tmp = tempfile.mkstemp(prefix=VERSIONS_FILE + ".", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(versions, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def _versions_lock(folder: str):
+    """Міжпроцесний замок на список версій теки (читання → зміна → запис)."""
+    with open(os.path.join(folder, VERSIONS_FILE + ".lock"), "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK здається після ~10 с — чекаємо далі
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _record_version(folder: str, key: str, entry: dict):
+    """Дописує версію до свіжопрочитаного списку (під замком); видалені файли випадають."""
+    versions = load_versions(folder)
+    history = [v for v in versions.get(key, []) if os.path.exists(os.path.join(folder, v["file"]))]
+    versions[key] = history + [entry]
+    _save_versions(folder, versions)
+
+
+def _unique_path(path: str) -> str:
+    """Інша глава, збережена в ту саму хвилину, не перезаписує файл."""
+    base, ext = os.path.splitext(path)
+    n = 2
+    while os.path.exists(path):
+        path = f"{base}_{n}{ext}"
+        n += 1
+    return path
+
+
+def _latest_version(folder: str, key: str, digest: str):
+    """Шлях до останньої версії глави, якщо її текст не змінився (під замком)."""
+    history = [v for v in load_versions(folder).get(key, []) if os.path.exists(os.path.join(folder, v["file"]))]
+    if history and history[-1]["hash"] == digest:
+        return os.path.join(folder, history[-1]["file"])
+    return None
+
+
+def _version_entry(digest: str, path: str) -> dict:
+    return {"hash": digest, "file": os.path.basename(path),
+            "saved": datetime.now().isoformat(timespec="seconds")}
+
+
+def _build_document(novel_name: str, safe_chapter: str, text: str) -> Document:
     # Створення документа
     doc = Document()
     
@@ -71,6 +159,10 @@ def save_translated_chapter(novel_name: str, chapter_title: str, text: str) -> s
     else:
         full_title = safe_chapter
         
+    # Метадані для каталогу бібліотеки (library.py) — без розбору заголовка
+    doc.core_properties.title = (novel_name or "").strip()
+    doc.core_properties.subject = safe_chapter
+
     doc.add_heading(full_title, level=1)
     doc.add_paragraph(f"Збережено: {datetime.now().strftime('%d.%m.%Y %H:%M')}")
     doc.add_paragraph("")
@@ -83,6 +175,66 @@ def save_translated_chapter(novel_name: str, chapter_title: str, text: str) -> s
 
     for p in paragraphs:
         doc.add_paragraph(p)
+    return doc
+
+
+def save_translated_chapter(novel_name: str, chapter_title: str, text: str, folder: str = None) -> str:
+    """
+    Зберігає перекладену главу у форматі .docx у теку 'saved_novels' (або folder).
+    Назва файлу: <chapter_title>_<дата>.docx
+
+    Якщо текст глави не змінився з останнього збереження — файл не пишеться,
+    повертається шлях до наявного; якщо збігся зі старішою версією —
+    новий файл стає жорстким посиланням на неї.
+    """
+    folder = folder or os.path.join(os.getcwd(), "saved_novels")
+    os.makedirs(folder, exist_ok=True)
+
+    # Якщо не передано назву глави — намагаємось знайти її в тексті
+    if not chapter_title or chapter_title.strip() in ["", "Без назви глави"]:
+        chapter_title = _extract_chapter_title(text)
+
+    safe_chapter = (chapter_title or "Без назви глави").strip()
+
+    digest = content_hash(novel_name, safe_chapter, text)
+    key = f"{(novel_name or '').strip()} - {safe_chapter}"
+    # Використовуємо тільки назву глави для файлу
+    filename = f"{_safe_filename(safe_chapter)}_{datetime.now().strftime('%Y-%m-%d_%H-%M')}.docx"
 
-    doc.save(path)
-    return path
\ No newline at end of file
+    # Під замком лише швидкі частини: перевірка версій і вибір імені файлу —
+    # .docx будується поза ним, тож паралельні процеси не чекають один одного
+    with _versions_lock(folder):
+        existing = _latest_version(folder, key, digest)
+        if existing:
+            return existing
+
+        # Повернулися до старішої версії — посилання замість повторного експорту
+        same = next((v for v in load_versions(folder).get(key, []) if v["hash"] == digest
+                     and os.path.exists(os.path.join(folder, v["file"]))), None)
+        if same:
+            path = _unique_path(os.path.join(folder, filename))
+            try:
+                os.link(os.path.join(folder, same["file"]), path)
+                _record_version(folder, key, _version_entry(digest, path))
+                return path
+            except OSError:
+                pass  # ФС без жорстких посилань — просто пишемо файл
+
+    # Документ пишемо в тимчасовий файл: обірване збереження не лишить
+    # під справжнім ім'ям порожній чи недописаний .docx
+    fd, tmp = tempfile.mkstemp(prefix=".", suffix=".docx.tmp", dir=folder)
+    os.close(fd)
+    try:
+        _build_document(novel_name, safe_chapter, text).save(tmp)
+        with _versions_lock(folder):
+            # Поки будували, ту саму главу міг зберегти інший процес
+            existing = _latest_version(folder, key, digest)
+            if existing:
+                return existing
+            path = _unique_path(os.path.join(folder, filename))
+            os.replace(tmp, path)
+            _record_version(folder, key, _version_entry(digest, path))
+        return path
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
\ No newline at end of file
@@ -0,0 +1,294 @@
+# modules/novel_browser/scheduler.py
+"""
+Планувальник перекладів з класами пріоритету.
+
+  VISIBLE — глава, яку читають зараз (ніколи не чекає на фонові задачі);
+  NEXT    — наступні глави (prefetch);
+  BATCH   — масовий переклад наперед, забирає лише вільні потоки.
+
+Однакові задачі (той самий ключ) не дублюються, невдалі повторюються
+з експоненційною затримкою, а черга фонових задач зберігається на диск
+і відновлюється після перезапуску. Фонові задачі виконуються з найнижчим
+пріоритетом потоку; якщо задача виставила cooldown (секунди), її слот
+після завершення стільки відпочиває, не займаючи потік пулу.
+"""
+import json
+import os
+import random
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, QThread, QThreadPool, QTimer, pyqtSignal
+
+from .metrics import get_metrics
+from .translator import TranslationCancelled
+
+VISIBLE, NEXT, BATCH = 0, 1, 2
+PRIORITY_NAMES = {VISIBLE: "visible", NEXT: "next", BATCH: "batch"}
+
+
+class Job:
+    """
+    Задача в черзі. Або task (об'єкт з run()/cancel(), живе лише в пам'яті),
+    або kind + args (будується фабрикою і переживає перезапуск).
+    """
+
+    def __init__(self, key: str, priority: int, task=None, kind: str = None, args: dict = None,
+                 attempts: int = 0, not_before: float = 0.0):
+        self.key = key
+        self.priority = priority
+        self.task = task
+        self.kind = kind
+        self.args = args or {}
+        self.attempts = attempts
+        self.not_before = not_before
+        self.seq = 0
+        self.cancelled = False
+
+    @property
+    def persistent(self) -> bool:
+        return self.kind is not None
+
+    def to_dict(self) -> dict:
+        return {"key": self.key, "priority": self.priority, "kind": self.kind,
+                "args": self.args, "attempts": self.attempts}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        return cls(data["key"], int(data["priority"]), kind=data["kind"],
+                   args=data.get("args") or {}, attempts=int(data.get("attempts", 0)))
+
+
+class _JobSignals(QObject):
+    done = pyqtSignal(object, object, object)   # job, результат, помилка (None — успіх)
+
+
+class _JobRunner(QRunnable):
+    def __init__(self, job: Job, signals: _JobSignals):
+        super().__init__()
+        self.job = job
+        self.signals = signals
+
+    def run(self):
+        # Потік пулу спільний для всіх класів — пріоритет повертається після задачі
+        thread = QThread.currentThread()
+        previous = thread.priority()
+        thread.setPriority(QThread.NormalPriority if self.job.priority == VISIBLE
+                           else QThread.LowestPriority)
+        try:
+            result = self.job.task.run()
+        except Exception as e:
+            self.signals.done.emit(self.job, None, e)
+            return
+        finally:
+            thread.setPriority(QThread.NormalPriority if previous == QThread.InheritPriority
+                               else previous)
+        self.signals.done.emit(self.job, result, None)
+
+
+class TranslationScheduler(QObject):
+    """Уся логіка черги — у GUI-потоці; у пулі виконується лише task.run()."""
+    job_finished = pyqtSignal(str, object)   # ключ, результат
+    job_failed = pyqtSignal(str, str)        # ключ, помилка (спроби вичерпано)
+    queue_changed = pyqtSignal(int, int)     # у черзі, виконується
+
+    def __init__(self, state_path: str, workers: int = 2, max_attempts: int = 5,
+                 base_delay: float = 2.0, parent=None):
+        super().__init__(parent)
+        self.state_path = state_path
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        # Фонові задачі займають не більше `workers` потоків; ще два — для
+        # видимої глави (нова + скасована, що доробляє поточний запит)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.workers + 2)
+        self._factories = {}   # kind → (factory(args) → task, on_result(job, result) або None)
+        self._pending = {}     # ключ → Job
+        self._running = {}     # ключ → Job
+        self._resting = []     # коли звільняться фонові слоти, що відпочивають після cooldown
+        self._seq = 0
+        self._closed = False
+        self._signals = _JobSignals()
+        self._signals.done.connect(self._on_done)
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._save)
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self._dispatch)
+        self._load()
+
+    # ──────────────────────────────
+    # 📥 Постановка задач
+    # ──────────────────────────────
+    def register(self, kind: str, factory, on_result=None):
+        """Фабрика задач для збережуваних задач типу kind."""
+        self._factories[kind] = (factory, on_result)
+        self._dispatch()
+
+    def submit(self, key: str, priority: int, task=None, kind: str = None, args: dict = None) -> bool:
+        """
+        Ставить задачу в чергу. Якщо така вже чекає — лише підвищує пріоритет;
+        якщо вже виконується — нічого не робить. Повертає True для нової задачі.
+        """
+        if key in self._running:
+            return False
+        existing = self._pending.get(key)
+        if existing:
+            if priority < existing.priority:
+                existing.priority = priority
+                self._changed()
+            return False
+        job = Job(key, priority, task=task, kind=kind, args=args)
+        self._seq += 1
+        job.seq = self._seq
+        self._pending[key] = job
+        self._changed()
+        return True
+
+    def cancel(self, key: str):
+        job = self._pending.pop(key, None) or self._running.get(key)
+        if job:
+            job.cancelled = True
+            if job.task is not None and hasattr(job.task, "cancel"):
+                job.task.cancel()
+            self._changed()
+
+    def cancel_priority(self, priority: int):
+        """Скасовує всі задачі класу (напр., prefetch старої глави)."""
+        for key in [k for k, j in {**self._pending, **self._running}.items() if j.priority == priority]:
+            self.cancel(key)
+
+    def job(self, key: str):
+        """Задача в черзі чи в роботі (None — немає)."""
+        return self._pending.get(key) or self._running.get(key)
+
+    def counts(self) -> dict:
+        counts = {name: 0 for name in PRIORITY_NAMES.values()}
+        for job in self._pending.values():
+            counts[PRIORITY_NAMES[job.priority]] += 1
+        return {"pending": len(self._pending), "running": len(self._running), **counts}
+
+    # ──────────────────────────────
+    # ⚙️ Диспетчеризація
+    # ──────────────────────────────
+    def _changed(self):
+        self._save_timer.start()
+        self._dispatch()
+
+    def _can_start(self, job: Job, visible_busy: bool, background_running: int) -> bool:
+        if job.priority == VISIBLE:
+            return True
+        # Фонові — лише коли видима глава не перекладається, і в межах workers
+        return not visible_busy and background_running < self.workers
+
+    def _dispatch(self):
+        now = time.monotonic()
+        visible_busy = any(j.priority == VISIBLE for j in self._running.values()) or \
+            any(j.priority == VISIBLE for j in self._pending.values())
+        # 🔋 Слот, що відпочиває після задачі з cooldown, рахується зайнятим
+        self._resting = [until for until in self._resting if until > now]
+        background_running = sum(1 for j in self._running.values() if j.priority != VISIBLE) + \
+            len(self._resting)
+        next_retry = min(self._resting) if self._resting else None
+
+        for job in sorted(self._pending.values(), key=lambda j: (j.priority, j.seq)):
+            if job.not_before > now:
+                next_retry = min(next_retry or job.not_before, job.not_before)
+                continue
+            if job.persistent and job.kind not in self._factories:
+                continue  # фабрику ще не зареєстровано — чекаємо
+            if not self._can_start(job, visible_busy, background_running):
+                continue
+            if job.persistent:
+                try:
+                    job.task = self._factories[job.kind][0](job.args)
+                except Exception as e:
+                    print(f"⚠️ Планувальник: не вдалося створити задачу {job.key}: {e}")
+                    del self._pending[job.key]
+                    continue
+            del self._pending[job.key]
+            self._running[job.key] = job
+            if job.priority != VISIBLE:
+                background_running += 1
+            self.pool.start(_JobRunner(job, self._signals))
+
+        if next_retry is not None:
+            self._retry_timer.start(max(0, int((next_retry - now) * 1000)))
+        self.queue_changed.emit(len(self._pending), len(self._running))
+
+    def _on_done(self, job: Job, result, error):
+        if self._closed:
+            return  # черга вже збережена разом із цією задачею
+        self._running.pop(job.key, None)
+        cooldown = getattr(job.task, "cooldown", 0) or 0
+        if job.priority != VISIBLE and cooldown > 0:
+            self._resting.append(time.monotonic() + cooldown)
+        if job.persistent:
+            job.task = None  # задача буде створена заново при повторі
+        if error is None:
+            self.job_finished.emit(job.key, result)
+            on_result = self._factories.get(job.kind, (None, None))[1] if job.persistent else None
+            if on_result and not job.cancelled:
+                on_result(job, result)
+        elif isinstance(error, TranslationCancelled) or job.cancelled:
+            pass
+        elif job.attempts + 1 < self.max_attempts and job.key not in self._pending:
+            # 🔁 Експоненційна затримка з невеликим розкидом
+            job.attempts += 1
+            delay = self.base_delay * (2 ** (job.attempts - 1)) * random.uniform(0.8, 1.2)
+            job.not_before = time.monotonic() + delay
+            self._pending[job.key] = job
+            get_metrics().count("job_retries")
+            print(f"🔁 {job.key}: спроба {job.attempts + 1} через {delay:.1f} с ({error})")
+        else:
+            get_metrics().count("jobs_failed")
+            self.job_failed.emit(job.key, str(error))
+        self._changed()
+
+    # ──────────────────────────────
+    # 💾 Збереження черги
+    # ──────────────────────────────
+    def _save(self):
+        jobs = [j.to_dict() for j in list(self._running.values()) + list(self._pending.values())
+                if j.persistent and not j.cancelled]
+        try:
+            folder = os.path.dirname(self.state_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            tmp = self.state_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"jobs": jobs}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.state_path)
+        except OSError as e:
+            print(f"⚠️ Не вдалося зберегти чергу перекладів: {e}")
+
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for item in data.get("jobs", []):
+                job = Job.from_dict(item)
+                self._seq += 1
+                job.seq = self._seq
+                self._pending[job.key] = job
+        except Exception as e:
+            print(f"⚠️ Черга перекладів пошкоджена ({e}), починаю з порожньої.")
+            return
+        if self._pending:
+            print(f"📋 Відновлено {len(self._pending)} задач перекладу.")
+
+    def shutdown(self, msecs: int = 3000):
+        """Зберігає чергу і скасовує фонові задачі (вони відновляться після запуску)."""
+        self._closed = True
+        self._save_timer.stop()
+        self._retry_timer.stop()
+        self._save()
+        for job in self._running.values():
+            if job.task is not None and hasattr(job.task, "cancel"):
+                job.task.cancel()
+        self.pool.waitForDone(msecs)
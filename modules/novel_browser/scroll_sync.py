@@ -0,0 +1,127 @@
+# modules/novel_browser/scroll_sync.py
+"""
+Синхронізація скролу за подіями: ліва сторінка сама повідомляє про скрол
+через QWebChannel (замість опитування таймером), а права прокручується
+до того самого абзацу — за відповідністю «вузол оригіналу ↔ data-tid перекладу».
+"""
+from PyQt5.QtCore import QFile, QIODevice, QObject, pyqtSignal, pyqtSlot
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtWebEngineWidgets import QWebEngineScript
+
+# Як часто сторінка може надсилати події скролу (мс)
+THROTTLE_MS = 60
+
+# Ті самі правила, що й pipeline.collect_text_nodes — індекси мають збігатися з data-tid
+_REPORTER_JS = """
+(function() {
+    if (window.__nbScrollInstalled) return;
+    window.__nbScrollInstalled = true;
+
+    const SKIP = new Set(['SCRIPT', 'STYLE', 'HEAD', 'TITLE', 'A']);
+    let nodes = [];
+
+    // Викликається екстрактором тексту (extract.py) — повертає ті самі вузли
+    window.__nbIndexNodes = function(root) {
+        nodes = [];
+        const walker = document.createTreeWalker(root || document.body, NodeFilter.SHOW_TEXT);
+        for (let n = walker.nextNode(); n; n = walker.nextNode()) {
+            if (n.parentElement && !SKIP.has(n.parentElement.tagName) && n.nodeValue.trim()) {
+                nodes.push(n);
+            }
+        }
+        return nodes;
+    };
+
+    function rectOf(node) {
+        const range = document.createRange();
+        range.selectNodeContents(node);
+        return range.getBoundingClientRect();
+    }
+
+    // Перший вузол, що перетинає верх вікна (бінарний пошук — вузли йдуть згори донизу)
+    function anchor() {
+        let lo = 0, hi = nodes.length - 1, found = -1;
+        while (lo <= hi) {
+            const mid = (lo + hi) >> 1;
+            const r = rectOf(nodes[mid]);
+            if (r.bottom > 0) { found = mid; hi = mid - 1; } else { lo = mid + 1; }
+        }
+        if (found < 0 || !nodes[found].isConnected) return [-1, 0];
+        const r = rectOf(nodes[found]);
+        const offset = r.height > 0 ? Math.min(Math.max(-r.top / r.height, 0), 1) : 0;
+        return [found, offset];
+    }
+
+    function ratio() {
+        const doc = document.scrollingElement || document.body;
+        const height = doc.scrollHeight - doc.clientHeight;
+        return height > 0 ? doc.scrollTop / height : 0;
+    }
+
+    new QWebChannel(qt.webChannelTransport, function(channel) {
+        const bridge = channel.objects.scrollBridge;
+        let scheduled = false, last = 0;
+        function send() {
+            scheduled = false;
+            last = Date.now();
+            const a = anchor();
+            bridge.report(a[0], a[1], ratio());
+        }
+        window.addEventListener('scroll', function() {
+            if (scheduled) return;
+            scheduled = true;
+            const wait = Math.max(0, %(throttle)d - (Date.now() - last));
+            setTimeout(function() { requestAnimationFrame(send); }, wait);
+        }, {passive: true});
+        window.__nbReportScroll = send;
+    });
+})();
+"""
+
+# Прокручування правої сторінки: до абзацу, якщо він є, інакше — за часткою
+APPLY_JS = """
+(function(id, offset, ratio) {
+    const doc = document.scrollingElement || document.body;
+    const el = id >= 0 ? document.querySelector('[data-tid="' + id + '"]') : null;
+    if (el) {
+        const r = el.getBoundingClientRect();
+        doc.scrollTop += r.top + r.height * offset;
+    } else {
+        doc.scrollTop = (doc.scrollHeight - doc.clientHeight) * ratio;
+    }
+})(%d, %f, %f);
+"""
+
+
+def _qwebchannel_source() -> str:
+    f = QFile(":/qtwebchannel/qwebchannel.js")
+    if not f.open(QIODevice.ReadOnly):
+        return ""
+    source = bytes(f.readAll()).decode("utf-8")
+    f.close()
+    return source
+
+
+class ScrollBridge(QObject):
+    """Об'єкт, доступний сторінці як channel.objects.scrollBridge."""
+    scrolled = pyqtSignal(int, float, float)   # індекс вузла, зсув у ньому (0..1), частка сторінки
+
+    @pyqtSlot(int, float, float)
+    def report(self, anchor: int, offset: float, ratio: float):
+        self.scrolled.emit(anchor, offset, ratio)
+
+
+def install_scroll_reporter(page, bridge: ScrollBridge) -> QWebChannel:
+    """Підключає bridge до сторінки й вбудовує скрипт-репортер в ізольований світ."""
+    channel = QWebChannel(page)
+    channel.registerObject("scrollBridge", bridge)
+    page.setWebChannel(channel, QWebEngineScript.ApplicationWorld)
+
+    script = QWebEngineScript()
+    script.setName("nb-scroll-reporter")
+    script.setSourceCode(_qwebchannel_source() + _REPORTER_JS % {"throttle": THROTTLE_MS})
+    script.setWorldId(QWebEngineScript.ApplicationWorld)
+    script.setInjectionPoint(QWebEngineScript.DocumentReady)
+    script.setRunsOnSubFrames(False)
+    page.scripts().insert(script)
+    return channel
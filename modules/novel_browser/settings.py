@@ -0,0 +1,61 @@
+# modules/novel_browser/settings.py
+import os
+
+from core.config_store import get_config_store
+
+SETTINGS_FILE = os.path.join("config", "novel_browser.json")
+
+DEFAULTS = {
+    # 🗄️ Кеш перекладів
+    "cache_path": os.path.join("cache", "translations.sqlite3"),
+    "cache_max_mb": 64,
+    # ⚡ Переклад: паралельні запити і ліміт частоти (запитів/с)
+    "translate_concurrency": 4,
+    "translate_rate": 4.0,
+    # 📥 Наперед перекладати наступні глави
+    "prefetch_enabled": True,
+    "prefetch_depth": 1,            # скільки глав уперед
+    "prefetch_max_page_kb": 2048,   # ліміт розміру сторінки (пам'ять)
+    "prefetch_cpu_share": 0.25,     # частка процесорного часу, яку може займати фонова робота
+    # 🧵 Черга перекладів: фонові потоки, збережена черга, «перекласти наперед»
+    "scheduler_workers": 2,
+    "queue_path": os.path.join("cache", "translation_queue.json"),
+    "batch_ahead_chapters": 10,
+    # 🛡️ Блокування реклами: домени (з піддоменами) або шаблони шляху з "/"
+    "adblock_rules": ["googlesyndication.com", "doubleclick.net", "adservice.google.com", "/tracking"],
+    "adblock_request_log": "",      # шлях для запису URL-ів (для bench/adblock.py)
+    "adblock_filter_dir": os.path.join("config", "filters"),   # списки EasyList/ABP (*.txt)
+    "adblock_cache": os.path.join("cache", "adblock_filters.bin"),
+    # 🧠 Пам'ять перекладів (речення) і глосарій імен {"термін": "переклад"}
+    "tm_enabled": True,
+    "tm_path": os.path.join("cache", "memory.sqlite3"),
+    "tm_fuzzy_threshold": 0.95,     # схожість (0..1) для «майже точного» збігу
+    "glossary_path": os.path.join("config", "glossary.json"),
+    # 🌐 Профіль браузера: дисковий HTTP-кеш і cookies між запусками
+    "profile_path": os.path.join("cache", "web_profile"),
+    "profile_cache_mb": 512,
+    "profile_warmup_urls": ["https://www.webnovel.com/"],
+    # 📚 Бібліотека збережених глав
+    "library_folder": "saved_novels",
+    "library_index": os.path.join("cache", "library.sqlite3"),
+}
+
+
+def data_path(*parts) -> str:
+    """Шлях до файлу даних модуля (відносно робочої теки, як і saved_novels)."""
+    return os.path.join(os.getcwd(), *parts)
+
+
+def _section():
+    # Як і інші налаштування — у config/ теки програми (кеші й saved_novels — у робочій теці)
+    return get_config_store().section("novel_browser", SETTINGS_FILE, defaults=DEFAULTS)
+
+
+def load_settings() -> dict:
+    """Повертає налаштування Novel Browser зі значеннями за замовчуванням (з пам'яті)."""
+    return _section().data()
+
+
+def save_settings(updates: dict):
+    """Змінює ключі; файл (лише задані ключі) записується відкладено, атомарно й у фоні."""
+    _section().update(updates)
@@ -0,0 +1,113 @@
+# modules/novel_browser/stats_view.py
+"""Панель статистики: час етапів конвеєра, кеш, швидкість і помилки (metrics.py)."""
+import os
+from datetime import datetime
+
+from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtWidgets import (
+    QDialog, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QVBoxLayout,
+)
+
+from .metrics import get_metrics
+
+_HEADERS = ("Етап", "Разів", "Сер., мс", "Макс., мс", "Усього, с", "Символів/с")
+
+# Підписи лічильників (решта показується під своєю назвою)
+_COUNTER_NAMES = {
+    "segments": "сегментів",
+    "segments_cached": "з кешу",
+    "units_sent": "до перекладача",
+    "request_errors": "помилок запитів",
+    "retries": "повторів",
+    "throttled": "обмежень частоти",
+    "bisects": "поділів запиту",
+    "chapters_failed": "невдалих глав",
+    "job_retries": "повторів задач",
+    "jobs_failed": "невдалих задач",
+}
+
+
+class StatsDialog(QDialog):
+    """Оновлюється раз на секунду, поки відкрита; sources() — додаткові рядки (кеш, черга)."""
+
+    def __init__(self, sources=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("📊 Статистика перекладу")
+        self.resize(640, 420)
+        self.metrics = get_metrics()
+        self.sources = sources
+
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(_HEADERS))
+        self.table.setHorizontalHeaderLabels(_HEADERS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        self.summary = QLabel()
+        self.summary.setWordWrap(True)
+        self.summary.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.summary)
+
+        buttons = QHBoxLayout()
+        self.btn_export = QPushButton("📤 Експорт JSONL")
+        self.btn_export.clicked.connect(self._export)
+        self.btn_reset = QPushButton("🧹 Скинути")
+        self.btn_reset.clicked.connect(self._reset)
+        self.btn_close = QPushButton("Закрити")
+        self.btn_close.clicked.connect(self.accept)
+        buttons.addWidget(self.btn_export)
+        buttons.addWidget(self.btn_reset)
+        buttons.addStretch()
+        buttons.addWidget(self.btn_close)
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+        self.refresh()
+
+    def refresh(self):
+        snapshot = self.metrics.snapshot()
+        stages = snapshot["stages"]
+        self.table.setRowCount(len(stages))
+        for row, (name, stage) in enumerate(stages.items()):
+            cells = (
+                name, str(stage["count"]), f"{stage['mean_ms']:.1f}", f"{stage['max_ms']:.1f}",
+                f"{stage['total_ms'] / 1000:.2f}",
+                f"{stage['chars_per_sec']:.0f}" if stage["chars_per_sec"] else "—",
+            )
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+        counters = snapshot["counters"]
+        lines = [f"Влучання в кеш (сегменти): {snapshot['cache_hit_ratio']:.0%}"]
+        if counters:
+            lines.append(", ".join(
+                f"{_COUNTER_NAMES.get(name, name)}: {value}" for name, value in sorted(counters.items())
+            ))
+        if self.sources:
+            lines.extend(self.sources())
+        self.summary.setText("\n".join(lines))
+
+    def _export(self):
+        default = os.path.join(os.getcwd(), f"metrics_{datetime.now():%Y%m%d_%H%M%S}.jsonl")
+        path, _ = QFileDialog.getSaveFileName(self, "Експорт метрик", default, "JSON Lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            count = self.metrics.export_jsonl(path)
+        except OSError as e:
+            self.summary.setText(f"❌ Не вдалося записати {path}: {e}")
+            return
+        print(f"📤 Метрики: {count} подій → {path}")
+
+    def _reset(self):
+        self.metrics.reset()
+        self.refresh()
@@ -0,0 +1,36 @@
+# modules/novel_browser/toast.py
+"""Ненав'язливе сповіщення поверх віджета (замість модального QMessageBox)."""
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QLabel
+
+_STYLES = {
+    "info": "background: rgba(40, 40, 40, 220); color: #ffffff;",
+    "success": "background: rgba(46, 125, 50, 230); color: #ffffff;",
+    "error": "background: rgba(183, 28, 28, 230); color: #ffffff;",
+}
+
+
+class Toast(QLabel):
+    """Напис у нижньому правому куті батьківського віджета, що сам зникає."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setWordWrap(True)
+        self.setMaximumWidth(420)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.hide()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.hide)
+
+    def show_message(self, text: str, kind: str = "info", msecs: int = 3500):
+        self.setStyleSheet(f"QLabel {{ {_STYLES.get(kind, _STYLES['info'])} "
+                           "border-radius: 6px; padding: 8px 12px; }")
+        self.setText(text)
+        self.adjustSize()
+        parent = self.parentWidget()
+        if parent:
+            self.move(parent.width() - self.width() - 16, parent.height() - self.height() - 16)
+        self.raise_()
+        self.show()
+        self._timer.start(msecs)
@@ -1,15 +1,134 @@
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from deep_translator import GoogleTranslator
 
+from .memory import split_sentences
+from .metrics import get_metrics
+
+
+# Так починається текст-заглушка для блоку, який не вдалося перекласти
+ERROR_PREFIX = "[❌ Помилка в частині"
+
+# Ліміт символів одного запиту до перекладача
+MAX_REQUEST_LEN = 4500
+
+# Роздільник сегментів в одному запиті; перекладач зазвичай лишає його як є
+SEPARATOR = "\n<br_sep>\n"
+
+
+class TranslationCancelled(Exception):
+    """Переклад скасовано (користувач перейшов на іншу главу)."""
+
+
+def _is_throttled(error: Exception) -> bool:
+    """Чи схожа помилка на обмеження частоти запитів (HTTP 429 / TooManyRequests)."""
+    text = str(error).lower()
+    return (
+        type(error).__name__ == "TooManyRequests"
+        or "429" in text
+        or "too many requests" in text
+    )
+
+
+class TokenBucket:
+    """Обмежувач частоти: не більше `rate` запитів за секунду з піком `capacity`."""
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self):
+        """Блокує потік, доки не з'явиться вільний токен."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD-регулятор паралельності: після серії успіхів дозволяє на один
+    потік більше, при throttling — удвічі менше, при помилці — на один менше.
+    """
+    def __init__(self, bucket: TokenBucket, initial=2, minimum=1, maximum=8):
+        self.bucket = bucket
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self._base_rate = bucket.rate
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        self.bucket.acquire()
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                self.bucket.set_rate(min(self._base_rate, self.bucket.rate * 2))
+            self._cond.notify_all()
+
+    def on_throttled(self):
+        with self._cond:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
+            self.bucket.set_rate(max(self._base_rate / 8, self.bucket.rate / 2))
+
+    def on_error(self):
+        with self._cond:
+            self.limit = max(self.minimum, self.limit - 1)
+            self._successes = 0
+
 
 class SafeTranslator:
     """Перекладає великі тексти гарантовано повністю, з розбиттям на блоки."""
-    def __init__(self, source="auto", target="uk", delay=0.4):
-        self.translator = GoogleTranslator(source=source, target=target)
+    def __init__(self, source="auto", target="uk", delay=0.4, cache=None,
+                 backend=None, concurrency=1, rate=4.0, max_retries=3,
+                 memory=None, glossary=None):
+        # backend — будь-який об'єкт з методом translate(text) (напр. фейк для бенчмарків)
+        self.translator = backend or GoogleTranslator(source=source, target=target)
+        self.source = source
+        self.target = target
         self.delay = delay
+        self.cache = cache  # TranslationCache або None
+        self.memory = memory  # TranslationMemory (переклади речень) або None
+        self.glossary = glossary  # Glossary або None
+        self.concurrency = concurrency
+        self.rate = rate
+        self.max_retries = max_retries
 
-    def _split_text(self, text: str, max_len=4500):
+    def _split_text(self, text: str, max_len=MAX_REQUEST_LEN):
         sentences = re.split(r'(?<=[.!?]) +', text)
         chunks, current = [], ""
         for s in sentences:
@@ -22,14 +141,334 @@ class SafeTranslator:
             chunks.append(current.strip())
         return chunks
 
-    def translate_large_text(self, text):
+    def _from_cache(self, chunk):
+        if self.cache is None:
+            return None
+        return self.cache.get(chunk, self.source, self.target)
+
+    def _to_cache(self, chunk, translated):
+        if self.cache is not None and translated:
+            self.cache.put(chunk, self.source, self.target, translated)
+
+    def translate_large_text(self, text, progress=None, cancel=None):
         chunks = self._split_text(text)
+        try:
+            return "\n".join(self.translate_chunks(chunks, progress, cancel))
+        finally:
+            self.flush()
+
+    def flush(self):
+        """Записує відкладене в кеш і пам'ять перекладів (один коміт на главу)."""
+        for store in (self.cache, self.memory):
+            if store is not None:
+                store.flush()
+
+    def translate_chunks(self, chunks, progress=None, cancel=None, on_result=None,
+                         use_cache=True):
+        """
+        Перекладає список блоків; результат — у тому ж порядку.
+        progress(done, total) викликається після кожного блоку (з робочого потоку),
+        on_result(index, translated) — щойно конкретний блок готовий,
+        cancel — об'єкт з is_set() (напр. threading.Event).
+        """
+        if self.concurrency > 1 and len(chunks) > 1:
+            return self._translate_concurrent(chunks, progress, cancel, on_result, use_cache)
+        return self._translate_serial(chunks, progress, cancel, on_result, use_cache)
+
+    def _request(self, chunk):
+        """Один запит до перекладача; тривалість і символи йдуть у метрики (етап translate)."""
+        metrics = get_metrics()
+        started = time.perf_counter()
+        try:
+            translated = self.translator.translate(chunk)
+        except Exception:
+            metrics.record("translate", time.perf_counter() - started, chars=0, ok=False)
+            metrics.count("request_errors")
+            raise
+        metrics.record("translate", time.perf_counter() - started, chars=len(chunk))
+        return translated
+
+    @staticmethod
+    def _check_cancel(cancel):
+        if cancel is not None and cancel.is_set():
+            raise TranslationCancelled()
+
+    def _translate_serial(self, chunks, progress=None, cancel=None, on_result=None,
+                          use_cache=True):
         result_parts = []
         for i, chunk in enumerate(chunks, 1):
+            self._check_cancel(cancel)
+            if progress and i > 1:
+                progress(i - 1, len(chunks))
+            # 🗄️ Спершу шукаємо в кеші — без мережі і без паузи
+            cached = self._from_cache(chunk) if use_cache else None
+            if cached is not None:
+                result_parts.append(cached)
+                if on_result:
+                    on_result(i - 1, cached)
+                continue
             try:
-                translated = self.translator.translate(chunk)
-                result_parts.append(translated)
+                translated = self._request(chunk)
+                if use_cache:
+                    self._to_cache(chunk, translated)
             except Exception as e:
-                result_parts.append(f"[❌ Помилка в частині {i}: {e}]")
+                translated = f"{ERROR_PREFIX} {i}: {e}]"
+            result_parts.append(translated)
+            if on_result:
+                on_result(i - 1, translated)
             time.sleep(self.delay)
-        return "\n".join(result_parts)
+        if progress:
+            progress(len(chunks), len(chunks))
+        return result_parts
+
+    # ──────────────────────────────
+    # 📦 Пакетний переклад сегментів (1:1 з вузлами)
+    # ──────────────────────────────
+    def translate_batch(self, segments, order=None, on_ready=None, progress=None, cancel=None):
+        """
+        Перекладає список сегментів і повертає список тієї ж довжини.
+
+        Однакові сегменти перекладаються один раз, кожен сегмент кешується окремо.
+        З пам'яттю перекладів (memory) сегмент ділиться на речення, і до
+        перекладача йдуть лише ті, яких у пам'яті немає.
+        Решта пакується у запити до MAX_REQUEST_LEN символів; якщо роздільник
+        у відповіді не вижив, запит ділиться навпіл, доки відповідність 1:1
+        не стане гарантованою. order — пріоритет індексів (спершу перекладаються
+        вони), on_ready({індекс: переклад}) — для кожної готової порції.
+        Записи в кеш і пам'ять комітяться один раз — наприкінці (або при скасуванні).
+        """
+        try:
+            return self._translate_batch(segments, order, on_ready, progress, cancel)
+        finally:
+            self.flush()
+
+    def _translate_batch(self, segments, order, on_ready, progress, cancel):
+        metrics = get_metrics()
+        started = time.perf_counter()
+        results = [None] * len(segments)
+        positions = {}  # текст → індекси всіх його входжень
+        for i in (order if order is not None else range(len(segments))):
+            positions.setdefault(segments[i].strip(), []).append(i)
+
+        def deliver(text, translated):
+            ready = {}
+            for i in positions[text]:
+                results[i] = translated
+                ready[i] = translated
+            return ready
+
+        total = len(positions)
+        done = 0
+        pending = []
+        cached_ready = {}
+        for text in positions:
+            cached = self._from_cache(text) if text else ""
+            if cached is not None:
+                cached_ready.update(deliver(text, cached))
+                done += 1
+            else:
+                pending.append(text)
+
+        # Одиниці перекладу: самі сегменти або (з пам'яттю) їхні невідомі речення.
+        # parts[текст] — переклади його частин (None — ще немає),
+        # waiting[одиниця] — [(текст, номер частини)], що чекають на неї.
+        parts, waiting = {}, {}
+        lock = threading.Lock()
+        reassemble = [0.0]  # сумарний час збирання (пишеться одним спаном у кінці)
+
+        def assemble(text):
+            """Текст готовий, якщо всі його частини перекладено."""
+            nonlocal done
+            slots = parts[text]
+            if any(part is None for part in slots):
+                return {}
+            assembled = time.perf_counter()
+            translated = slots[0] if len(slots) == 1 else " ".join(slots)
+            if not any(part.startswith(ERROR_PREFIX) for part in slots):
+                self._to_cache(text, translated)
+            done += 1
+            ready = deliver(text, translated)
+            reassemble[0] += time.perf_counter() - assembled
+            return ready
+
+        for text in pending:
+            pieces = self._split_for_memory(text)
+            parts[text] = [self._known(piece) for piece in pieces]
+            for j, piece in enumerate(pieces):
+                if parts[text][j] is None:
+                    waiting.setdefault(piece, []).append((text, j))
+            cached_ready.update(assemble(text))
+
+        metrics.record("segment", time.perf_counter() - started,
+                       segments=total, cached=total - len(pending), units=len(waiting))
+        metrics.count("segments", total)
+        metrics.count("segments_cached", total - len(pending))
+        metrics.count("units_sent", len(waiting))
+        if cached_ready and on_ready:
+            on_ready(cached_ready)
+        if progress:
+            progress(done, total)
+
+        def complete(unit, translated):
+            """Одиниця перекладена: пам'ять + усі тексти, що на неї чекали."""
+            if self.memory is not None and not translated.startswith(ERROR_PREFIX):
+                self.memory.put(unit, self.source, self.target, translated)
+            ready = {}
+            with lock:
+                for text, j in waiting.pop(unit, ()):
+                    parts[text][j] = translated
+                    ready.update(assemble(text))
+                if ready and progress:
+                    progress(done, total)
+            if ready and on_ready:
+                on_ready(ready)
+
+        # Завеликі одиниці — окремо, з розбиттям на речення
+        packs = []
+        for unit in waiting:
+            if len(unit) + len(SEPARATOR) > MAX_REQUEST_LEN:
+                complete(unit, self.translate_large_text(self._outgoing(unit), cancel=cancel))
+            else:
+                packs.append(unit)
+        packs = self._pack(packs)
+
+        while packs:
+            requests = [SEPARATOR.join(self._outgoing(unit) for unit in pack) for pack in packs]
+            retry = []
+
+            def handle(n, translated):
+                pack = packs[n]
+                pieces = translated.split(SEPARATOR)
+                if len(pack) == 1:
+                    pieces = [translated]
+                elif translated.startswith(ERROR_PREFIX):
+                    pieces = [translated] * len(pack)
+                elif len(pieces) != len(pack):
+                    # Роздільник не вижив — ділимо запит навпіл і пробуємо ще раз
+                    print(f"⚠️ Помилка збігу: {len(pack)} сегментів != {len(pieces)} перекладів, ділю запит.")
+                    metrics.count("bisects")
+                    half = len(pack) // 2
+                    with lock:
+                        retry.extend([pack[:half], pack[half:]])
+                    return
+                for unit, piece in zip(pack, pieces):
+                    complete(unit, piece.strip())
+
+            self.translate_chunks(requests, cancel=cancel, on_result=handle, use_cache=False)
+            packs = retry
+        metrics.record("reassemble", reassemble[0], segments=total)
+        return results
+
+    # ──────────────────────────────
+    # 🧠 Пам'ять перекладів і глосарій
+    # ──────────────────────────────
+    def _split_for_memory(self, text: str):
+        if self.memory is None or not text:
+            return [text]
+        return split_sentences(text) or [text]
+
+    def _known(self, piece: str):
+        """Переклад частини без запиту: порожня, термін глосарію або речення з пам'яті."""
+        if not piece:
+            return ""
+        if self.glossary:
+            term = self.glossary.lookup(piece)
+            if term is not None:
+                return term
+        if self.memory is not None:
+            return self.memory.lookup(piece, self.source, self.target)
+        return None
+
+    def _outgoing(self, unit: str) -> str:
+        """Текст для перекладача: терміни глосарію вже замінено перекладом."""
+        return self.glossary.apply(unit) if self.glossary else unit
+
+    @staticmethod
+    def _pack(texts, max_len=MAX_REQUEST_LEN):
+        """Жадібно пакує сегменти (зберігаючи порядок) у запити до max_len символів."""
+        packs, current, size = [], [], 0
+        for text in texts:
+            extra = len(text) + len(SEPARATOR)
+            if current and size + extra > max_len:
+                packs.append(current)
+                current, size = [], 0
+            current.append(text)
+            size += extra
+        if current:
+            packs.append(current)
+        return packs
+
+    # ──────────────────────────────
+    # ⚡ Паралельний режим
+    # ──────────────────────────────
+    def _translate_concurrent(self, chunks, progress=None, cancel=None, on_result=None,
+                              use_cache=True):
+        results = [None] * len(chunks)
+        pending = []
+        for i, chunk in enumerate(chunks):
+            cached = self._from_cache(chunk) if use_cache else None
+            if cached is not None:
+                results[i] = cached
+                if on_result:
+                    on_result(i, cached)
+            else:
+                pending.append(i)
+        if progress:
+            progress(len(chunks) - len(pending), len(chunks))
+        if not pending:
+            return results
+
+        limiter = AdaptiveLimiter(
+            TokenBucket(self.rate),
+            initial=min(2, self.concurrency),
+            maximum=self.concurrency,
+        )
+
+        done = [len(chunks) - len(pending)]
+        done_lock = threading.Lock()
+
+        def work(i):
+            results[i] = self._translate_with_retries(chunks[i], i + 1, limiter, cancel, use_cache)
+            if on_result:
+                on_result(i, results[i])
+            if progress:
+                with done_lock:
+                    done[0] += 1
+                    progress(done[0], len(chunks))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [pool.submit(work, i) for i in pending]
+            try:
+                for future in futures:
+                    future.result()
+            except TranslationCancelled:
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
+
+    def _translate_with_retries(self, chunk, number, limiter, cancel=None, use_cache=True):
+        backoff = self.delay or 0.5
+        for attempt in range(self.max_retries + 1):
+            self._check_cancel(cancel)
+            limiter.acquire()
+            try:
+                translated = self._request(chunk)
+            except Exception as e:
+                if _is_throttled(e):
+                    limiter.on_throttled()
+                    get_metrics().count("throttled")
+                else:
+                    limiter.on_error()
+                if attempt == self.max_retries:
+                    return f"{ERROR_PREFIX} {number}: {e}]"
+                get_metrics().count("retries")
+            else:
+                limiter.on_success()
+                if use_cache:
+                    self._to_cache(chunk, translated)
+                return translated
+            finally:
+                limiter.release()
+            time.sleep(backoff)
+            backoff *= 2
@@ -1,61 +1,146 @@
 # modules/novel_browser/ui.py
 import html
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QSplitter, QPushButton, QMessageBox
-from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineProfile
-from PyQt5.QtCore import Qt, QUrl, QTimer
+import time
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QSplitter, QPushButton, QProgressBar
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage, QWebEngineScript
+from PyQt5.QtCore import Qt, QUrl
 from .translator import SafeTranslator
+from .worker import TranslationWorker
+from .prefetch import ChapterPrefetcher, NEXT_CHAPTER_JS
+from .scheduler import TranslationScheduler, VISIBLE
 from .adblock import AdBlocker
-from .save import save_translated_chapter
-from bs4 import BeautifulSoup  # 👈 НОВИЙ ІМПОРТ
+from .filters import load_filters
+from .extract import EXTRACT_JS, parse_segments
+from .pipeline import patch_script
+from .scroll_sync import APPLY_JS, ScrollBridge, install_scroll_reporter
+from .export import ExportQueue
+from .library_view import LibraryWatcher
+from .toast import Toast
+from .cache import get_shared_cache
+from .memory import get_shared_memory, load_glossary
+from .metrics import get_metrics
+from .settings import load_settings, data_path
+from .profile import get_profile
 
 
 class NovelBrowserUI(QWidget):
     def __init__(self):
         super().__init__()
         self.current_theme = "light"  # 👈 НОВЕ: Зберігаємо поточну тему
+        # 🧵 Планувальник: видима глава першою, prefetch і масовий переклад — у вільні потоки
+        settings = load_settings()
+        self.scheduler = TranslationScheduler(
+            data_path(settings["queue_path"]), workers=int(settings["scheduler_workers"]), parent=self
+        )
+        self._job_id = 0
+        self._extract_started = None   # для метрик extract/render
+        self._render_started = None
+        self._current_worker = None
+        self._finished_job = None       # задача, переклад якої повністю на правій сторінці
+        self._translated_segments = {}  # переклади поточного каркаса: {індекс: текст}
+        self._prefetched_page = None    # сторінка, для якої вже шукали наступну главу
+        self.prefetcher = ChapterPrefetcher(settings, self.scheduler, self)
+        # 💾 Експорт у .docx — у фоні, повторні збереження глави зливаються
+        self.export_queue = ExportQueue(self)
+        self.export_queue.signals.saved.connect(self._on_export_saved)
+        self.export_queue.signals.failed.connect(self._on_export_failed)
+        # 📚 Індекс бібліотеки оновлюється у фоні весь час роботи модуля
+        self.library = LibraryWatcher(data_path(settings["library_folder"]),
+                                      data_path(settings["library_index"]), self)
         self._build_ui()
-        self.scroll_sync_timer = QTimer(self)
-        self.scroll_sync_timer.timeout.connect(self._sync_scroll_loop)
+        self.toast = Toast(self)
+        # 🔄 Скрол лівої сторінки приходить подіями через QWebChannel
+        self._sync_enabled = False
+        self._last_scroll = (-1, 0.0, 0.0)
+        self.scroll_bridge = ScrollBridge(self)
+        self.scroll_bridge.scrolled.connect(self._on_left_scrolled)
+        self.web_channel = install_scroll_reporter(self.left_browser.page(), self.scroll_bridge)
 
     def _build_ui(self):
         # ... (код _build_ui без змін, я його приховав для стислості) ...
         layout = QVBoxLayout(self)
         layout.setContentsMargins(5, 5, 5, 5)
-        profile = QWebEngineProfile.defaultProfile()
-        ad_domains = ["googlesyndication", "doubleclick", "adservice", "tracking"]
-        profile.setUrlRequestInterceptor(AdBlocker(ad_domains))
+        # 🌐 Іменований профіль з дисковим кешем і cookies (а не defaultProfile)
+        self.profile = get_profile()
+        settings = load_settings()
+        log_path = settings["adblock_request_log"]
+        self.ad_blocker = AdBlocker(self._load_ad_filters(settings), data_path(log_path) if log_path else None)
+        self.profile.setUrlRequestInterceptor(self.ad_blocker)
         self.left_browser = QWebEngineView()
+        self.left_browser.setPage(QWebEnginePage(self.profile, self.left_browser))
         self.left_browser.setUrl(QUrl(
             "https://www.webnovel.com/book/eternally-regressing-knight_33789555708924705"
         ))
         self.right_browser = QWebEngineView()
         self.right_browser.setHtml("<p>Тут з’явиться переклад сторінки…</p>")
+        self.right_browser.loadFinished.connect(self._on_right_loaded)
         self.btn_translate = QPushButton("🔁 Перекласти сторінку")
         self.btn_translate.clicked.connect(self.translate_page)
         self.btn_save = QPushButton("💾 Зберегти переклад")
         self.btn_save.clicked.connect(self.save_translated)
+        self.btn_save.setEnabled(False)   # до завершення перекладу глава неповна
+        self.btn_library = QPushButton("📚 Бібліотека")
+        self.btn_library.clicked.connect(self.show_library)
+        self.btn_profile = QPushButton("🗄️ Кеш браузера")
+        self.btn_profile.clicked.connect(self.show_profile_panel)
+        self.btn_ahead = QPushButton(f"📥 Перекласти наперед ({settings['batch_ahead_chapters']} глав)")
+        self.btn_ahead.clicked.connect(self.translate_ahead)
+        self.btn_stats = QPushButton("📊 Статистика")
+        self.btn_stats.clicked.connect(self.show_stats)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.hide()
+        self.left_browser.urlChanged.connect(self._on_url_changed)
+        self.left_browser.loadFinished.connect(self._on_left_loaded)
         self.splitter = QSplitter(Qt.Horizontal)
         self.splitter.addWidget(self.left_browser)
         self.splitter.addWidget(self.right_browser)
         self.splitter.setSizes([700, 700])
         layout.addWidget(self.splitter)
+        layout.addWidget(self.progress_bar)
         layout.addWidget(self.btn_translate)
         layout.addWidget(self.btn_save)
+        layout.addWidget(self.btn_library)
+        layout.addWidget(self.btn_profile)
+        layout.addWidget(self.btn_ahead)
+        layout.addWidget(self.btn_stats)
         self._last_scroll_ratio = 0.0
         # ... (кінець _build_ui) ...
 
+    def _load_ad_filters(self, settings: dict):
+        """Скомпільовані списки фільтрів з config/filters (або прості правила з налаштувань)."""
+        try:
+            self.ad_filters = load_filters(
+                data_path(settings["adblock_filter_dir"]),
+                data_path(settings["adblock_cache"]),
+                settings["adblock_rules"],
+            )
+            return self.ad_filters.matcher()
+        except Exception as e:
+            print(f"⚠️ Не вдалося завантажити фільтри: {e}")
+            self.ad_filters = None
+            return settings["adblock_rules"]
+
     # ──────────────────────────────
-    # ⏯️ Керування таймером (без змін)
+    # ⏯️ Керування синхронізацією
     # ──────────────────────────────
     def pause_sync(self):
-        self.scroll_sync_timer.stop()
+        self._sync_enabled = False
 
     def resume_sync(self):
-        self.scroll_sync_timer.start(50)
+        self._sync_enabled = True
+        self._apply_right_scroll()
 
     def cleanup(self):
         print(f"🧹 Очищення {self.__class__.__name__}...")
         self.pause_sync()
+        self._cancel_translation()
+        self.prefetcher.cancel()
+        self.scheduler.shutdown()  # незавершений масовий переклад продовжиться після запуску
+        self.profile.setUrlRequestInterceptor(None)  # профіль переживе цей віджет
+        self.ad_blocker.close_log()
+        self.export_queue.wait(10000)  # не втрачаємо файли, що ще пишуться
+        self.library.close()
         if self.left_browser:
             self.left_browser.page().deleteLater()
             self.left_browser.deleteLater()
@@ -66,36 +151,20 @@ class NovelBrowserUI(QWidget):
             self.right_browser = None
 
     # ──────────────────────────────
-    # 🔄 Синхронізація скролу (без змін)
+    # 🔄 Синхронізація скролу (за подіями від сторінки)
     # ──────────────────────────────
-    def _sync_scroll_loop(self):
-        if not self.left_browser: return
-        js = """
-        (function(){
-            let doc = document.scrollingElement || document.body;
-            let top = doc.scrollTop;
-            let height = doc.scrollHeight - doc.clientHeight;
-            return (height > 0) ? (top / height) : 0;
-        })();
-        """
-        self.left_browser.page().runJavaScript(js, self._apply_right_scroll)
+    def _on_left_scrolled(self, anchor: int, offset: float, ratio: float):
+        """Ліва сторінка прокрутилась — ставимо праву на той самий абзац."""
+        self._last_scroll = (anchor, offset, ratio)
+        self._last_scroll_ratio = ratio
+        if self._sync_enabled:
+            self._apply_right_scroll()
 
-    def _apply_right_scroll(self, ratio):
-        """Smoothly scrolls the right browser to the same percentage."""
-        if ratio is None or abs(ratio - self._last_scroll_ratio) < 0.001:
+    def _apply_right_scroll(self):
+        if not self.right_browser:
             return
-        if not self.right_browser: # Check added
-             return
-             
-        self._last_scroll_ratio = ratio
-        js = f"""
-        (function(){{
-            let doc = document.scrollingElement || document.body;
-            let maxScroll = doc.scrollHeight - doc.clientHeight;
-            doc.scrollTop = maxScroll * {ratio};
-        }})();
-        """
-        self.right_browser.page().runJavaScript(js)
+        anchor, offset, ratio = self._last_scroll
+        self.right_browser.page().runJavaScript(APPLY_JS % (anchor, offset, ratio))
 
     # ──────────────────────────────
     # 🎨 Керування темою (НОВІ МЕТОДИ)
@@ -123,6 +192,7 @@ class NovelBrowserUI(QWidget):
                 box-sizing: border-box;
             }}
             #translated-root p {{ margin:0 0 1em 0; }}
+            #translated-root .nb-pending {{ opacity: 0.45; }}
             #translated-root img {{ max-width: 90%; height: auto; display: block; margin: 1em auto; border-radius: 4px; }}
             """
         else:  # 'light'
@@ -136,6 +206,7 @@ class NovelBrowserUI(QWidget):
                 box-sizing: border-box;
             }}
             #translated-root p {{ margin:0 0 1em 0; }}
+            #translated-root .nb-pending {{ opacity: 0.45; }}
             #translated-root img {{ max-width: 90%; height: auto; display: block; margin: 1em auto; border-radius: 4px; }}
             """
 
@@ -162,143 +233,204 @@ class NovelBrowserUI(QWidget):
     # ──────────────────────────────
     
     def translate_page(self):
-        """Крок 1: Отримуємо HTML контенту, а не просто текст."""
+        """Крок 1: Отримуємо лише текстові сегменти контенту (компактний JSON)."""
+        if not self.left_browser: return
+        self._extract_started = time.perf_counter()
+        # В ізольованому світі — там живе скрипт синхронізації скролу з тими самими вузлами
+        self.left_browser.page().runJavaScript(
+            EXTRACT_JS, QWebEngineScript.ApplicationWorld, self._on_segments_extracted
+        )
+
+    def _extract_html(self):
+        """Запасний шлях: увесь HTML контейнера (якщо сегменти отримати не вдалося)."""
         if not self.left_browser: return
         js = """
         (function() {
             let content = document.querySelector('#chapter-content, .cha-words, .chapter-content, .read-content');
+            if (window.__nbIndexNodes) window.__nbIndexNodes(content || document.body);
             return content ? content.innerHTML : document.body.innerHTML;
         })();
         """
-        # Викликаємо новий обробник
-        self.left_browser.page().runJavaScript(js, self._on_html_extracted)
+        self.left_browser.page().runJavaScript(js, QWebEngineScript.ApplicationWorld, self._on_html_extracted)
+
+    def _on_segments_extracted(self, payload):
+        """Крок 2: тексти й номери абзаців (HTML сторінки через міст не передається)."""
+        if not self.right_browser: return
+        self._record_extract(len(payload) if isinstance(payload, str) else 0)
+        try:
+            texts, blocks = parse_segments(payload)
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"⚠️ Не вдалося отримати сегменти ({e}), беру HTML.")
+            self._extract_html()
+            return
+        if not texts:
+            self._extract_html()
+            return
+        self._start_translation("", segments=(texts, blocks))
+
+    def _make_translator(self) -> SafeTranslator:
+        settings = load_settings()
+        return SafeTranslator(
+            source="auto", target="uk",
+            cache=get_shared_cache(),
+            concurrency=int(settings["translate_concurrency"]),
+            rate=float(settings["translate_rate"]),
+            memory=get_shared_memory(), glossary=load_glossary(),
+        )
 
     def _on_html_extracted(self, html_content: str):
-        """Крок 2: Отримали HTML, показуємо статус і запускаємо обробку."""
+        """Крок 2: Отримали HTML, показуємо статус і запускаємо фонову обробку."""
         if not self.right_browser: return
+        self._record_extract(len(html_content or ""))
         
         if not html_content or len(html_content.strip()) < 50:
             self.right_browser.setHtml("<p>⚠️ Не вдалося знайти HTML контент.</p>")
             return
 
-        self.right_browser.setHtml("<p>⏳ Обробляю HTML та перекладаю... (це може зайняти час)</p>")
-        # Використовуємо QTimer, щоб не "вішати" UI
-        QTimer.singleShot(100, lambda: self._translate_html_content(html_content))
+        self._start_translation(html_content)
 
-    def _translate_html_content(self, html_content: str):
-        """
-        Крок 3: Найскладніший. Парсимо HTML, витягуємо текст,
-        перекладаємо і збираємо HTML назад.
-        """
-        if not self.right_browser: return
+    def _record_extract(self, size: int):
+        """Час від запиту до відповіді лівої сторінки (включно з передачею через міст)."""
+        if self._extract_started is not None:
+            get_metrics().record("extract", time.perf_counter() - self._extract_started, bytes=size)
+            self._extract_started = None
 
-        try:
-            # 1. Парсимо HTML
-            try:
-                soup = BeautifulSoup(html_content, 'lxml')
-            except Exception:
-                soup = BeautifulSoup(html_content, 'html.parser')
-
-            # 2. Знаходимо ВСІ текстові вузли, які варто перекладати
-            texts_to_translate = [] # Рядки для перекладача
-            text_nodes = []         # Посилання на вузли в 'soup'
-            
-            for node in soup.find_all(string=True):
-                # Ігноруємо текст у <script>, <style> та порожні рядки
-                if node.parent.name in ['script', 'style', 'head', 'title', 'a']:
-                    continue
-                text = node.string.strip()
-                if text:
-                    texts_to_translate.append(text)
-                    text_nodes.append(node)
-            
-            if not texts_to_translate:
-                # Це може статися, якщо весь контент - лише картинки
-                self.right_browser.setHtml(str(soup))
-                self._update_theme_css() # Застосовуємо тему
-                return
-            
-            # 3. Об'єднуємо текст в один великий блок для SafeTranslator
-            # Використовуємо унікальний роздільник, який перекладач не повинен змінити
-            SEPARATOR = "\n<br_sep>\n"
-            full_text = SEPARATOR.join(texts_to_translate)
-
-            # 4. Перекладаємо
-            translator = SafeTranslator(source="auto", target="uk")
-            translated_full_text = translator.translate_large_text(full_text)
-            
-            # 5. Розбиваємо переклад назад на шматки
-            translated_chunks = translated_full_text.split(SEPARATOR)
-            
-            # 6. Перевірка, чи все збігається
-            if len(translated_chunks) != len(text_nodes):
-                print(f"⚠️ Помилка збігу: {len(text_nodes)} вузлів != {len(translated_chunks)} перекладів.")
-                # Якщо щось пішло не так - просто показуємо суцільний переклад
-                self._fallback_to_plain_text(soup)
+    def _start_translation(self, html_content: str, segments=None):
+        """Крок 3 — розбір, переклад і збирання — у фоновому потоці."""
+        self.right_browser.setHtml("<p>⏳ Обробляю HTML та перекладаю... (це може зайняти час)</p>")
+        self._cancel_translation()
+        self._job_id += 1
+        self._translated_segments = {}
+        worker = TranslationWorker(
+            self._job_id, html_content, self._make_translator(), self._get_theme_css(),
+            focus_ratio=self._last_scroll_ratio, segments=segments,
+        )
+        worker.signals.progress.connect(self._on_translation_progress)
+        worker.signals.skeleton.connect(self._on_translation_skeleton)
+        worker.signals.segments.connect(self._on_translation_segments)
+        worker.signals.finished.connect(self._on_translation_finished)
+        worker.signals.failed.connect(self._on_translation_failed)
+        worker.signals.cancelled.connect(self._on_translation_cancelled)
+        self._current_worker = worker
+
+        self.progress_bar.setRange(0, 0)  # «невизначений» стан до першого блоку
+        self.progress_bar.show()
+        self._update_save_button()
+        # Поки видима глава в роботі, нові фонові задачі не стартують
+        self.scheduler.submit(f"visible:{self._job_id}", VISIBLE, task=worker)
+
+    def _cancel_translation(self):
+        """Скасовує поточний переклад (якщо він ще йде)."""
+        if self._current_worker:
+            self.scheduler.cancel(f"visible:{self._current_worker.job_id}")
+            self._current_worker = None
+        self.progress_bar.hide()
+        self._update_save_button()
+
+    def _translation_complete(self) -> bool:
+        return self._current_worker is None and self._finished_job == self._job_id
+
+    def _update_save_button(self):
+        self.btn_save.setEnabled(self._translation_complete())
+
+    def _on_url_changed(self, _url):
+        # Користувач перейшов на іншу главу — старий переклад більше не потрібен
+        self._cancel_translation()
+
+    def _on_left_loaded(self, ok: bool):
+        if ok:
+            self._request_prefetch()
+
+    def _request_prefetch(self):
+        """Шукаємо посилання на наступну главу і перекладаємо її у фоні (раз на сторінку)."""
+        if self.left_browser and self.prefetcher.enabled:
+            page_url = self.left_browser.url().toString()
+            if page_url == self._prefetched_page:
                 return
+            self._prefetched_page = page_url
+            self.left_browser.page().runJavaScript(NEXT_CHAPTER_JS, self.prefetcher.prefetch)
 
-            # 7. Замінюємо старий текст на новий прямо в 'soup'
-            for node, translated_text in zip(text_nodes, translated_chunks):
-                node.string.replace_with(translated_text)
-            
-            # 8. Отримуємо CSS для теми
-            css = self._get_theme_css()
-
-            # 9. Формуємо кінцевий HTML
-            # 'str(soup)' - це наш HTML зі збереженими <img> і перекладеним текстом
-            final_html = f"""
-            <!doctype html>
-            <html>
-            <head>
-                <meta charset='utf-8'>
-                <style id='theme-style'>{css}</style>
-            </head>
-            <body>
-                <div id='translated-root'>{str(soup)}</div>
-            </body>
-            </html>
-            """
-            self.right_browser.setHtml(final_html)
+    def translate_ahead(self):
+        """Масовий переклад наступних глав (BATCH): лише коли потоки вільні, черга переживе перезапуск."""
+        if not self.left_browser:
+            return
+        count = int(load_settings()["batch_ahead_chapters"])
 
-        except Exception as e:
-            print(f"❌ Помилка перекладу HTML: {e}. Повертаюсь до старого методу.")
-            # План Б: якщо розбір HTML не вдався, повертаємось до старого методу (лише текст)
-            self._fallback_to_plain_text(BeautifulSoup(html_content, 'html.parser'))
+        def queue(next_url):
+            if not next_url:
+                self.toast.show_message("⚠️ Не знайдено посилання на наступну главу", "error")
+            elif self.prefetcher.queue_ahead(next_url, count):
+                self.toast.show_message(f"📥 У черзі: {count} глав наперед", "success")
+            else:
+                self.toast.show_message("ℹ️ Нічого не поставлено в чергу", "info")
 
-    def _fallback_to_plain_text(self, soup: BeautifulSoup):
-        """План Б: Старий метод (показати лише текст), але з підтримкою тем."""
-        
-        text = soup.get_text() # Отримуємо весь текст без HTML
-        
-        try:
-            translator = SafeTranslator(source="auto", target="uk")
-            translated = translator.translate_large_text(text)
-
-            paras = [p.strip() for p in translated.split("\n\n") if p.strip()]
-            para_html = ""
-            for p in paras:
-                safe = html.escape(p).replace("\r", "").replace("\n", "<br>")
-                para_html += f"<p>{safe}</p>\n"
-
-            css = self._get_theme_css() # <-- Використовуємо CSS з теми
-
-            final_html = f"""
-            <!doctype html>
-            <html>
-            <head><meta charset='utf-8'><style id='theme-style'>{css}</style></head>
-            <body><div id='translated-root'>{para_html}</div></body>
-            </html>
-            """
-            self.right_browser.setHtml(final_html)
-        except Exception as e:
-            self.right_browser.setHtml(f"<p>❌ Помилка резервного перекладу: {html.escape(str(e))}</p>")
+        self.left_browser.page().runJavaScript(NEXT_CHAPTER_JS, queue)
+
+    def _on_translation_progress(self, job_id: int, done: int, total: int):
+        if job_id != self._job_id:
+            return
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.progress_bar.setFormat(f"Переклад: {done}/{total}")
+
+    def _on_translation_skeleton(self, job_id: int, page: str):
+        """Показуємо оригінал одразу; переклади підставлятимуться по абзацах."""
+        if job_id != self._job_id or not self.right_browser:
+            return
+        self._render_started = time.perf_counter()
+        self.right_browser.setHtml(page)
+
+    def _on_translation_segments(self, job_id: int, segments: dict):
+        if job_id != self._job_id or not self.right_browser:
+            return
+        self._translated_segments.update(segments)
+        self._patch_segments(segments)
+
+    def _on_right_loaded(self, ok: bool):
+        if self._render_started is not None:
+            get_metrics().record("render", time.perf_counter() - self._render_started, job=self._job_id)
+            self._render_started = None
+        # Сторінка могла довантажитися вже після частини перекладів — доставляємо їх
+        if ok and self._translated_segments:
+            self._patch_segments(self._translated_segments)
+        if ok and self._sync_enabled:
+            self._apply_right_scroll()
+
+    def _patch_segments(self, segments: dict):
+        """Підставляє переклади у DOM правої сторінки без перезавантаження."""
+        self.right_browser.page().runJavaScript(patch_script(segments))
+
+    def _on_translation_finished(self, job_id: int, page: str):
+        if job_id != self._job_id or not self.right_browser:
+            return  # застарілий результат
+        self._current_worker = None
+        self._finished_job = job_id
+        self.progress_bar.hide()
+        self._update_save_button()
+        if page:
+            # Резервний шлях (без каркаса) — готова сторінка цілком
+            self.right_browser.setHtml(page)
+
+    def _on_translation_failed(self, job_id: int, error: str):
+        if job_id != self._job_id or not self.right_browser:
+            return
+        self._current_worker = None
+        self.progress_bar.hide()
+        self._update_save_button()
+        self.right_browser.setHtml(f"<p>❌ Помилка перекладу: {html.escape(error)}</p>")
+
+    def _on_translation_cancelled(self, job_id: int):
+        print(f"⏹️ Переклад #{job_id} скасовано.")
 
 
     # ──────────────────────────────
-    # 💾 Збереження (без змін)
+    # 💾 Збереження (фонова черга експорту)
     # ──────────────────────────────
     def save_translated(self):
         if not self.left_browser: return
+        if not self._translation_complete():
+            self.toast.show_message("⏳ Переклад ще не завершено — збережу, коли буде готовий.", "error")
+            return
         js_novel = "(document.querySelector('.j_book_name') && document.querySelector('.j_book_name').innerText) || 'Без назви';"
         self.left_browser.page().runJavaScript(js_novel, self._save_with_novel_title)
 
@@ -310,16 +442,52 @@ class NovelBrowserUI(QWidget):
 
     def _save_with_titles(self, novel_title, chapter_title):
         if not self.right_browser: return
+        if not self._translation_complete():
+            return  # поки читали назви, почався переклад іншої глави
         # Отримуємо текст з нашого 'translated-root'
         js = "document.getElementById('translated-root').innerText || document.body.innerText;"
         self.right_browser.page().runJavaScript(js, lambda text: self._write_docx(novel_title, chapter_title, text))
 
     def _write_docx(self, novel_title, chapter_title, text):
         if not text or len(text.strip()) < 10:
-            QMessageBox.warning(self, "Порожньо", "Немає перекладеного тексту.")
+            self.toast.show_message("⚠️ Немає перекладеного тексту.", "error")
             return
-        try:
-            path = save_translated_chapter(novel_title, chapter_title, text)
-            QMessageBox.information(self, "✅ Збережено", f"Файл збережено:\n{path}")
-        except Exception as e:
-            QMessageBox.critical(self, "❌ Помилка", f"Не вдалося зберегти:\n{e}")
\ No newline at end of file
+        if self.export_queue.enqueue(novel_title, chapter_title, text):
+            self.toast.show_message(f"💾 Зберігаю «{chapter_title}»…")
+
+    def _on_export_saved(self, _key: str, path: str):
+        self.toast.show_message(f"✅ Збережено:\n{path}", "success")
+
+    def show_library(self):
+        from .library_view import LibraryDialog
+        LibraryDialog(self.library, self).exec_()
+
+    def show_profile_panel(self):
+        from .profile_view import ProfileDialog
+        current = self.left_browser.url().toString() if self.left_browser else ""
+        ProfileDialog(self.profile, current, self).exec_()
+
+    def show_stats(self):
+        from .stats_view import StatsDialog
+        StatsDialog(self._stats_sources, self).exec_()
+
+    def _stats_sources(self):
+        """Рядки для панелі статистики: кеш, пам'ять перекладів, черга."""
+        cache = get_shared_cache().stats()
+        lines = [
+            f"Кеш перекладів: {cache['entries']} записів, {cache['bytes'] / (1024 * 1024):.1f} МБ, "
+            f"влучань {cache['hit_ratio']:.0%} ({cache['hits']}/{cache['hits'] + cache['misses']})"
+        ]
+        memory = get_shared_memory()
+        if memory is not None:
+            tm = memory.stats()
+            lines.append(f"Пам'ять перекладів: {tm['sentences']} речень, точних {tm['exact_hits']}, "
+                         f"схожих {tm['fuzzy_hits']}, нових {tm['misses']}")
+        queue = self.scheduler.counts()
+        lines.append(f"Черга: {queue['pending']} чекає, {queue['running']} виконується "
+                     f"(наступні {queue['next']}, наперед {queue['batch']})")
+        return lines
+
+    def _on_export_failed(self, _key: str, error: str):
+        print(f"❌ Експорт: {error}")
+        self.toast.show_message(f"❌ Не вдалося зберегти:\n{error}", "error", 6000)
\ No newline at end of file
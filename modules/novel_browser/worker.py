@@ -0,0 +1,99 @@
+# modules/novel_browser/worker.py
+import threading
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from .extract import skeleton_from_segments
+from .metrics import get_metrics
+from .pipeline import prepare_skeleton, translate_html, translate_progressive
+from .translator import SafeTranslator, TranslationCancelled
+
+
+class TranslationSignals(QObject):
+    """Сигнали фонового перекладу. Перший аргумент — id завдання."""
+    progress = pyqtSignal(int, int, int)   # job_id, готово блоків, усього
+    skeleton = pyqtSignal(int, str)        # job_id, сторінка-каркас з оригінальним текстом
+    segments = pyqtSignal(int, object)     # job_id, {індекс сегмента: переклад}
+    finished = pyqtSignal(int, str)        # job_id, готова сторінка ("" — каркас уже заповнено)
+    failed = pyqtSignal(int, str)          # job_id, текст помилки
+    cancelled = pyqtSignal(int)
+
+
+class TranslationWorker(QRunnable):
+    """
+    Виконує розбір → переклад → збирання HTML поза GUI-потоком.
+    Спершу віддає каркас сторінки, далі — переклади сегментів, починаючи з видимих.
+    """
+
+    def __init__(self, job_id: int, html_content: str, translator: SafeTranslator, css: str,
+                 focus_ratio: float = 0.0, segments=None):
+        super().__init__()
+        self.job_id = job_id
+        self.html_content = html_content
+        self.segments = segments   # (тексти, номери абзаців) від EXTRACT_JS — тоді HTML не потрібен
+        self.translator = translator
+        self.css = css
+        self.focus_ratio = focus_ratio
+        self.signals = TranslationSignals()
+        self._cancel = threading.Event()
+        self._chars = 0
+
+    def cancel(self):
+        """Кооперативне скасування: поточний запит доробиться, наступні — ні."""
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _on_progress(self, done: int, total: int):
+        if not self._cancel.is_set():
+            self.signals.progress.emit(self.job_id, done, total)
+
+    def _on_segments(self, translated: dict):
+        if not self._cancel.is_set():
+            self.signals.segments.emit(self.job_id, translated)
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            page = self._run_progressive()
+        except TranslationCancelled:
+            self.signals.cancelled.emit(self.job_id)
+            return
+        except Exception as e:
+            get_metrics().count("chapters_failed")
+            self.signals.failed.emit(self.job_id, str(e))
+            return
+
+        if self._cancel.is_set():
+            self.signals.cancelled.emit(self.job_id)
+        else:
+            get_metrics().record("chapter", time.perf_counter() - started, job=self.job_id, chars=self._chars)
+            self.signals.finished.emit(self.job_id, page)
+
+    def _run_progressive(self) -> str:
+        parsed = time.perf_counter()
+        if self.segments is not None:
+            texts, blocks = self.segments
+            skeleton = skeleton_from_segments(texts, blocks, self.css)
+        else:
+            try:
+                skeleton, texts = prepare_skeleton(self.html_content, self.css)
+            except Exception as e:
+                print(f"❌ Помилка розбору HTML: {e}. Перекладаю сторінку цілком.")
+                self._chars = len(self.html_content)
+                return translate_html(
+                    self.html_content, self.translator, self.css,
+                    progress=self._on_progress, cancel=self._cancel,
+                )
+        self._chars = sum(len(text) for text in texts)
+        get_metrics().record("parse", time.perf_counter() - parsed, job=self.job_id, segments=len(texts))
+
+        self.signals.skeleton.emit(self.job_id, skeleton)
+        if texts:
+            translate_progressive(
+                texts, self.translator, self._on_segments, self.focus_ratio,
+                progress=self._on_progress, cancel=self._cancel,
+            )
+        return ""
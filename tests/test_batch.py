@@ -0,0 +1,55 @@
+# tests/test_batch.py
+"""Пакетний переклад офлайн: локальні HTML-глави + фейковий перекладач."""
+import json
+import os
+import tempfile
+
+from modules.novel_browser.batch import STATE_FILE, run_batch
+
+
+def _write_chapter(folder: str, number: int):
+    with open(os.path.join(folder, f"ch{number}.html"), "w", encoding="utf-8") as f:
+        f.write(f"""<html><body>
+            <h1>Chapter {number}</h1>
+            <p>The hero walked into chapter {number} of the story.</p>
+            <p>Nothing else happened that day.</p>
+            <a rel="next" href="ch{number + 1}.html">Next</a>
+        </body></html>""")
+
+
+def _options(out: str, **extra) -> dict:
+    return {"out": out, "novel": "Test Novel", "fake": True, "no_cache": True, **extra}
+
+
+def test_translation_errors_are_not_saved_and_retry():
+    with tempfile.TemporaryDirectory() as folder:
+        _write_chapter(folder, 1)
+        source = os.path.join(folder, "ch1.html")
+        out = os.path.join(folder, "out")
+
+        state = run_batch([source], _options(out, fake_failure_rate=1.0), workers=1)
+        assert source in state["failed"] and not state["done"]
+
+        state = run_batch([source], _options(out), workers=1)
+        assert source in state["done"] and not state["failed"]
+        assert os.path.exists(state["done"][source])
+
+
+def test_follow_chain_resumes_after_failure():
+    with tempfile.TemporaryDirectory() as folder:
+        _write_chapter(folder, 1)
+        first, second, third = (os.path.join(folder, f"ch{n}.html") for n in (1, 2, 3))
+        out = os.path.join(folder, "out")
+
+        # Другої глави ще немає — ланцюжок обривається на ній
+        state = run_batch([first], _options(out), workers=2, follow=2)
+        assert list(state["done"]) == [first]
+        assert second in state["failed"]
+        with open(os.path.join(out, STATE_FILE), "r", encoding="utf-8") as f:
+            assert json.load(f)["follow"] == {second: 1}
+
+        _write_chapter(folder, 2)
+        _write_chapter(folder, 3)
+        state = run_batch([first], _options(out), workers=2, follow=2)
+        assert set(state["done"]) == {first, second, third}
+        assert not state["failed"] and not state["follow"]
@@ -0,0 +1,72 @@
+# tests/test_matcher.py
+"""Блокувальник: правила зі спільним літералом не повинні губитися."""
+import os
+import re
+import tempfile
+
+from modules.novel_browser.filters import load_filters, parse_rules
+from modules.novel_browser.matcher import PatternAutomaton
+
+
+def test_shared_literal_keeps_every_rule():
+    _blocked, _allowed, patterns, regexes, _exceptions = parse_rules(["/banner/*.gif", "/banner/*.js"])
+    assert patterns == ["/banner/", "/banner/"]
+
+    automaton = PatternAutomaton(patterns)
+    verify = lambda number, text: re.search(regexes[number], text) is not None
+    assert automaton.search("ads.example.com/banner/top.gif", verify)
+    assert automaton.search("ads.example.com/banner/top.js", verify)
+    assert not automaton.search("ads.example.com/banner/top.png", verify)
+
+
+def test_shared_literal_through_compiled_cache():
+    with tempfile.TemporaryDirectory() as folder:
+        with open(os.path.join(folder, "list.txt"), "w", encoding="utf-8") as f:
+            f.write("/banner/*.gif\n/banner/*.js\n")
+        filters = load_filters(folder, os.path.join(folder, "cache.bin"))
+        try:
+            matcher = filters.matcher()
+            assert matcher.should_block("https://ads.example.com/banner/a.gif")
+            assert matcher.should_block("https://ads.example.com/banner/a.js")
+            assert not matcher.should_block("https://ads.example.com/banner/a.png")
+        finally:
+            filters.close()
+
+
+def _compiled(folder, rules):
+    with open(os.path.join(folder, "list.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(rules) + "\n")
+    return load_filters(folder, os.path.join(folder, "cache.bin"))
+
+
+def test_options_anchors_and_exceptions(tmp_path):
+    filters = _compiled(str(tmp_path), [
+        "||tracker.net^$third-party",   # опцію не перевірити — правило пропускається
+        "/pixel/*.gif$image",
+        "/promo/*.js$important",
+        "||ads.com/x",
+        "|cdn.example.org/ad/",
+        "/banner/",
+        "@@||good.com/banner/",
+        "||blocked.org^",
+        "@@||blocked.org/ok.js|",
+    ])
+    try:
+        matcher = filters.matcher()
+        assert not matcher.should_block("https://tracker.net/a.js")
+        assert not matcher.should_block("https://site.com/pixel/1.gif")
+        assert matcher.should_block("https://site.com/promo/1.js")
+        # "||" — лише сам хост і його піддомени
+        assert matcher.should_block("https://ads.com/x1")
+        assert matcher.should_block("https://img.ads.com/x1")
+        assert not matcher.should_block("https://notads.com/x1")
+        assert not matcher.should_block("https://site.com/ads.com/x1")
+        assert matcher.should_block("https://cdn.example.org/ad/1.js")
+        assert not matcher.should_block("https://x.cdn.example.org/ad/1.js")
+        # Виняток для шаблону перекриває і шаблон, і домен
+        assert matcher.should_block("https://site.com/banner/1.png")
+        assert not matcher.should_block("https://good.com/banner/1.png")
+        assert matcher.should_block("https://blocked.org/ok.js.map")
+        assert not matcher.should_block("https://blocked.org/ok.js")
+    finally:
+        filters.close()
@@ -0,0 +1,20 @@
+# tests/test_memory.py
+"""Пам'ять перекладів: схожий збіг не повинен підставляти переклад іншого речення."""
+import os
+
+from modules.novel_browser.memory import TranslationMemory
+
+
+def test_fuzzy_hit_only_for_punctuation_changes(tmp_path):
+    memory = TranslationMemory(os.path.join(str(tmp_path), "tm.db"))
+    try:
+        memory.put("He did not want to go to the old tavern tonight.", "en", "uk",
+                   "Він не хотів іти до старої корчми сьогодні ввечері.")
+        memory.flush()
+        expected = "Він не хотів іти до старої корчми сьогодні ввечері."
+        assert memory.lookup("He did not want to go to the old tavern tonight!", "en", "uk") == expected
+        assert memory.lookup("He did not want to go to the old tavern, tonight.", "en", "uk") == expected
+        assert memory.lookup("He did want to go to the old tavern tonight.", "en", "uk") is None
+        assert memory.lookup("Li did not want to go to the old tavern tonight.", "en", "uk") is None
+    finally:
+        memory.close()
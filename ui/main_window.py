@@ -5,26 +5,31 @@ from ui.sidebar import Sidebar
 from ui.menu_bar import MenuBar
 from ui.styles import LIGHT_THEME, DARK_THEME
 from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import Qt
 from core.theme_manager import ThemeManager
+from core.profiler import profiler
 
 
 class MainWindow(QMainWindow):
     def __init__(self, module_manager):
         super().__init__()
         self.module_manager = module_manager
-        self.theme_manager = ThemeManager()
+        with profiler.span("ThemeManager"):
+            self.theme_manager = ThemeManager()
 
         self.setWindowTitle("All in One")
         self.setWindowIcon(QIcon("icons/app_icon.png"))
         self.setGeometry(100, 100, 1000, 600)
         
         # 🧩 UI компоненти
-        self.menu_bar = MenuBar(self)
-        self.sidebar = Sidebar(self.module_manager)
+        with profiler.span("MenuBar + Sidebar"):
+            self.menu_bar = MenuBar(self)
+            self.sidebar = Sidebar(self.module_manager)
         self.content_stack = QStackedWidget()
         self.menu_bar.modules_updated.connect(self.reload_modules)
 
-        self.init_ui()
+        with profiler.span("MainWindow.init_ui"):
+            self.init_ui()
 
     def init_ui(self):
         self.setMenuBar(self.menu_bar)
@@ -45,16 +50,18 @@ class MainWindow(QMainWindow):
         self.sidebar.module_changed.connect(self.change_module)
         self.theme_manager.theme_changed.connect(self.apply_theme_to_all)
         self.module_manager.modules_changed.connect(self.refresh_sidebar)
+        self.module_manager.module_loaded.connect(self._on_module_loaded)
 
 
         # 🎨 Тема
-        self.apply_theme_to_all(self.theme_manager.current_theme)
+        with profiler.span("apply theme"):
+            self.apply_theme_to_all(self.theme_manager.current_theme)
 
-        # 🧱 Початковий модуль
-        modules = self.module_manager.get_all_modules()
-        if modules:
+        # 🧱 Початковий модуль (імпортується лише він)
+        manifests = self.module_manager.get_manifests()
+        if manifests:
             self.sidebar.module_list.setCurrentRow(0)
-            self.change_module(modules[0].name)
+            self.change_module(manifests[0].name)
 
     # ──────────────────────────────
     # 🎨 Робота з темою
@@ -67,11 +74,17 @@ class MainWindow(QMainWindow):
         self.setStyleSheet(theme["MAIN"])
         self.sidebar.setStyleSheet(theme["SIDEBAR"])
 
-        # 🔁 Передаємо зміну теми всім модулям
+        # 🔁 Передаємо зміну теми всім завантаженим модулям
         for module in self.module_manager.get_all_modules():
             if hasattr(module, "on_theme_changed"):
                 module.on_theme_changed(theme_name)
 
+    def _on_module_loaded(self, module_name: str):
+        """Модуль щойно імпортовано на вимогу — передаємо йому поточну тему."""
+        module = self.module_manager.get_module(module_name)
+        if module and hasattr(module, "on_theme_changed"):
+            module.on_theme_changed(self.theme_manager.current_theme)
+
     # ──────────────────────────────
     # 🧩 Перемикання та оновлення модулів (ОНОВЛЕНО)
     # ──────────────────────────────
@@ -83,7 +96,7 @@ class MainWindow(QMainWindow):
         if current_widget and hasattr(current_widget, "module_name"):
             old_module_name = current_widget.module_name
             if old_module_name:
-                old_module = self.module_manager.get_module(old_module_name)
+                old_module = self.module_manager.get_loaded_module(old_module_name)
                 if old_module and hasattr(old_module, "on_module_hidden"):
                     print(f"⏸️ Ховаю модуль: {old_module_name}")
                     old_module.on_module_hidden()
@@ -108,7 +121,8 @@ class MainWindow(QMainWindow):
                 return
 
         # 🆕 Інакше додаємо новий віджет
-        content_widget = module.create_content_widget()
+        with profiler.span(f"create_content_widget: {module_name}", "module"):
+            content_widget = module.create_content_widget()
         content_widget.module_name = module_name
         self.content_stack.addWidget(content_widget)
         self.content_stack.setCurrentWidget(content_widget)
@@ -122,44 +136,55 @@ class MainWindow(QMainWindow):
 
 
     def reload_modules(self):
-        """🔄 Викликається після зміни активних модулів у менеджері."""
+        """
+        🔄 Викликається після зміни активних модулів у менеджері.
+        Перезавантажує лише вимкнені, нові та змінені модулі — віджети решти лишаються живими.
+        """
         print("🔁 Оновлення модулів після зміни в менеджері...")
+        plan = self.module_manager.plan_reload()
+        if not plan:
+            print("✅ Модулі не змінилися.")
+            return
 
-        # --- НОВИЙ БЛОК 1: Очищення старих модулів ---
-        # Коректно очищуємо ВСІ старі віджети та їхні модулі
-        # Це потрібно зробити ДО того, як ми очистимо self.module_manager.modules
-        print(f"🧹 Очищення {self.content_stack.count()} старих віджетів...")
-        for i in range(self.content_stack.count()):
-            widget = self.content_stack.widget(i)
-            if widget and hasattr(widget, "module_name"):
-                module = self.module_manager.get_module(widget.module_name)
-                if module and hasattr(module, "cleanup_module"):
-                    module.cleanup_module()
-        # --- КІНЕЦЬ БЛОКУ 1 ---
-
-        # Повторно завантажити модулі
-        self.module_manager.modules.clear()
-        self.module_manager.load_modules()
-
-        # Оновити Sidebar
+        current_widget = self.content_stack.currentWidget()
+        current_name = getattr(current_widget, "module_name", None)
+
+        # 🧹 Очищуємо лише модулі, які вивантажуються
+        for name in plan.unload:
+            module = self.module_manager.get_loaded_module(name)
+            if module and hasattr(module, "cleanup_module"):
+                print(f"🧹 Вивантажую модуль: {name}")
+                module.cleanup_module()
+            widget = self._find_module_widget(name)
+            if widget is not None:
+                self.content_stack.removeWidget(widget)
+                widget.deleteLater()
+
+        self.module_manager.apply_reload(plan)
         self.sidebar.refresh_module_list()
-        
-        # --- НОВИЙ БЛОК 2: Очищення стека віджетів ---
-        # Тепер видаляємо всі старі віджети зі стека
-        while self.content_stack.count() > 0:
-            w = self.content_stack.widget(0)
-            self.content_stack.removeWidget(w)
-            w.deleteLater() # Явно видаляємо віджет
-        # --- КІНЕЦЬ БЛОКУ 2 ---
-
-        # Перезавантажити перший активний модуль
-        modules = self.module_manager.get_all_modules()
-        if modules:
-            self.sidebar.module_list.setCurrentRow(0)
-            self.change_module(modules[0].name)
+
+        # Поточний модуль лишився — нічого не перемикаємо; вивантажений — відкриваємо знову
+        if current_name and self._find_module_widget(current_name) is not None:
+            return
+        manifests = self.module_manager.get_manifests()
+        names = [manifest.name for manifest in manifests]
+        target = current_name if current_name in names else (names[0] if names else None)
+        if target:
+            matches = self.sidebar.module_list.findItems(target, Qt.MatchExactly)
+            if matches:
+                self.sidebar.module_list.blockSignals(True)
+                self.sidebar.module_list.setCurrentItem(matches[0])
+                self.sidebar.module_list.blockSignals(False)
+            self.change_module(target)
         else:
-            # Якщо модулів не лишилось, очищуємо сайдбар
-            self.sidebar.module_list.clear()
+            self.setWindowTitle("All in One")
+
+    def _find_module_widget(self, module_name):
+        for i in range(self.content_stack.count()):
+            widget = self.content_stack.widget(i)
+            if getattr(widget, "module_name", None) == module_name:
+                return widget
+        return None
 
     def refresh_sidebar(self):
         """Оновлює список модулів у сайдбарі при зміні стану модулів"""
@@ -57,10 +57,11 @@ class ModuleManagerDialog(QDialog):
         self.module_list.clear()
         
         # ✅ Коректно бере стан з менеджера
-        state = self.module_manager._load_enabled_state() 
+        state = self.module_manager.enabled_modules
+        modules_dir = os.path.join(self.module_manager.base_path, "modules")
 
-        for folder in os.listdir("modules"):
-            if folder in ["__pycache__", "base_module"] or not os.path.isdir(os.path.join("modules", folder)):
+        for folder in os.listdir(modules_dir):
+            if folder in ["__pycache__", "base_module"] or not os.path.isdir(os.path.join(modules_dir, folder)):
                 continue
 
             item = QListWidgetItem(folder)
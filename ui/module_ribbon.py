@@ -12,8 +12,8 @@ class ModuleRibbon(QToolBar):
     def init_ui(self):
         self.setMovable(False)
         
-        for module in self.module_manager.get_all_modules():
-            action = QAction(module.name, self)
-            action.setData(module.name)
-            action.triggered.connect(lambda _, name=module.name: self.module_changed.emit(name))
+        for manifest in self.module_manager.get_manifests():
+            action = QAction(manifest.name, self)
+            action.setData(manifest.name)
+            action.triggered.connect(lambda _, name=manifest.name: self.module_changed.emit(name))
             self.addAction(action)
\ No newline at end of file
@@ -1,5 +1,7 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QListWidget, QLabel
+import os
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QLabel
 from PyQt5.QtCore import pyqtSignal, Qt
+from PyQt5.QtGui import QIcon
 
 class Sidebar(QWidget):
     module_changed = pyqtSignal(str)
@@ -35,14 +37,22 @@ class Sidebar(QWidget):
         self.refresh_module_list()
 
     def refresh_module_list(self):
-        """🔄 Оновлює список активних модулів."""
+        """🔄 Оновлює список активних модулів (з маніфестів — код модулів не імпортується)."""
         current = self.module_list.currentItem().text() if self.module_list.currentItem() else None
 
+        # Без сигналів: перебудова списку не повинна перемикати модулі
+        self.module_list.blockSignals(True)
         self.module_list.clear()
-        for module in self.module_manager.get_all_modules():
-            self.module_list.addItem(module.name)
+        for manifest in self.module_manager.get_manifests():
+            item = QListWidgetItem(manifest.name)
+            icon_path = os.path.join(self.module_manager.base_path, manifest.icon) if manifest.icon else ""
+            if icon_path and os.path.isfile(icon_path):
+                item.setIcon(QIcon(icon_path))
+            item.setToolTip(manifest.category)
+            self.module_list.addItem(item)
 
         if current:
             matches = self.module_list.findItems(current, Qt.MatchExactly)
             if matches:
                 self.module_list.setCurrentItem(matches[0])
+        self.module_list.blockSignals(False)